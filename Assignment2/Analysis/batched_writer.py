@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Background Batched Cycle Log Writer
+Non-blocking Python-side DAQ logging in the pendulum_cycle_log.csv layout
+
+PendulumController::logCycleData flushes the CSV on every row. This writer
+keeps disk I/O off the control path instead:
+- log() copies one sample into a preallocated structured buffer (CYCLE_LOG_DTYPE)
+- Full buffers are handed to a background thread that writes them in one
+  batch; partial buffers are also flushed every FLUSH_INTERVAL seconds
+- The file is fsync'ed at most every FSYNC_INTERVAL seconds
+- A fixed pool of buffers bounds memory; when the disk falls behind and the
+  pool is exhausted, the overflow policy applies back-pressure:
+  'block' waits for a free buffer, 'drop' discards the sample, 'raise'
+  raises BufferError
+
+Per-call producer latency is recorded so the impact on the control loop
+can be measured (see stats()).
+"""
+
+import os
+import sys
+import time
+import queue
+import numbers
+import tempfile
+import threading
+import numpy as np
+
+from cycle_log import (CYCLE_LOG_COLUMNS, CYCLE_LOG_DTYPE, STATUS_CODES, STATUS_UNKNOWN,
+                       frame_from_records)
+
+BATCH_ROWS = 4096
+BUFFER_COUNT = 8
+FLUSH_INTERVAL = 0.5    # s, longest a sample waits in a partial buffer
+FSYNC_INTERVAL = 2.0    # s
+LATENCY_SAMPLES = 1 << 16
+OVERFLOW_POLICIES = ('block', 'drop', 'raise')
+
+
+class BatchedCycleLogWriter:
+    """Single-producer cycle-log writer with a background I/O thread"""
+
+    def __init__(self, path, batch_rows=BATCH_ROWS, buffer_count=BUFFER_COUNT,
+                 flush_interval=FLUSH_INTERVAL, fsync_interval=FSYNC_INTERVAL,
+                 overflow='block', lock=None):
+        # lock guards the active buffer; any object with acquire/release and
+        # the context-manager protocol can be passed, e.g. to instrument it
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        if buffer_count < 2:
+            raise ValueError("buffer_count must be at least 2")
+        self.path = path
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.overflow = overflow
+
+        self._free = queue.Queue()
+        for _ in range(buffer_count - 1):
+            self._free.put(np.empty(batch_rows, dtype=CYCLE_LOG_DTYPE))
+        self._full = queue.Queue()
+        self._lock = threading.Lock() if lock is None else lock
+        self._buffer = np.empty(batch_rows, dtype=CYCLE_LOG_DTYPE)
+        self._fill = 0
+        self._closed = False
+        self._error = None
+
+        self.rows_logged = 0
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.batches_written = 0
+        self.fsyncs = 0
+        self.blocked_time = 0.0
+        self._latency = np.zeros(LATENCY_SAMPLES, dtype=np.int64)
+        self._latency_count = 0
+
+        self._file = open(path, 'w', newline='')
+        self._file.write(','.join(CYCLE_LOG_COLUMNS) + '\n')
+        self._thread = threading.Thread(target=self._run, name='cycle-log-writer', daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def log(self, cycle, timestamp, current_position, target_position, velocity,
+            load_torque, limit_0, limit_90, status):
+        """Record one sample; returns False if it was dropped"""
+        start = time.perf_counter_ns()
+        if self._closed:
+            raise ValueError("log() on a closed writer")
+        if self._error is not None:
+            raise IOError(f"Background writer failed: {self._error!r}")
+        # NumPy integer codes (e.g. records['Status'][i]) are Integral but not int
+        code = status if isinstance(status, numbers.Integral) else STATUS_CODES.get(status, STATUS_UNKNOWN)
+
+        with self._lock:
+            if self._fill == self.batch_rows and not self._swap():
+                self.rows_dropped += 1
+                self._record_latency(start)
+                return False
+            self._buffer[self._fill] = (cycle, timestamp, current_position, target_position,
+                                        velocity, load_torque, limit_0, limit_90, code)
+            self._fill += 1
+            self.rows_logged += 1
+            if self._fill == self.batch_rows:
+                self._swap(opportunistic=True)
+        self._record_latency(start)
+        return True
+
+    def _record_latency(self, start):
+        self._latency[self._latency_count % LATENCY_SAMPLES] = time.perf_counter_ns() - start
+        self._latency_count += 1
+
+    def _swap(self, opportunistic=False):
+        """Hand the current buffer to the writer thread (caller holds the lock)"""
+        try:
+            fresh = self._free.get_nowait()
+        except queue.Empty:
+            if opportunistic or self.overflow == 'drop':
+                return False
+            if self.overflow == 'raise':
+                raise BufferError("Cycle log writer is behind: all buffers are full")
+            start = time.perf_counter()
+            fresh = self._free.get()
+            self.blocked_time += time.perf_counter() - start
+        self._full.put((self._buffer, self._fill))
+        self._buffer = fresh
+        self._fill = 0
+        return True
+
+    def _write_batch(self, buffer, rows):
+        frame_from_records(buffer[:rows]).to_csv(self._file, header=False, index=False,
+                                                 float_format='%.3f')
+        self.rows_written += rows
+        self.batches_written += 1
+
+    def _run(self):
+        last_fsync = time.monotonic()
+        while True:
+            try:
+                item = self._full.get(timeout=self.flush_interval)
+            except queue.Empty:
+                # Never wait for the lock: a producer holding it may itself be
+                # blocked until this thread returns a buffer to the pool
+                if self._lock.acquire(blocking=False):
+                    try:
+                        if self._fill and not self._closed:
+                            self._swap(opportunistic=True)
+                    finally:
+                        self._lock.release()
+                continue
+
+            if item is StopIteration:
+                break
+            buffer, rows = item
+            try:
+                if rows:
+                    self._write_batch(buffer, rows)
+                    self._file.flush()
+                now = time.monotonic()
+                if now - last_fsync >= self.fsync_interval:
+                    os.fsync(self._file.fileno())
+                    self.fsyncs += 1
+                    last_fsync = now
+            except Exception as e:
+                self._error = e
+            self._free.put(buffer)
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.fsyncs += 1
+
+    def close(self):
+        """Flush everything, fsync and stop the writer thread"""
+        if self._closed:
+            return
+        with self._lock:
+            self._closed = True
+            if self._fill:
+                self._full.put((self._buffer, self._fill))
+                self._fill = 0
+        self._full.put(StopIteration)
+        self._thread.join()
+        self._file.close()
+        if self._error is not None:
+            raise IOError(f"Background writer failed: {self._error!r}")
+
+    def stats(self):
+        """Producer latency percentiles (µs) and writer counters"""
+        n = min(self._latency_count, LATENCY_SAMPLES)
+        lat = np.sort(self._latency[:n]) / 1000.0 if n else np.zeros(1)
+        return {
+            'rows_logged': self.rows_logged,
+            'rows_written': self.rows_written,
+            'rows_dropped': self.rows_dropped,
+            'batches_written': self.batches_written,
+            'fsyncs': self.fsyncs,
+            'producer_blocked_s': self.blocked_time,
+            'latency_p50_us': float(np.percentile(lat, 50)),
+            'latency_p99_us': float(np.percentile(lat, 99)),
+            'latency_max_us': float(lat[-1]),
+        }
+
+
+def _benchmark_flush_per_row(path, samples):
+    """Reference: the C++ logger's write-and-flush per row, for comparison"""
+    latency = np.empty(len(samples), dtype=np.int64)
+    with open(path, 'w') as f:
+        f.write(','.join(CYCLE_LOG_COLUMNS) + '\n')
+        for i, s in enumerate(samples):
+            start = time.perf_counter_ns()
+            f.write(f"{s[0]},{s[1]:.3f},{s[2]:.3f},{s[3]:.3f},{s[4]:.3f},{s[5]:.3f},"
+                    f"{s[6]},{s[7]},{s[8]}\n")
+            f.flush()
+            latency[i] = time.perf_counter_ns() - start
+    return np.sort(latency) / 1000.0
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    t = np.arange(n) * 0.012
+    pos = 45.0 - 45.0 * np.cos(np.pi * t / 3.0)
+    samples = [(int(ti // 6.0), ti, p, p, 0.0, 2 * 9.81 * 0.3 * np.sin(np.radians(p)),
+                int(p <= 0.5), int(p >= 89.5), 'Moving_Up') for ti, p in zip(t, pos)]
+
+    print("="*60)
+    print("BATCHED CYCLE LOG WRITER")
+    print("="*60)
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = BatchedCycleLogWriter(os.path.join(tmp, 'batched.csv'))
+        start = time.perf_counter()
+        for s in samples:
+            writer.log(*s)
+        produce_time = time.perf_counter() - start
+        writer.close()
+        stats = writer.stats()
+
+        reference = _benchmark_flush_per_row(os.path.join(tmp, 'flush_per_row.csv'), samples)
+
+    print(f"Samples: {n}")
+    print(f"Batched Writer: {produce_time:.2f} s producer time, "
+          f"{stats['batches_written']} batches, {stats['fsyncs']} fsyncs")
+    print(f"  Producer Latency: p50 {stats['latency_p50_us']:.2f} µs, "
+          f"p99 {stats['latency_p99_us']:.2f} µs, max {stats['latency_max_us']:.1f} µs")
+    print(f"  Blocked: {stats['producer_blocked_s']:.3f} s, dropped {stats['rows_dropped']} rows")
+    print(f"Flush per Row: p50 {np.percentile(reference, 50):.2f} µs, "
+          f"p99 {np.percentile(reference, 99):.2f} µs, max {reference[-1]:.1f} µs")
+    print("="*60)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Parallel Campaign Analysis
+Map-reduce over a directory of cycle logs with a process pool
+
+Map: each worker streams one log and returns a compact CampaignAggregate
+- Counts (files, rows, cycles, limit-switch events, timing gaps)
+- Sums for means/RMS (|torque|, torque², |tracking error|)
+- Extremes (peak torque, peak tracking error, longest sample step)
+- Fixed-bin histograms of load torque, tracking error and sample interval,
+  which merge by addition and act as quantile sketches; a quantile that falls
+  in a histogram's under- or overflow is reported at the bound and flagged
+  as censored
+- One short summary row per file
+
+Reduce: aggregates are merged as workers finish. Only the aggregates cross
+process boundaries, so throughput scales with the number of cores.
+"""
+
+import os
+import sys
+import glob
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from cycle_log import DEFAULT_CHUNK_ROWS, iter_cycle_log
+from cycle_summary import CycleSummary, GAP_THRESHOLD
+from limit_switch_monitor import LimitSwitchMonitor
+
+
+class Histogram:
+    """Fixed-bin histogram with under/overflow counts; mergeable by addition"""
+
+    def __init__(self, lo, hi, bins):
+        self.lo = lo
+        self.hi = hi
+        self.edges = np.linspace(lo, hi, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def add(self, values):
+        values = np.asarray(values)
+        self.underflow += int(np.count_nonzero(values < self.lo))
+        self.overflow += int(np.count_nonzero(values > self.hi))
+        self.counts += np.histogram(values, self.edges)[0]
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different bins")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    @property
+    def total(self):
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+    def censored(self, q):
+        """True when the q-quantile lies in the under- or overflow, so quantile() returns a bound"""
+        total = self.total
+        return total > 0 and ((self.underflow > 0 and q * total <= self.underflow)
+                              or self.overflow > (1.0 - q) * total)
+
+    def quantile(self, q):
+        """Approximate quantile, interpolated within a bin"""
+        total = self.total
+        if total == 0:
+            return np.nan
+        target = q * total - self.underflow
+        if target <= 0:
+            return self.lo
+        cum = np.cumsum(self.counts)
+        i = int(np.searchsorted(cum, target))
+        if i >= len(self.counts):
+            return self.hi
+        below = cum[i] - self.counts[i]
+        frac = (target - below) / self.counts[i] if self.counts[i] else 0.0
+        return float(self.edges[i] + frac * (self.edges[i + 1] - self.edges[i]))
+
+
+class CampaignAggregate:
+    """Partial result of one or more logs; combine with merge()"""
+
+    def __init__(self):
+        self.files = 0
+        self.rows = 0
+        self.cycles = 0
+        self.limit_events = 0
+        self.gaps = 0
+        self.abs_torque_sum = 0.0
+        self.torque_sq_sum = 0.0
+        self.error_sum = 0.0
+        self.peak_torque = 0.0
+        self.peak_error = 0.0
+        self.dt_max = 0.0
+        self.torque_hist = Histogram(-1.0, 7.0, 800)          # N⋅m
+        # Down moves reuse the up-move position terms, so Target overshoots
+        # 90° and tracking errors reach well past it
+        self.error_hist = Histogram(0.0, 180.0, 3600)         # degrees
+        self.dt_hist = Histogram(0.0, 5.0 * GAP_THRESHOLD, 600)  # s
+        self.file_rows = []
+
+    def merge(self, other):
+        for name in ('files', 'rows', 'cycles', 'limit_events', 'gaps',
+                     'abs_torque_sum', 'torque_sq_sum', 'error_sum'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.peak_torque = max(self.peak_torque, other.peak_torque)
+        self.peak_error = max(self.peak_error, other.peak_error)
+        self.dt_max = max(self.dt_max, other.dt_max)
+        self.torque_hist.merge(other.torque_hist)
+        self.error_hist.merge(other.error_hist)
+        self.dt_hist.merge(other.dt_hist)
+        self.file_rows.extend(other.file_rows)
+        return self
+
+    def report(self):
+        # Bin interpolation can overshoot the exact extremes; clamp to them
+        rows = max(self.rows, 1)
+        quantiles = {
+            'torque_p50': (self.torque_hist, 0.5),
+            'torque_p99': (self.torque_hist, 0.99),
+            'error_p99': (self.error_hist, 0.99),
+            'dt_p50': (self.dt_hist, 0.5),
+            'dt_p99': (self.dt_hist, 0.99),
+        }
+        return {
+            'files': self.files,
+            'rows': self.rows,
+            'cycles': self.cycles,
+            'limit_events': self.limit_events,
+            'gaps': self.gaps,
+            'mean_abs_torque': self.abs_torque_sum / rows,
+            'rms_torque': float(np.sqrt(self.torque_sq_sum / rows)),
+            'peak_torque': self.peak_torque,
+            'torque_p50': self.torque_hist.quantile(0.5),
+            'torque_p99': min(self.torque_hist.quantile(0.99), self.peak_torque),
+            'mean_abs_error': self.error_sum / rows,
+            'peak_error': self.peak_error,
+            'error_p99': min(self.error_hist.quantile(0.99), self.peak_error),
+            'dt_p50': self.dt_hist.quantile(0.5),
+            'dt_p99': min(self.dt_hist.quantile(0.99), self.dt_max),
+            'dt_max': self.dt_max,
+            'censored': [name for name, (hist, q) in quantiles.items() if hist.censored(q)],
+        }
+
+
+def analyze_log(path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Map step: one streaming pass over a log"""
+    agg = CampaignAggregate()
+    summary = CycleSummary()
+    monitor = LimitSwitchMonitor()
+    last_t = None
+    for records in iter_cycle_log(path, chunk_rows):
+        summary.add_chunk(records)
+        agg.limit_events += len(monitor.add_chunk(records))
+
+        torque = records['Load_Torque']
+        error = np.abs(records['Target_Position'] - records['Current_Position'])
+        t = records['Timestamp']
+        dt = np.diff(t if last_t is None else np.r_[last_t, t])
+        last_t = t[-1] if len(t) else last_t
+
+        agg.abs_torque_sum += float(np.abs(torque).sum())
+        agg.torque_sq_sum += float((torque * torque).sum())
+        agg.error_sum += float(error.sum())
+        agg.torque_hist.add(torque)
+        agg.error_hist.add(error)
+        agg.dt_hist.add(dt)
+    agg.limit_events += len(monitor.finish())
+
+    run = summary.run_summary()
+    agg.files = 1
+    agg.rows = run['rows']
+    agg.cycles = run['cycles']
+    agg.gaps = run['gaps']
+    agg.peak_torque = run['peak_torque']
+    agg.peak_error = run['peak_error']
+    agg.dt_max = run['dt_max']
+    agg.file_rows.append((path, run['rows'], run['cycles'], run['peak_torque']))
+    return agg
+
+
+def map_reduce(paths, workers=None, mapper=analyze_log):
+    """Fan mapper() out over paths and merge the partial aggregates"""
+    result = CampaignAggregate()
+    if workers == 1:
+        for path in paths:
+            result.merge(mapper(path))
+        return result
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(mapper, path) for path in paths]
+        for future in as_completed(futures):
+            result.merge(future.result())
+    return result
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else '../Output'
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    paths = sorted(glob.glob(os.path.join(directory, '**', '*cycle_log*.csv'), recursive=True))
+
+    start = time.perf_counter()
+    result = map_reduce(paths, workers)
+    elapsed = time.perf_counter() - start
+    report = result.report()
+
+    def censored(name):
+        return ' (censored)' if name in report['censored'] else ''
+
+    print("="*60)
+    print("CAMPAIGN MAP-REDUCE ANALYSIS")
+    print("="*60)
+    print(f"Directory: {directory}")
+    print(f"Logs: {report['files']} analyzed with {workers} workers in {elapsed:.2f} s")
+    print(f"Rows: {report['rows']}  Cycles: {report['cycles']}")
+    print(f"Load Torque: mean |τ| {report['mean_abs_torque']:.3f}, RMS {report['rms_torque']:.3f}, "
+          f"p99 {report['torque_p99']:.3f}{censored('torque_p99')}, peak {report['peak_torque']:.3f} N⋅m")
+    print(f"Tracking Error: mean {report['mean_abs_error']:.3f}°, "
+          f"p99 {report['error_p99']:.3f}°{censored('error_p99')}, peak {report['peak_error']:.3f}°")
+    print(f"Sample Interval: p50 {report['dt_p50']*1000:.2f} ms{censored('dt_p50')}, "
+          f"p99 {report['dt_p99']*1000:.2f} ms{censored('dt_p99')}, "
+          f"max {report['dt_max']*1000:.2f} ms")
+    print(f"Anomalies: {report['gaps']} timing gaps, {report['limit_events']} limit-switch events")
+    print("="*60)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Cycle Log Access
+Shared schema, constants and chunked reader for pendulum_cycle_log.csv
+
+Log format (written by PendulumController::logCycleData):
+- Cycle, Timestamp (s), Current_Position (°), Target_Position (°),
+  Velocity (°/s), Load_Torque (N⋅m), Limit_0, Limit_90, Status
+
+Chunks are returned as NumPy structured arrays of CYCLE_LOG_DTYPE with the
+Status text encoded as a small integer code (see STATUS_CODES).
+"""
+
+import io
+import numpy as np
+import pandas as pd
+
+# System configuration (mirrors Software/pendulum_control.cpp)
+PENDULUM_MASS = 2.0        # kg
+PENDULUM_LENGTH = 0.3      # m
+GRAVITY = 9.81             # m/s²
+MOTOR_TORQUE = 0.3924      # N⋅m (calculated)
+GEARBOX_RATIO = 10.0       # 10:1 reduction
+ROPE_RATIO = 1.5           # rope stage reduction (see Calculations/final_analysis.py)
+# Static gravity torque at the pendulum that MOTOR_TORQUE holds through the
+# gearbox and rope stage (M·g·L at 90°); a requirement, not a motor rating
+STATIC_LOAD_TORQUE = MOTOR_TORQUE * GEARBOX_RATIO * ROPE_RATIO   # N⋅m
+
+# Motion parameters
+MIN_ANGLE = 0.0            # degrees (horizontal)
+MAX_ANGLE = 90.0           # degrees (vertical)
+MAX_VELOCITY = 30.0        # degrees/second
+ACCELERATION = 60.0        # degrees/second²
+MOTION_TIME = 3.0          # seconds for each 0° to 90° motion
+
+# Control parameters
+POSITION_TOLERANCE = 0.5   # degrees
+CONTROL_PERIOD_MS = 10     # 100Hz control loop
+MAX_CYCLES = 1000          # maximum test cycles
+
+# Log schema
+DEFAULT_LOG_PATH = '../Output/pendulum_cycle_log.csv'
+DEFAULT_CHUNK_ROWS = 500000
+
+CYCLE_LOG_COLUMNS = [
+    'Cycle', 'Timestamp', 'Current_Position', 'Target_Position',
+    'Velocity', 'Load_Torque', 'Limit_0', 'Limit_90', 'Status'
+]
+SIGNAL_COLUMNS = ['Current_Position', 'Target_Position', 'Velocity', 'Load_Torque']
+
+STATUS_NAMES = ['Moving_Up', 'Moving_Down', 'Shutdown_Safe']
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+STATUS_UNKNOWN = 255
+
+CYCLE_LOG_DTYPE = np.dtype([
+    ('Cycle', '<i4'),
+    ('Timestamp', '<f8'),
+    ('Current_Position', '<f8'),
+    ('Target_Position', '<f8'),
+    ('Velocity', '<f8'),
+    ('Load_Torque', '<f8'),
+    ('Limit_0', 'u1'),
+    ('Limit_90', 'u1'),
+    ('Status', 'u1'),
+])
+
+_CSV_DTYPES = {
+    'Cycle': np.int32,
+    'Timestamp': np.float64,
+    'Current_Position': np.float64,
+    'Target_Position': np.float64,
+    'Velocity': np.float64,
+    'Load_Torque': np.float64,
+    'Limit_0': np.uint8,
+    'Limit_90': np.uint8,
+    'Status': str,
+}
+
+
+def status_name(code):
+    """Return the Status text for an encoded status code"""
+    if 0 <= code < len(STATUS_NAMES):
+        return STATUS_NAMES[code]
+    return 'Unknown'
+
+
+def records_from_frame(df):
+    """Convert a cycle-log DataFrame into a CYCLE_LOG_DTYPE structured array"""
+    records = np.empty(len(df), dtype=CYCLE_LOG_DTYPE)
+    for name in CYCLE_LOG_COLUMNS[:-1]:
+        records[name] = df[name].to_numpy()
+    codes = df['Status'].map(STATUS_CODES).fillna(STATUS_UNKNOWN)
+    records['Status'] = codes.to_numpy(dtype=np.uint8)
+    return records
+
+
+def frame_from_records(records):
+    """Convert a CYCLE_LOG_DTYPE structured array back into a DataFrame"""
+    df = pd.DataFrame({name: records[name] for name in CYCLE_LOG_COLUMNS[:-1]})
+    names = np.array(STATUS_NAMES + ['Unknown'], dtype=object)
+    codes = np.minimum(records['Status'], len(STATUS_NAMES))
+    df['Status'] = names[codes]
+    return df
+
+
+def iter_cycle_log(path=DEFAULT_LOG_PATH, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield the cycle log as structured-array chunks of at most chunk_rows rows"""
+    reader = pd.read_csv(path, dtype=_CSV_DTYPES, chunksize=chunk_rows)
+    for df in reader:
+        yield records_from_frame(df)
+
+
+def parse_cycle_log_bytes(data):
+    """Parse headerless CSV rows (e.g. a byte range of a log) into records"""
+    df = pd.read_csv(io.BytesIO(data), header=None, names=CYCLE_LOG_COLUMNS, dtype=_CSV_DTYPES)
+    return records_from_frame(df)
+
+
+def read_cycle_log(path=DEFAULT_LOG_PATH):
+    """Read a whole cycle log into one structured array"""
+    chunks = list(iter_cycle_log(path))
+    if not chunks:
+        return np.empty(0, dtype=CYCLE_LOG_DTYPE)
+    return np.concatenate(chunks)
+
+
+def write_cycle_log(records, path, header=True, mode='w'):
+    """Write records in the same CSV layout as PendulumController::logCycleData"""
+    df = frame_from_records(records)
+    df.to_csv(path, index=False, header=header, mode=mode, float_format='%.3f')
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Similar-Cycle Search
+Fixed-length per-cycle feature vectors and a persisted nearest-neighbour index
+
+Feature vector of one cycle:
+- Shape: Current_Position, Load_Torque and |tracking error| resampled to
+  SHAPE_POINTS points over the cycle's normalized time
+- Scalars: duration, peak/RMS torque, peak/mean tracking error, and the mean,
+  jitter and maximum of the sample interval
+
+Vectors are standardized (scalars per feature, each shape by its overall
+spread) and weighted so a whole shape counts like SHAPE_WEIGHT scalars.
+
+Index:
+- Sketch: projection onto the top SKETCH_DIMS principal components. Being an
+  orthonormal projection, sketch distance never exceeds the true distance.
+- Random-projection LSH on the sketch: each of TABLES tables hashes it to
+  BITS sign bits of random hyperplanes. A query probes its own bucket and
+  the PROBES buckets across the hyperplanes it lies closest to, in each
+  table (sorted code arrays searched with np.searchsorted).
+- Candidates are visited in order of sketch distance and compared exactly
+  until the sketch distance alone rules out beating the current k-th match.
+Everything is stored as .npy files in an <name>.simidx directory (memory-
+mapped on load), so a query over millions of cycles takes milliseconds.
+Indexes of up to EXACT_SCAN_ROWS cycles skip the hashing and are exact.
+"""
+
+import os
+import sys
+import json
+import time
+import numpy as np
+
+from cycle_log import DEFAULT_CHUNK_ROWS, CYCLE_LOG_DTYPE, iter_cycle_log
+
+SHAPE_POINTS = 32
+SHAPE_SIGNALS = ('position', 'torque', 'error')
+SCALAR_FEATURES = ('duration', 'peak_torque', 'rms_torque', 'peak_error', 'mean_abs_error',
+                   'dt_mean', 'dt_jitter', 'dt_max')
+SHAPE_WEIGHT = 4.0
+SKETCH_DIMS = 16
+TABLES = 8
+BITS = 16
+PROBES = 4               # neighbouring buckets probed per table
+RERANK_BLOCK = 1024      # candidates compared exactly per step
+EXACT_SCAN_ROWS = 50000  # smaller indexes skip LSH and bound every row
+INDEX_SUFFIX = '.simidx'
+
+
+def feature_names(points=SHAPE_POINTS):
+    return ([f'{s}_{k}' for s in SHAPE_SIGNALS for k in range(points)] + list(SCALAR_FEATURES))
+
+
+def cycle_features(records, points=SHAPE_POINTS):
+    """(cycle numbers, float32 feature rows) for whole cycles in records"""
+    cycles = records['Cycle']
+    starts = np.flatnonzero(np.r_[True, cycles[1:] != cycles[:-1]])
+    ends = np.r_[starts[1:], len(records)] - 1
+    seg = np.repeat(np.arange(len(starts)), ends - starts + 1)
+
+    t = records['Timestamp']
+    duration = t[ends] - t[starts]
+    # Cycle k occupies [2k, 2k+1] on a stretched time axis, so one np.interp
+    # call resamples every cycle of the chunk
+    u = 2.0 * seg + (t - t[starts][seg]) / np.where(duration > 0, duration, 1.0)[seg]
+    grid = (2.0 * np.arange(len(starts))[:, None] + np.linspace(0.0, 1.0, points)[None, :]).ravel()
+
+    torque = records['Load_Torque']
+    error = np.abs(records['Target_Position'] - records['Current_Position'])
+    shapes = [np.interp(grid, u, x).reshape(len(starts), points)
+              for x in (records['Current_Position'], torque, error)]
+
+    rows = (ends - starts + 1).astype(np.float64)
+    dt = np.diff(t, prepend=t[0])
+    dt[starts] = 0.0
+    n_dt = np.maximum(rows - 1, 1)
+    dt_mean = np.add.reduceat(dt, starts) / n_dt
+    dt_var = np.maximum(np.add.reduceat(dt * dt, starts) / n_dt - dt_mean**2, 0.0)
+    scalars = [
+        duration,
+        np.maximum.reduceat(np.abs(torque), starts),
+        np.sqrt(np.add.reduceat(torque * torque, starts) / rows),
+        np.maximum.reduceat(error, starts),
+        np.add.reduceat(error, starts) / rows,
+        dt_mean,
+        np.sqrt(dt_var),
+        np.maximum.reduceat(dt, starts),
+    ]
+    features = np.hstack(shapes + [np.column_stack(scalars)]).astype(np.float32)
+    return cycles[starts].astype(np.int32), features
+
+
+def extract_features(log_path, points=SHAPE_POINTS, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Feature rows of every cycle of a log; the open cycle carries across chunks"""
+    carry = np.empty(0, dtype=CYCLE_LOG_DTYPE)
+    ids, feats = [], []
+    for records in iter_cycle_log(log_path, chunk_rows):
+        buf = np.concatenate([carry, records]) if len(carry) else records
+        change = np.flatnonzero(buf['Cycle'][1:] != buf['Cycle'][:-1]) + 1
+        split = change[-1] if len(change) else 0
+        if split:
+            c, f = cycle_features(buf[:split], points)
+            ids.append(c)
+            feats.append(f)
+        carry = buf[split:].copy()
+    if len(carry):
+        c, f = cycle_features(carry, points)
+        ids.append(c)
+        feats.append(f)
+    if not ids:
+        return np.empty(0, dtype=np.int32), np.empty((0, 3 * points + len(SCALAR_FEATURES)), np.float32)
+    return np.concatenate(ids), np.vstack(feats)
+
+
+def _scaling(features, points):
+    """Per-dimension offset and scale turning raw features into index space"""
+    mean = features.mean(0, dtype=np.float64)
+    scale = np.ones(features.shape[1])
+    n_shape = len(SHAPE_SIGNALS) * points
+    for k in range(len(SHAPE_SIGNALS)):
+        block = slice(k * points, (k + 1) * points)
+        spread = float(np.std(features[:, block] - mean[block]))
+        scale[block] = max(spread, 1e-9) * np.sqrt(points / SHAPE_WEIGHT)
+    std = features[:, n_shape:].std(0, dtype=np.float64)
+    scale[n_shape:] = np.where(std > 1e-12, std, 1.0)
+    return mean, scale
+
+
+class SimilarityIndex:
+    """Random-projection LSH over standardized cycle features"""
+
+    def __init__(self, vectors, sketch, basis, run, cycle, runs, mean, scale, planes, codes,
+                 order, points):
+        self.vectors = vectors      # (N, D) float32, index space
+        self.sketch = sketch       # (N, SKETCH_DIMS) float32 principal-component scores
+        self.basis = basis         # (D, SKETCH_DIMS) orthonormal
+        self.run = run             # (N,) index into runs
+        self.cycle = cycle         # (N,) Cycle number
+        self.runs = runs           # log paths
+        self.mean = mean
+        self.scale = scale
+        self.planes = planes       # (TABLES, BITS, SKETCH_DIMS)
+        self.codes = codes         # (TABLES, N) sorted bucket codes
+        self.order = order         # (TABLES, N) row of each sorted code
+        self.points = points
+        self._weights = (1 << np.arange(planes.shape[1])).astype(np.uint32)
+        self.last_candidates = 0
+        self._seen = None
+
+    @classmethod
+    def build(cls, runs, run, cycle, features, points=SHAPE_POINTS,
+              tables=TABLES, bits=BITS, seed=0):
+        mean, scale = _scaling(features, points)
+        vectors = ((features - mean) / scale).astype(np.float32)
+        cov = (vectors.T @ vectors).astype(np.float64) / max(len(vectors), 1)
+        _, eigvecs = np.linalg.eigh(cov)
+        basis = eigvecs[:, ::-1][:, :min(SKETCH_DIMS, vectors.shape[1])].astype(np.float32)
+        sketch = vectors @ basis
+
+        rng = np.random.default_rng(seed)
+        planes = rng.standard_normal((tables, bits, basis.shape[1])).astype(np.float32)
+        codes = np.empty((tables, len(vectors)), dtype=np.uint32)
+        order = np.empty((tables, len(vectors)), dtype=np.int64)
+        weights = (1 << np.arange(bits)).astype(np.uint32)
+        for k in range(tables):
+            raw = ((sketch @ planes[k].T) > 0).astype(np.uint32) @ weights
+            order[k] = np.argsort(raw, kind='stable')
+            codes[k] = raw[order[k]]
+        return cls(vectors, sketch, basis, run, cycle, list(runs), mean, scale, planes, codes,
+                   order, points)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def transform(self, features):
+        return ((np.atleast_2d(features) - self.mean) / self.scale).astype(np.float32)
+
+    def _candidates(self, s):
+        if self._seen is None:
+            self._seen = np.zeros(len(self), dtype=bool)
+        found = []
+        for k in range(len(self.planes)):
+            proj = self.planes[k] @ s
+            code = (proj > 0).astype(np.uint32) @ self._weights
+            # Own bucket plus the buckets across the PROBES closest hyperplanes
+            weak = np.argsort(np.abs(proj))[:PROBES]
+            probes = np.bitwise_xor(code, np.r_[0, self._weights[weak]].astype(np.uint32))
+            lo = np.searchsorted(self.codes[k], probes, side='left')
+            hi = np.searchsorted(self.codes[k], probes, side='right')
+            for a, b in zip(lo, hi):
+                if b > a:
+                    found.append(self.order[k][a:b])
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        # Deduplicate through a reusable mark array rather than sorting
+        hits = np.concatenate(found)
+        self._seen[hits] = True
+        rows = np.flatnonzero(self._seen)
+        self._seen[rows] = False
+        return rows
+
+    def query(self, features, k=10):
+        """k nearest cycles to one raw feature vector: (rows, distances)"""
+        return self._search(self.transform(features)[0], k)
+
+    def query_row(self, row, k=10):
+        """Neighbours of an indexed cycle, excluding itself"""
+        return self._search(np.asarray(self.vectors[row]), k, exclude=row)
+
+    def _search(self, v, k, exclude=None):
+        s = v @ self.basis
+        rows = self._candidates(s) if len(self) > EXACT_SCAN_ROWS else np.arange(len(self))
+        if exclude is not None:
+            rows = rows[rows != exclude]
+        if len(rows) < k:
+            # Too few collisions: fall back to an exact scan
+            rows = np.arange(len(self))
+            if exclude is not None:
+                rows = rows[rows != exclude]
+        diff = np.asarray(self.sketch[rows]) - s
+        bound = np.sqrt(np.einsum('ij,ij->i', diff, diff))
+        # Usually the first block settles the query: partition it out before sorting the rest
+        if len(rows) > RERANK_BLOCK:
+            part = np.argpartition(bound, RERANK_BLOCK)
+            head, tail = part[:RERANK_BLOCK], part[RERANK_BLOCK:]
+            by_bound = np.r_[head[np.argsort(bound[head])], tail]
+            rows, bound = rows[by_bound], bound[by_bound]
+            sorted_upto = RERANK_BLOCK
+        else:
+            by_bound = np.argsort(bound)
+            rows, bound = rows[by_bound], bound[by_bound]
+            sorted_upto = len(rows)
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best = np.empty(0, dtype=np.float32)
+        compared = 0
+        for start in range(0, len(rows), RERANK_BLOCK):
+            if start >= sorted_upto:
+                rest = start + np.argsort(bound[start:])
+                rows[start:], bound[start:] = rows[rest], bound[rest]
+                sorted_upto = len(rows)
+            if len(best) == k and bound[start] > best[-1]:
+                break
+            block = np.sort(rows[start:start + RERANK_BLOCK])
+            diff = np.asarray(self.vectors[block]) - v
+            dist = np.sqrt(np.einsum('ij,ij->i', diff, diff))
+            compared += len(block)
+            best_rows = np.r_[best_rows, block]
+            best = np.r_[best, dist]
+            keep = np.argsort(best, kind='stable')[:k]
+            best_rows, best = best_rows[keep], best[keep]
+        self.last_candidates = compared
+        return best_rows, best
+
+    def lookup(self, log_path, cycle):
+        """Row of an indexed (log, cycle), or None"""
+        path = os.path.abspath(log_path)
+        if path not in self.runs:
+            return None
+        hit = np.flatnonzero((self.run == self.runs.index(path)) & (self.cycle == cycle))
+        return int(hit[0]) if len(hit) else None
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        for name in ('vectors', 'sketch', 'basis', 'run', 'cycle', 'mean', 'scale', 'planes',
+                     'codes', 'order'):
+            np.save(os.path.join(path, f'{name}.npy'), getattr(self, name))
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump({'runs': self.runs, 'points': self.points,
+                       'features': feature_names(self.points)}, f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+                  for name in ('vectors', 'sketch', 'run', 'cycle', 'codes', 'order')}
+        small = {name: np.load(os.path.join(path, f'{name}.npy'))
+                 for name in ('basis', 'mean', 'scale', 'planes')}
+        return cls(arrays['vectors'], arrays['sketch'], small['basis'], arrays['run'],
+                   arrays['cycle'], meta['runs'],
+                   small['mean'], small['scale'], small['planes'], arrays['codes'],
+                   arrays['order'], meta['points'])
+
+
+def build_index(log_paths, index_path, points=SHAPE_POINTS, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Extract features of every cycle of every log and save the index"""
+    runs, run_ids, cycles, feats = [], [], [], []
+    for k, path in enumerate(log_paths):
+        c, f = extract_features(path, points, chunk_rows)
+        runs.append(os.path.abspath(path))
+        run_ids.append(np.full(len(c), k, dtype=np.int32))
+        cycles.append(c)
+        feats.append(f)
+    index = SimilarityIndex.build(runs, np.concatenate(run_ids), np.concatenate(cycles),
+                                  np.vstack(feats), points)
+    index.save(index_path)
+    return index
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ('build', 'query'):
+        print("Usage: cycle_similarity.py build <index" + INDEX_SUFFIX + "> <log.csv> ...")
+        print("       cycle_similarity.py query <index" + INDEX_SUFFIX + "> <log.csv> <cycle> [k]")
+        sys.exit(2)
+    command, index_path = sys.argv[1], sys.argv[2]
+
+    print("="*60)
+    print("SIMILAR-CYCLE SEARCH")
+    print("="*60)
+    if command == 'build':
+        start = time.perf_counter()
+        index = build_index(sys.argv[3:], index_path)
+        print(f"Index: {index_path}")
+        print(f"Cycles: {len(index)} from {len(index.runs)} logs in {time.perf_counter() - start:.2f} s")
+        print(f"Features: {index.vectors.shape[1]}  Tables: {len(index.planes)} × {index.planes.shape[1]} bits")
+    else:
+        log_path, cycle = sys.argv[3], int(sys.argv[4])
+        k = int(sys.argv[5]) if len(sys.argv) > 5 else 10
+        index = SimilarityIndex.load(index_path)
+        row = index.lookup(log_path, cycle)
+        start = time.perf_counter()
+        if row is not None:
+            rows, dist = index.query_row(row, k)
+        else:
+            ids, feats = extract_features(log_path)
+            if cycle not in ids:
+                print(f"Cycle {cycle} not found in {log_path}")
+                sys.exit(1)
+            start = time.perf_counter()
+            rows, dist = index.query(feats[np.flatnonzero(ids == cycle)[0]], k)
+        elapsed = time.perf_counter() - start
+        print(f"Query: {log_path} cycle {cycle}")
+        print(f"Compared {index.last_candidates} of {len(index)} cycles exactly in {elapsed*1000:.1f} ms")
+        for r, d in zip(rows, dist):
+            print(f"  distance {d:8.3f}  cycle {int(index.cycle[r]):5d}  {index.runs[index.run[r]]}")
+    print("="*60)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Per-Cycle Summary Statistics
+Streaming, mergeable per-cycle aggregates of a pendulum cycle log
+
+Per cycle the accumulator tracks:
+- Row count, first/last timestamp
+- Peak and RMS load torque, peak and mean absolute tracking error
+- Sample-interval jitter (mean/std/max of Timestamp steps)
+- Anomaly counts: timing gaps, limit-switch mismatches, unknown Status
+
+Chunks are reduced with np.add.reduceat over runs of equal Cycle number, so
+cycles that straddle a chunk boundary are merged exactly. Two accumulators
+built over different logs or chunk ranges can be combined with merge().
+"""
+
+import sys
+import numpy as np
+
+from cycle_log import (DEFAULT_LOG_PATH, DEFAULT_CHUNK_ROWS, CONTROL_PERIOD_MS, STATUS_UNKNOWN,
+                       iter_cycle_log)
+from limit_switch_monitor import FAR_MARGIN, MISSING_MARGIN, violation_masks
+
+# A sample step longer than this many control periods counts as a timing gap
+GAP_FACTOR = 3.0
+GAP_THRESHOLD = GAP_FACTOR * CONTROL_PERIOD_MS / 1000.0  # s
+
+# Accumulated fields and how two partial values combine
+_FIELDS = {
+    'rows': ('sum', np.int64),
+    't_start': ('min', np.float64),
+    't_end': ('max', np.float64),
+    'peak_torque': ('max', np.float64),
+    'torque_sq_sum': ('sum', np.float64),
+    'peak_error': ('max', np.float64),
+    'error_abs_sum': ('sum', np.float64),
+    'dt_count': ('sum', np.int64),
+    'dt_sum': ('sum', np.float64),
+    'dt_sq_sum': ('sum', np.float64),
+    'dt_max': ('max', np.float64),
+    'gaps': ('sum', np.int64),
+    'limit_mismatches': ('sum', np.int64),
+    'unknown_status': ('sum', np.int64),
+}
+
+_IDENTITY = {'sum': 0, 'min': np.inf, 'max': -np.inf}
+_REDUCE = {'sum': np.add, 'min': np.minimum, 'max': np.maximum}
+
+CYCLE_TABLE_DTYPE = np.dtype([
+    ('cycle', '<i4'),
+    ('rows', '<i8'),
+    ('t_start', '<f8'),
+    ('t_end', '<f8'),
+    ('peak_torque', '<f8'),
+    ('rms_torque', '<f8'),
+    ('peak_error', '<f8'),
+    ('mean_abs_error', '<f8'),
+    ('dt_mean', '<f8'),
+    ('dt_jitter', '<f8'),
+    ('dt_max', '<f8'),
+    ('anomalies', '<i8'),
+])
+
+
+def limit_mismatch_mask(records, far_margin=FAR_MARGIN, missing_margin=MISSING_MARGIN):
+    """Rows whose limit flags disagree with the logged position
+
+    Any rule of limit_switch_monitor.violation_masks, with the same margins,
+    so the per-cycle counts and the monitor's events flag the same rows.
+    """
+    return violation_masks(records, far_margin, missing_margin).any(axis=0)
+
+
+class CycleAccumulator:
+    """Per-cycle reduction of named values, each combined by sum, min or max
+
+    fields maps a name to (kind, dtype); data[name][c] holds the reduced value
+    for cycle c. Two accumulators with the same fields combine with merge().
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.data = {name: np.empty(0, dtype=dt) for name, (_, dt) in fields.items()}
+
+    def _grow(self, size):
+        n = len(next(iter(self.data.values())))
+        if size <= n:
+            return
+        for name, (kind, dt) in self.fields.items():
+            extra = np.full(size - n, _IDENTITY[kind], dtype=dt)
+            self.data[name] = np.concatenate([self.data[name], extra])
+
+    def add(self, cycles, values):
+        """Reduce per-row values into their cycles (rows need not be sorted)"""
+        if len(cycles) == 0:
+            return
+        starts = np.flatnonzero(np.r_[True, cycles[1:] != cycles[:-1]])
+        run_cycles = cycles[starts]
+        self._grow(int(run_cycles.max()) + 1)
+        for name, (kind, _) in self.fields.items():
+            per_run = _REDUCE[kind].reduceat(values[name], starts)
+            _REDUCE[kind].at(self.data[name], run_cycles, per_run)
+
+    def drop_cycles(self, count):
+        """Discard the first count cycles; cycle count + c becomes cycle c"""
+        for name in self.data:
+            self.data[name] = self.data[name][count:].copy()
+
+    def merge(self, other):
+        """Combine another accumulator (e.g. from another log or worker) into this one"""
+        n = len(next(iter(other.data.values())))
+        self._grow(n)
+        for name, (kind, _) in self.fields.items():
+            self.data[name][:n] = _REDUCE[kind](self.data[name][:n], other.data[name])
+        return self
+
+
+class CycleSummary(CycleAccumulator):
+    """Mergeable per-cycle summary statistics indexed by Cycle number"""
+
+    def __init__(self):
+        super().__init__(_FIELDS)
+        self._last_t = None
+
+    def add_chunk(self, records):
+        """Fold one chunk of consecutive log records into the summary"""
+        if len(records) == 0:
+            return
+        t = records['Timestamp']
+        prev = t[0] if self._last_t is None else self._last_t
+        dt = np.diff(t, prepend=prev)
+        has_dt = np.ones(len(t), dtype=bool)
+        if self._last_t is None:
+            has_dt[0] = False
+        self._last_t = t[-1]
+
+        torque = np.abs(records['Load_Torque'])
+        error = np.abs(records['Target_Position'] - records['Current_Position'])
+        dt_valid = np.where(has_dt, dt, 0.0)
+
+        values = {
+            'rows': np.ones(len(t), dtype=np.int64),
+            't_start': t,
+            't_end': t,
+            'peak_torque': torque,
+            'torque_sq_sum': torque * torque,
+            'peak_error': error,
+            'error_abs_sum': error,
+            'dt_count': has_dt.astype(np.int64),
+            'dt_sum': dt_valid,
+            'dt_sq_sum': dt_valid * dt_valid,
+            'dt_max': np.where(has_dt, dt, -np.inf),
+            'gaps': (has_dt & (dt > GAP_THRESHOLD)).astype(np.int64),
+            'limit_mismatches': limit_mismatch_mask(records).astype(np.int64),
+            'unknown_status': (records['Status'] == STATUS_UNKNOWN).astype(np.int64),
+        }
+
+        self.add(records['Cycle'], values)
+
+    def table(self, start=0, stop=None):
+        """Per-cycle summary rows for every cycle in [start, stop) that has data"""
+        d = self.data
+        present = start + np.flatnonzero(d['rows'][start:stop] > 0)
+        rows = d['rows'][present]
+        dt_count = np.maximum(d['dt_count'][present], 1)
+        dt_mean = d['dt_sum'][present] / dt_count
+        dt_var = np.maximum(d['dt_sq_sum'][present] / dt_count - dt_mean**2, 0.0)
+
+        out = np.empty(len(present), dtype=CYCLE_TABLE_DTYPE)
+        out['cycle'] = present
+        out['rows'] = rows
+        out['t_start'] = d['t_start'][present]
+        out['t_end'] = d['t_end'][present]
+        out['peak_torque'] = d['peak_torque'][present]
+        out['rms_torque'] = np.sqrt(d['torque_sq_sum'][present] / rows)
+        out['peak_error'] = d['peak_error'][present]
+        out['mean_abs_error'] = d['error_abs_sum'][present] / rows
+        out['dt_mean'] = dt_mean
+        out['dt_jitter'] = np.sqrt(dt_var)
+        out['dt_max'] = np.maximum(d['dt_max'][present], 0.0)
+        out['anomalies'] = (d['gaps'][present] + d['limit_mismatches'][present]
+                            + d['unknown_status'][present])
+        return out
+
+    def run_summary(self):
+        """Whole-run totals derived from the per-cycle aggregates"""
+        d = self.data
+        rows = int(d['rows'].sum())
+        dt_count = max(int(d['dt_count'].sum()), 1)
+        dt_mean = float(d['dt_sum'].sum()) / dt_count
+        dt_var = max(float(d['dt_sq_sum'].sum()) / dt_count - dt_mean**2, 0.0)
+        present = d['rows'] > 0
+        return {
+            'rows': rows,
+            'cycles': int(present.sum()),
+            't_start': float(d['t_start'][present].min()) if rows else 0.0,
+            't_end': float(d['t_end'][present].max()) if rows else 0.0,
+            'peak_torque': float(d['peak_torque'][present].max()) if rows else 0.0,
+            'rms_torque': float(np.sqrt(d['torque_sq_sum'].sum() / rows)) if rows else 0.0,
+            'peak_error': float(d['peak_error'][present].max()) if rows else 0.0,
+            'dt_mean': dt_mean,
+            'dt_jitter': float(np.sqrt(dt_var)),
+            'dt_max': float(max(d['dt_max'].max(initial=0.0), 0.0)),
+            'gaps': int(d['gaps'].sum()),
+            'limit_mismatches': int(d['limit_mismatches'].sum()),
+            'unknown_status': int(d['unknown_status'].sum()),
+        }
+
+
+def summarize_cycle_log(log_path=DEFAULT_LOG_PATH, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Build a CycleSummary over a whole log in one streaming pass"""
+    summary = CycleSummary()
+    for records in iter_cycle_log(log_path, chunk_rows):
+        summary.add_chunk(records)
+    return summary
+
+
+if __name__ == "__main__":
+    log_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG_PATH
+
+    summary = summarize_cycle_log(log_path)
+    run = summary.run_summary()
+
+    print("="*60)
+    print("CYCLE LOG SUMMARY")
+    print("="*60)
+    print(f"Log: {log_path}")
+    print(f"Rows: {run['rows']}  Cycles: {run['cycles']}")
+    print(f"Peak Load Torque: {run['peak_torque']:.3f} N⋅m")
+    print(f"Sample Interval: {run['dt_mean']*1000:.2f} ms ± {run['dt_jitter']*1000:.2f} ms")
+    print(f"Anomalies: {run['gaps']} gaps, {run['limit_mismatches']} limit mismatches")
+    print()
+    print(f"{'Cycle':>6} {'Rows':>6} {'Peak T':>8} {'RMS T':>8} {'Peak Err':>9} {'Jitter':>8}")
+    for row in summary.table():
+        print(f"{row['cycle']:6d} {row['rows']:6d} {row['peak_torque']:8.3f} "
+              f"{row['rms_torque']:8.3f} {row['peak_error']:9.3f} {row['dt_jitter']*1000:7.2f}ms")
+    print("="*60)
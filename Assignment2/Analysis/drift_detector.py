@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Cycle-to-Cycle Drift Detection
+Incremental CUSUM/EWMA change detection over per-cycle features
+
+Features per completed cycle (from cycle_summary.CycleSummary):
+- peak_torque, rms_torque, peak_error, mean_abs_error, dt_jitter
+
+For each feature:
+- The first WARMUP_CYCLES cycles set the baseline mean and standard deviation
+- A two-sided standardized CUSUM (slack K, threshold H) accumulates evidence
+  of a sustained shift; an EWMA tracks the current level for reporting
+- On alarm the onset is the cycle after the statistic last sat at zero, i.e.
+  where the drift began rather than where it was confirmed
+- After an alarm the detector stays latched until the statistic returns to zero
+
+Each completed cycle costs O(1) per feature, and live monitoring holds only
+the open cycle's partial aggregates: completed cycles are dropped once their
+features are fed to the detectors, so memory does not grow with the run. The
+same monitor runs live on incoming chunks or over an archived log or
+per-cycle table.
+"""
+
+import sys
+import numpy as np
+
+from cycle_log import DEFAULT_LOG_PATH, DEFAULT_CHUNK_ROWS, iter_cycle_log
+from cycle_summary import CycleSummary
+
+DRIFT_FEATURES = ('peak_torque', 'rms_torque', 'peak_error', 'mean_abs_error', 'dt_jitter')
+WARMUP_CYCLES = 50
+CUSUM_K = 0.5          # slack, in baseline standard deviations
+CUSUM_H = 8.0          # alarm threshold, in baseline standard deviations
+EWMA_LAMBDA = 0.1
+MIN_RELATIVE_SIGMA = 1e-3  # sigma floor relative to |baseline mean|
+
+
+class CusumDetector:
+    """Two-sided CUSUM with a warm-up baseline, for one scalar feature"""
+
+    def __init__(self, name, warmup=WARMUP_CYCLES, k=CUSUM_K, h=CUSUM_H, ewma_lambda=EWMA_LAMBDA):
+        self.name = name
+        self.warmup = warmup
+        self.k = k
+        self.h = h
+        self.ewma_lambda = ewma_lambda
+        self.n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.mu = None
+        self.sigma = None
+        self.ewma = None
+        self.s_high = 0.0
+        self.s_low = 0.0
+        self._onset_high = None
+        self._onset_low = None
+        self._latched_high = False
+        self._latched_low = False
+
+    def update(self, cycle, x):
+        """Add one cycle's value; returns an alarm dict or None"""
+        self.ewma = x if self.ewma is None else self.ewma + self.ewma_lambda * (x - self.ewma)
+        if self.mu is None:
+            # Welford running mean/variance during warm-up
+            self.n += 1
+            delta = x - self._mean
+            self._mean += delta / self.n
+            self._m2 += delta * (x - self._mean)
+            if self.n >= self.warmup:
+                self.mu = self._mean
+                std = np.sqrt(self._m2 / max(self.n - 1, 1))
+                self.sigma = max(std, abs(self.mu) * MIN_RELATIVE_SIGMA, 1e-12)
+            return None
+
+        z = (x - self.mu) / self.sigma
+        if self.s_high == 0.0:
+            self._onset_high = cycle
+        if self.s_low == 0.0:
+            self._onset_low = cycle
+        self.s_high = max(0.0, self.s_high + z - self.k)
+        self.s_low = max(0.0, self.s_low - z - self.k)
+        if self.s_high == 0.0:
+            self._latched_high = False
+        if self.s_low == 0.0:
+            self._latched_low = False
+
+        if self.s_high > self.h and not self._latched_high:
+            self._latched_high = True
+            return self._alarm('increase', self._onset_high, cycle, self.s_high)
+        if self.s_low > self.h and not self._latched_low:
+            self._latched_low = True
+            return self._alarm('decrease', self._onset_low, cycle, self.s_low)
+        return None
+
+    def _alarm(self, direction, onset, cycle, statistic):
+        return {
+            'feature': self.name,
+            'direction': direction,
+            'onset_cycle': int(onset),
+            'alarm_cycle': int(cycle),
+            'baseline': self.mu,
+            'baseline_sigma': self.sigma,
+            'ewma': self.ewma,
+            'statistic': statistic,
+        }
+
+
+class DriftMonitor:
+    """Feeds completed cycles' features to one CusumDetector per feature"""
+
+    def __init__(self, features=DRIFT_FEATURES, **detector_args):
+        self.features = features
+        self.detectors = {name: CusumDetector(name, **detector_args) for name in features}
+        # Aggregates of the cycles not yet fed, numbered from _next_cycle
+        self.summary = CycleSummary()
+        self.alarms = []
+        self._next_cycle = 0
+
+    @property
+    def cycles_completed(self):
+        return self._next_cycle
+
+    def update_cycle(self, cycle, values):
+        """Feed one completed cycle's features (mapping name -> value)"""
+        raised = []
+        for name in self.features:
+            alarm = self.detectors[name].update(cycle, float(values[name]))
+            if alarm is not None:
+                raised.append(alarm)
+        self.alarms.extend(raised)
+        return raised
+
+    def _emit_completed(self, upto):
+        raised = []
+        if upto <= self._next_cycle:
+            return raised
+        count = upto - self._next_cycle
+        table = self.summary.table(0, count)
+        table['cycle'] += self._next_cycle
+        self.summary.drop_cycles(count)
+        self._next_cycle = upto
+        for row in table:
+            raised.extend(self.update_cycle(int(row['cycle']), row))
+        return raised
+
+    def add_chunk(self, records):
+        """Live use: returns alarms for cycles completed by this chunk"""
+        if len(records) == 0:
+            return []
+        local = records.copy()
+        local['Cycle'] -= self._next_cycle
+        self.summary.add_chunk(local)
+        return self._emit_completed(int(records['Cycle'][-1]))
+
+    def finish(self):
+        """Treat the last (open) cycle as complete"""
+        return self._emit_completed(self._next_cycle + len(self.summary.data['rows']))
+
+    def scan_table(self, table):
+        """Archived use: feed a per-cycle table (CYCLE_TABLE_DTYPE rows) in order"""
+        raised = []
+        for row in np.sort(table, order='cycle'):
+            raised.extend(self.update_cycle(int(row['cycle']), row))
+        return raised
+
+
+def scan_cycle_log(log_path=DEFAULT_LOG_PATH, chunk_rows=DEFAULT_CHUNK_ROWS, **detector_args):
+    """All drift alarms of an archived log"""
+    monitor = DriftMonitor(**detector_args)
+    for records in iter_cycle_log(log_path, chunk_rows):
+        monitor.add_chunk(records)
+    monitor.finish()
+    return monitor
+
+
+if __name__ == "__main__":
+    log_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG_PATH
+
+    monitor = scan_cycle_log(log_path)
+
+    print("="*60)
+    print("CYCLE DRIFT DETECTION (CUSUM)")
+    print("="*60)
+    print(f"Log: {log_path}")
+    print(f"Cycles: {monitor.cycles_completed}  Warm-up: {WARMUP_CYCLES}  k={CUSUM_K}  h={CUSUM_H}")
+    for name, det in monitor.detectors.items():
+        if det.mu is None:
+            print(f"  {name}: baseline not established ({det.n} cycles)")
+        else:
+            print(f"  {name}: baseline {det.mu:.4f} ± {det.sigma:.4f}, EWMA {det.ewma:.4f}")
+    if monitor.alarms:
+        print("\nDrift Alarms:")
+        for a in monitor.alarms:
+            print(f"  {a['feature']} {a['direction']}: began cycle {a['onset_cycle']}, "
+                  f"confirmed cycle {a['alarm_cycle']} (baseline {a['baseline']:.4f}, "
+                  f"now {a['ewma']:.4f})")
+    else:
+        print("\n✅ No drift detected")
+    print("="*60)
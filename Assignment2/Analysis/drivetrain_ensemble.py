@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Pendulum and Drivetrain Ensemble Integrator
+Nonlinear motor, gearbox, rope-chain and pendulum dynamics for many rigs at once
+
+Model per rig (angles in rad, motor side before the gearbox):
+- Motor:     J_m·φ̈ = τ_m - b_m·φ̇ - F·r_a/n_g
+- Rope:      F = k·x + c·ẋ with stretch x = r_a·φ/n_g - r_e·θ, the rope chain
+             lumped into one elastic stage from drum A (r_a) to drum E (r_e)
+- Pendulum:  (M·L² + J_extra)·θ̈ = F·r_e - M·g·L·sin(θ) - τ_c·tanh(θ̇/ω_s) - b_p·θ̇
+- Control:   τ_m = kp·(φ_ref - φ) + kd·(φ̇_ref - φ̇) + M·g·L·sin(θ_ref)/N,
+             clipped to ±torque_limit, with N = n_g·r_e/r_a and
+             φ_ref = N·θ_ref + n_g·x_s/r_a, x_s = M·g·L·sin(θ_ref)/(r_e·k) being
+             the static rope stretch, so a rig resting on the reference is in
+             equilibrium at any angle
+
+At rest the motor holds M·g·L·sin(θ)/N, i.e. MOTOR_TORQUE at 90° with the
+default drums (r_e/r_a = ROPE_RATIO) and gearbox.
+
+The state of every rig is one column of a (4, P) array, so a step of the
+whole ensemble is a few dozen array operations:
+- rk4:  classic fixed-step Runge-Kutta
+- rk45: Dormand-Prince 5(4) with one step size shared by the ensemble, set
+        by the worst rig's error estimate and cut to land on output times
+Peaks, time-weighted RMS and saturation time are accumulated at every step;
+the angle, motor torque and rope tension are optionally recorded every out_dt.
+"""
+
+import sys
+import time
+import numpy as np
+
+from cycle_log import (PENDULUM_MASS, PENDULUM_LENGTH, GRAVITY, MOTOR_TORQUE, GEARBOX_RATIO,
+                      ROPE_RATIO, MIN_ANGLE, MAX_ANGLE, MOTION_TIME, CONTROL_PERIOD_MS)
+from trajectory_profiles import ACCEL_FRACTION, JERK_FRACTION, profile_shape
+
+DT = 0.001                  # s, RK4 step
+OUT_DT = CONTROL_PERIOD_MS / 1000.0
+FRICTION_SPEED = 0.01       # rad/s, smoothing of the Coulomb pivot friction
+
+RIG_DEFAULTS = {
+    'mass': PENDULUM_MASS,            # kg
+    'length': PENDULUM_LENGTH,        # m
+    'extra_inertia': 0.0,             # kg⋅m², arm and drum E about the pivot
+    'drum_motor': 0.020,              # m, diameter of drum A after the gearbox
+    'drum_load': 0.020 * ROPE_RATIO,  # m, diameter of drum E on the pendulum shaft
+    'gear_ratio': GEARBOX_RATIO,
+    'rope_stiffness': 5.0e5,          # N/m
+    'rope_damping': 50.0,             # N⋅s/m
+    'motor_inertia': 1.5e-4,          # kg⋅m², rotor plus gearbox input
+    'motor_friction': 1.0e-4,         # N⋅m⋅s/rad
+    'pivot_friction': 0.05,           # N⋅m, Coulomb
+    'pivot_damping': 0.01,            # N⋅m⋅s/rad
+    'torque_limit': np.inf,           # N⋅m at the motor
+    'kp': 1.0,                        # N⋅m/rad at the motor
+    'kd': 0.04,                       # N⋅m⋅s/rad at the motor
+}
+RIG_DTYPE = np.dtype([(name, '<f8') for name in RIG_DEFAULTS])
+
+ENSEMBLE_SUMMARY_DTYPE = np.dtype([
+    ('peak_motor_torque', '<f8'),   # N⋅m
+    ('rms_motor_torque', '<f8'),    # N⋅m
+    ('torque_ratio', '<f8'),        # peak_motor_torque / MOTOR_TORQUE
+    ('saturated_time', '<f8'),      # s at the torque limit
+    ('peak_tension', '<f8'),        # N
+    ('tracking_rms', '<f8'),        # degrees
+    ('tracking_max', '<f8'),        # degrees
+    ('peak_motor_speed', '<f8'),    # rpm
+])
+
+# Dormand-Prince 5(4) tableau
+_DP_C = [0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0]
+_DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+_DP_E = [71 / 57600, 0.0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40]
+
+
+def rig_grid(**axes):
+    """RIG_DTYPE rows for every combination of the given parameter values"""
+    for name in axes:
+        if name not in RIG_DEFAULTS:
+            raise KeyError(f"Unknown rig parameter {name}")
+    names = list(axes)
+    values = np.meshgrid(*(np.atleast_1d(np.asarray(axes[n], dtype=np.float64)) for n in names),
+                         indexing='ij') if names else []
+    rigs = np.empty(values[0].size if names else 1, dtype=RIG_DTYPE)
+    for name, default in RIG_DEFAULTS.items():
+        rigs[name] = default
+    for name, v in zip(names, values):
+        rigs[name] = v.ravel()
+    return rigs
+
+
+def cycling_reference(kind='minimum_jerk', motion_time=MOTION_TIME, start=MIN_ANGLE,
+                      end=MAX_ANGLE, accel_fraction=ACCEL_FRACTION, jerk_fraction=JERK_FRACTION):
+    """reference(t) -> (θ_ref, θ̇_ref) in rad for back-to-back moves start ↔ end
+
+    Arguments broadcast over the ensemble, so every rig can follow its own
+    profile and move time.
+    """
+    motion_time = np.asarray(motion_time, dtype=np.float64)
+    start, distance = np.radians(start), np.radians(end) - np.radians(start)
+
+    def reference(t):
+        move = np.floor(t / motion_time)
+        s, ds = profile_shape(kind, t / motion_time - move, accel_fraction, jerk_fraction)[:2]
+        up = move % 2 == 0
+        theta = start + distance * np.where(up, s, 1.0 - s)
+        omega = distance / motion_time * np.where(up, ds, -ds)
+        return theta, omega
+
+    return reference
+
+
+class EnsembleIntegrator:
+    """Advances every rig of a RIG_DTYPE array in lockstep"""
+
+    def __init__(self, rigs, reference):
+        self.rigs = rigs
+        self.reference = reference
+        p = {name: rigs[name].astype(np.float64) for name in RIG_DTYPE.names}
+        p['r_motor'] = p['drum_motor'] / 2.0
+        p['r_load'] = p['drum_load'] / 2.0
+        p['inertia'] = p['mass'] * p['length'] ** 2 + p['extra_inertia']
+        p['ratio'] = p['gear_ratio'] * p['r_load'] / p['r_motor']   # motor rad per pendulum rad
+        p['gravity'] = p['mass'] * GRAVITY * p['length']
+        self.p = p
+        self.steps = 0
+        self.rejected = 0
+
+    def motor_reference(self, theta_ref, omega_ref):
+        """(φ_ref, φ̇_ref): motor angle that holds θ_ref with the rope at its static stretch"""
+        p = self.p
+        # Motor rad per N⋅m of gravity torque at the load, through the rope stretch
+        compliance = p['gear_ratio'] / (p['r_motor'] * p['r_load'] * p['rope_stiffness'])
+        phi = p['ratio'] * theta_ref + compliance * p['gravity'] * np.sin(theta_ref)
+        omega = (p['ratio'] + compliance * p['gravity'] * np.cos(theta_ref)) * omega_ref
+        return phi, omega
+
+    def initial_state(self):
+        """Rigs at rest on the reference start with the rope holding the static load"""
+        theta, _ = self.reference(0.0)
+        theta = np.broadcast_to(theta, (len(self.rigs),)).astype(np.float64)
+        zeros = np.zeros(len(self.rigs))
+        phi, _ = self.motor_reference(theta, zeros)
+        return np.stack([phi, zeros, theta, zeros])
+
+    def forces(self, t, y):
+        """(motor torque, rope tension, θ_ref) at state y"""
+        p = self.p
+        phi, omega_m, theta, omega = y
+        theta_ref, omega_ref = self.reference(t)
+        phi_ref, omega_m_ref = self.motor_reference(theta_ref, omega_ref)
+        torque = (p['kp'] * (phi_ref - phi)
+                  + p['kd'] * (omega_m_ref - omega_m)
+                  + p['gravity'] * np.sin(theta_ref) / p['ratio'])
+        torque = np.clip(torque, -p['torque_limit'], p['torque_limit'])
+        stretch = p['r_motor'] * phi / p['gear_ratio'] - p['r_load'] * theta
+        stretch_rate = p['r_motor'] * omega_m / p['gear_ratio'] - p['r_load'] * omega
+        tension = p['rope_stiffness'] * stretch + p['rope_damping'] * stretch_rate
+        return torque, tension, theta_ref
+
+    def derivatives(self, t, y):
+        p = self.p
+        torque, tension, _ = self.forces(t, y)
+        _, omega_m, theta, omega = y
+        motor_acc = (torque - p['motor_friction'] * omega_m
+                     - tension * p['r_motor'] / p['gear_ratio']) / p['motor_inertia']
+        pivot = p['pivot_friction'] * np.tanh(omega / FRICTION_SPEED) + p['pivot_damping'] * omega
+        load_acc = (tension * p['r_load'] - p['gravity'] * np.sin(theta) - pivot) / p['inertia']
+        return np.stack([omega_m, motor_acc, omega, load_acc])
+
+    def _rk4_step(self, t, y, h):
+        k1 = self.derivatives(t, y)
+        k2 = self.derivatives(t + h / 2, y + h / 2 * k1)
+        k3 = self.derivatives(t + h / 2, y + h / 2 * k2)
+        k4 = self.derivatives(t + h, y + h * k3)
+        return y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+    def _dp_step(self, t, y, h, k1):
+        k = [k1]
+        for c, row in zip(_DP_C[1:], _DP_A[1:]):
+            k.append(self.derivatives(t + c * h, y + h * sum(a * ki for a, ki in zip(row, k) if a)))
+        y_new = y + h * sum(a * ki for a, ki in zip(_DP_A[6], k) if a)
+        error = h * sum(e * ki for e, ki in zip(_DP_E, k) if e)
+        return y_new, error, k[6]
+
+    def rk4(self, duration, dt=DT, out_dt=OUT_DT, record=False):
+        """Fixed-step RK4 to duration; returns (summary, recording or None)"""
+        per_out = max(1, int(round(out_dt / dt)))
+        n_steps = int(np.ceil(duration / dt - 1e-9))
+        y = self.initial_state()
+        acc = _Accumulator(self, y, record)
+        for i in range(n_steps):
+            t = i * dt
+            y = self._rk4_step(t, y, dt)
+            acc.add(t + dt, y, dt, (i + 1) % per_out == 0)
+        self.steps += n_steps
+        return acc.summary(), acc.recording()
+
+    def rk45(self, duration, out_dt=OUT_DT, rtol=1e-6, atol=1e-8, h0=DT, record=False):
+        """Adaptive Dormand-Prince to duration; returns (summary, recording or None)"""
+        y = self.initial_state()
+        acc = _Accumulator(self, y, record)
+        t, h = 0.0, h0
+        next_out = out_dt
+        k1 = self.derivatives(t, y)
+        while t < duration - 1e-12:
+            h = min(h, next_out - t, duration - t)
+            y_new, error, k7 = self._dp_step(t, y, h, k1)
+            scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+            norm = np.sqrt(np.mean((error / scale) ** 2, axis=0)).max()
+            if norm <= 1.0:
+                t += h
+                y, k1 = y_new, k7
+                at_out = abs(t - next_out) < 1e-12
+                acc.add(t, y, h, at_out)
+                if at_out:
+                    next_out += out_dt
+                self.steps += 1
+            else:
+                self.rejected += 1
+            h *= min(5.0, max(0.2, 0.9 * norm ** -0.2 if norm > 0 else 5.0))
+        return acc.summary(), acc.recording()
+
+
+class _Accumulator:
+    """Per-rig peaks and time-weighted sums, plus the optional recording"""
+
+    def __init__(self, integrator, y, record):
+        self.integrator = integrator
+        n = y.shape[1]
+        self.time = 0.0
+        self.peak_torque = np.zeros(n)
+        self.torque_sq = np.zeros(n)
+        self.saturated = np.zeros(n)
+        self.peak_tension = np.zeros(n)
+        self.error_sq = np.zeros(n)
+        self.error_max = np.zeros(n)
+        self.peak_speed = np.zeros(n)
+        self.record = record
+        self.rows = {name: [] for name in ('time', 'theta', 'reference', 'motor_torque', 'tension')}
+
+    def add(self, t, y, h, sample):
+        torque, tension, theta_ref = self.integrator.forces(t, y)
+        error = np.degrees(theta_ref - y[2])
+        self.time += h
+        self.peak_torque = np.maximum(self.peak_torque, np.abs(torque))
+        self.torque_sq += torque * torque * h
+        self.saturated += h * (np.abs(torque) >= self.integrator.p['torque_limit'])
+        self.peak_tension = np.maximum(self.peak_tension, np.abs(tension))
+        self.error_sq += error * error * h
+        self.error_max = np.maximum(self.error_max, np.abs(error))
+        self.peak_speed = np.maximum(self.peak_speed, np.abs(y[1]))
+        if self.record and sample:
+            self.rows['time'].append(t)
+            self.rows['theta'].append(np.degrees(y[2]))
+            self.rows['reference'].append(np.degrees(np.broadcast_to(theta_ref, y[2].shape)))
+            self.rows['motor_torque'].append(torque)
+            self.rows['tension'].append(tension)
+
+    def summary(self):
+        out = np.empty(len(self.peak_torque), dtype=ENSEMBLE_SUMMARY_DTYPE)
+        span = max(self.time, 1e-12)
+        out['peak_motor_torque'] = self.peak_torque
+        out['rms_motor_torque'] = np.sqrt(self.torque_sq / span)
+        out['torque_ratio'] = self.peak_torque / MOTOR_TORQUE
+        out['saturated_time'] = self.saturated
+        out['peak_tension'] = self.peak_tension
+        out['tracking_rms'] = np.sqrt(self.error_sq / span)
+        out['tracking_max'] = self.error_max
+        out['peak_motor_speed'] = self.peak_speed * 60.0 / (2.0 * np.pi)
+        return out
+
+    def recording(self):
+        """{'time': (T,), 'theta', 'reference', 'motor_torque', 'tension': (T, P)}"""
+        if not self.record:
+            return None
+        return {name: np.array(values) for name, values in self.rows.items()}
+
+
+if __name__ == "__main__":
+    method = sys.argv[1] if len(sys.argv) > 1 else 'rk4'
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    rigs = rig_grid(mass=np.linspace(1.0, 3.0, 9),
+                    drum_load=0.020 * np.linspace(1.25, 3.25, 9),
+                    rope_stiffness=[1.0e5, 5.0e5, 2.0e6],
+                    pivot_friction=[0.0, 0.05, 0.2])
+    integrator = EnsembleIntegrator(rigs, cycling_reference())
+    duration = 2 * cycles * MOTION_TIME
+
+    start = time.perf_counter()
+    if method == 'rk45':
+        summary, _ = integrator.rk45(duration)
+    else:
+        summary, _ = integrator.rk4(duration)
+    elapsed = time.perf_counter() - start
+
+    print("="*60)
+    print("PENDULUM AND DRIVETRAIN ENSEMBLE")
+    print("="*60)
+    print(f"Rigs: {len(rigs)}  Method: {method}  Simulated: {duration:.1f} s of "
+          f"{cycles} cycle(s) in {elapsed:.2f} s")
+    print(f"Steps: {integrator.steps}" + (f" ({integrator.rejected} rejected)" if method == 'rk45' else ''))
+    print(f"Peak Motor Torque: {summary['peak_motor_torque'].min():.3f} to "
+          f"{summary['peak_motor_torque'].max():.3f} N⋅m (requirement {MOTOR_TORQUE} N⋅m)")
+    print(f"Peak Rope Tension: {summary['peak_tension'].min():.1f} to "
+          f"{summary['peak_tension'].max():.1f} N")
+    print(f"Tracking RMS: {summary['tracking_rms'].min():.3f} to "
+          f"{summary['tracking_rms'].max():.3f}°")
+    worst = np.argmax(summary['peak_motor_torque'])
+    print(f"Worst Rig: mass {rigs['mass'][worst]:.2f} kg, drum E {rigs['drum_load'][worst]*1000:.1f} mm, "
+          f"rope {rigs['rope_stiffness'][worst]:.0e} N/m, pivot friction "
+          f"{rigs['pivot_friction'][worst]:.2f} N⋅m")
+    print("="*60)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Cycle Log Event Index
+Direction reversals, limit-switch transitions and status changes by row
+
+Event types (one row of EVENT_INDEX_DTYPE per event):
+- STATUS_CHANGE:   Status differs from the previous row (value = new status
+                   code); the first row of the log is indexed as well
+- LIMIT_0_ON/OFF:  Limit_0 rising / falling edge
+- LIMIT_90_ON/OFF: Limit_90 rising / falling edge
+- VELOCITY_POS/NEG: Velocity becomes positive / negative after last having
+                   the opposite sign (zero samples do not end a sign run)
+
+The index is built in one streaming pass with vectorized edge detection on
+each chunk; the last row's state is carried across chunk boundaries. Events
+are stored in row order as compact arrays in <log>.events.npz. Rows, times
+and cycles are all monotonic, so lookups by row, time or cycle are binary
+searches over contiguous key arrays made at load time, and a type-sorted
+permutation makes "the n-th event of a type" O(1).
+"""
+
+import os
+import sys
+import numpy as np
+
+from cycle_log import DEFAULT_LOG_PATH, DEFAULT_CHUNK_ROWS, iter_cycle_log, status_name
+
+EVENT_INDEX_SUFFIX = '.events.npz'
+
+STATUS_CHANGE = 0
+LIMIT_0_ON = 1
+LIMIT_0_OFF = 2
+LIMIT_90_ON = 3
+LIMIT_90_OFF = 4
+VELOCITY_POS = 5
+VELOCITY_NEG = 6
+EVENT_TYPE_NAMES = ['STATUS_CHANGE', 'LIMIT_0_ON', 'LIMIT_0_OFF', 'LIMIT_90_ON',
+                    'LIMIT_90_OFF', 'VELOCITY_POS', 'VELOCITY_NEG']
+
+EVENT_INDEX_DTYPE = np.dtype([
+    ('row', '<i8'),      # row index in the log (0-based, header excluded)
+    ('time', '<f8'),
+    ('cycle', '<i4'),
+    ('type', 'u1'),
+    ('value', 'u1'),     # new status code for STATUS_CHANGE, else 0
+])
+
+
+def event_index_path(log_path):
+    """File holding the event index for a given log"""
+    return log_path + EVENT_INDEX_SUFFIX
+
+
+def _edges(values, previous):
+    """Rows where values differ from the preceding row (previous = carried row)"""
+    prev = np.empty_like(values)
+    prev[1:] = values[:-1]
+    if previous is None:
+        prev[:1] = values[:1]
+    else:
+        prev[:1] = previous
+    return np.flatnonzero(values != prev)
+
+
+class EventIndexBuilder:
+    """Streaming builder: feed raw chunks, then finish() for the sorted index"""
+
+    def __init__(self):
+        self.rows = 0
+        self._parts = []
+        self._status = None
+        self._limit_0 = None
+        self._limit_90 = None
+        self._velocity_sign = 0
+
+    def _events(self, records, local_rows, types, values=0):
+        part = np.empty(len(local_rows), dtype=EVENT_INDEX_DTYPE)
+        part['row'] = self.rows + local_rows
+        part['time'] = records['Timestamp'][local_rows]
+        part['cycle'] = records['Cycle'][local_rows]
+        part['type'] = types
+        part['value'] = values
+        return part
+
+    def add_chunk(self, records):
+        n = len(records)
+        if n == 0:
+            return
+        parts = []
+
+        status = records['Status']
+        rows = _edges(status, self._status)
+        if self._status is None:
+            rows = np.r_[0, rows]
+        parts.append(self._events(records, rows, STATUS_CHANGE, status[rows]))
+
+        for column, carried, on, off in (('Limit_0', self._limit_0, LIMIT_0_ON, LIMIT_0_OFF),
+                                         ('Limit_90', self._limit_90, LIMIT_90_ON, LIMIT_90_OFF)):
+            flag = records[column] != 0
+            rows = _edges(flag, None if carried is None else bool(carried))
+            parts.append(self._events(records, rows, np.where(flag[rows], on, off)))
+
+        # Sign runs ignore zeros: compare each nonzero sample to the previous nonzero one
+        sign = np.sign(records['Velocity']).astype(np.int8)
+        nonzero = np.flatnonzero(sign)
+        if len(nonzero):
+            signs = sign[nonzero]
+            rows = _edges(signs, self._velocity_sign if self._velocity_sign else None)
+            parts.append(self._events(records, nonzero[rows],
+                                      np.where(signs[rows] > 0, VELOCITY_POS, VELOCITY_NEG)))
+            self._velocity_sign = int(signs[-1])
+
+        chunk = np.concatenate(parts)
+        self._parts.append(chunk[np.argsort(chunk['row'], kind='stable')])
+        self._status = status[-1]
+        self._limit_0 = records['Limit_0'][-1] != 0
+        self._limit_90 = records['Limit_90'][-1] != 0
+        self.rows += n
+
+    def finish(self):
+        events = (np.concatenate(self._parts) if self._parts
+                  else np.empty(0, dtype=EVENT_INDEX_DTYPE))
+        return EventIndex(events, self.rows)
+
+
+def build_event_index(log_path=DEFAULT_LOG_PATH, index_path=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Index a cycle log in one streaming pass and save it next to the log"""
+    builder = EventIndexBuilder()
+    for records in iter_cycle_log(log_path, chunk_rows):
+        builder.add_chunk(records)
+    index = builder.finish()
+    index.save(index_path or event_index_path(log_path))
+    return index
+
+
+class EventIndex:
+    """Row-ordered events with binary-search navigation"""
+
+    def __init__(self, events, total_rows):
+        self.events = events
+        self.total_rows = total_rows
+        # Contiguous copies of the search keys: searchsorted on a strided field
+        # view copies the whole column on every call
+        self._rows = np.ascontiguousarray(events['row'])
+        self._times = np.ascontiguousarray(events['time'])
+        self._cycles = np.ascontiguousarray(events['cycle'])
+        # Events grouped by type, each group still in row order
+        self._by_type = np.argsort(events['type'], kind='stable')
+        self._type_starts = np.searchsorted(events['type'][self._by_type],
+                                            np.arange(len(EVENT_TYPE_NAMES) + 1))
+        self._type_rows = self._rows[self._by_type]
+
+    @classmethod
+    def load(cls, path):
+        if not path.endswith(EVENT_INDEX_SUFFIX):
+            path = event_index_path(path)
+        with np.load(path) as data:
+            return cls(data['events'], int(data['total_rows']))
+
+    def save(self, path):
+        # Write through a file object so np.savez does not append '.npz' again
+        with open(path, 'wb') as f:
+            np.savez(f, events=self.events, total_rows=self.total_rows)
+
+    def __len__(self):
+        return len(self.events)
+
+    def count(self, event_type):
+        return int(self._type_starts[event_type + 1] - self._type_starts[event_type])
+
+    def of_type(self, event_type):
+        """All events of one type, in row order"""
+        lo, hi = self._type_starts[event_type], self._type_starts[event_type + 1]
+        return self.events[self._by_type[lo:hi]]
+
+    def nth(self, event_type, n):
+        """The n-th (0-based; negative counts from the end) event of a type"""
+        count = self.count(event_type)
+        if not -count <= n < count:
+            raise IndexError(f"{EVENT_TYPE_NAMES[event_type]} has {count} events")
+        return self.events[self._by_type[self._type_starts[event_type] + n % count]]
+
+    def _select(self, lo, hi, event_type):
+        view = self.events[lo:hi]
+        return view if event_type is None else view[view['type'] == event_type]
+
+    def between_rows(self, row_start, row_end, event_type=None):
+        """Events with row_start <= row < row_end"""
+        return self._select(np.searchsorted(self._rows, row_start),
+                            np.searchsorted(self._rows, row_end), event_type)
+
+    def between_times(self, t_start, t_end, event_type=None):
+        """Events with t_start <= time <= t_end"""
+        return self._select(np.searchsorted(self._times, t_start),
+                            np.searchsorted(self._times, t_end, side='right'), event_type)
+
+    def in_cycle(self, cycle, event_type=None):
+        """Events logged with the given Cycle number"""
+        return self._select(np.searchsorted(self._cycles, cycle),
+                            np.searchsorted(self._cycles, cycle, side='right'), event_type)
+
+    def next_after(self, row, event_type):
+        """First event of a type strictly after a row, or None"""
+        lo, hi = self._type_starts[event_type], self._type_starts[event_type + 1]
+        i = lo + np.searchsorted(self._type_rows[lo:hi], row, side='right')
+        return self.events[self._by_type[i]] if i < hi else None
+
+    def previous_before(self, row, event_type):
+        """Last event of a type strictly before a row, or None"""
+        lo, hi = self._type_starts[event_type], self._type_starts[event_type + 1]
+        i = lo + np.searchsorted(self._type_rows[lo:hi], row)
+        return self.events[self._by_type[i - 1]] if i > lo else None
+
+
+def format_event(event):
+    name = EVENT_TYPE_NAMES[event['type']]
+    if event['type'] == STATUS_CHANGE:
+        name += f" → {status_name(event['value'])}"
+    return f"row {event['row']:>9d}  t={event['time']:10.3f} s  cycle {event['cycle']:4d}  {name}"
+
+
+if __name__ == "__main__":
+    log_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG_PATH
+    path = event_index_path(log_path)
+
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(log_path):
+        index = EventIndex.load(path)
+    else:
+        index = build_event_index(log_path)
+
+    print("="*60)
+    print("CYCLE LOG EVENT INDEX")
+    print("="*60)
+    print(f"Log: {log_path}")
+    print(f"Index: {path} ({index.total_rows} rows, {len(index)} events)")
+    for code, name in enumerate(EVENT_TYPE_NAMES):
+        print(f"  {name:14s} {index.count(code)}")
+    if index.count(LIMIT_90_ON):
+        print("\nLast Limit 90 hit:")
+        print(f"  {format_event(index.nth(LIMIT_90_ON, -1))}")
+    print("="*60)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Command-to-Response Latency
+Delay of Current_Position behind Target_Position per cycle and per run
+
+For each cycle the sample-to-sample changes of Target and Current are
+cross-correlated through the FFT. (The positions themselves are too smooth:
+their correlation peak is broad and the finite-window taper pulls it towards
+zero lag.) The lag of the correlation peak, refined to a fraction of a sample
+by a parabola through the peak and its neighbours, is the delay. All
+cycles of a batch are zero-padded into one 2-D array and transformed with a
+single rfft call per signal, so a campaign costs O(n log n) per cycle instead
+of O(n·lags) direct correlation loops.
+
+Reported per cycle:
+- delay (s) and lag in samples of the log's median Timestamp step, which
+  also sizes the ±MAX_LAG search window; positive means Current trails
+  Target, NaN when the correlation peak sits on the search bound
+- peak normalized correlation (1.0 = Current is a pure shift of Target)
+- RMS tracking error, and the RMS residual after shifting Target by the delay
+- lag_fraction: share of the tracking-error energy explained by pure lag
+
+The run-level delay is the peak of the normalized correlations summed over
+all cycles with a measured delay, which is steadier than averaging
+per-cycle peaks; it too is NaN if that peak lands on the bound.
+"""
+
+import sys
+import numpy as np
+
+from cycle_log import (DEFAULT_LOG_PATH, DEFAULT_CHUNK_ROWS, CONTROL_PERIOD_MS,
+                       CYCLE_LOG_DTYPE, iter_cycle_log)
+
+MAX_LAG = 0.5          # s, largest delay searched in either direction
+BATCH_CYCLES = 256     # cycles transformed together
+
+LATENCY_DTYPE = np.dtype([
+    ('cycle', '<i4'),
+    ('rows', '<i8'),
+    ('lag_samples', '<f8'),
+    ('delay', '<f8'),            # s
+    ('correlation', '<f8'),
+    ('rms_error', '<f8'),
+    ('rms_residual', '<f8'),     # after removing the delay
+    ('lag_fraction', '<f8'),
+])
+
+
+def _parabolic_peak(corr, peak):
+    """Sub-sample offset of the maximum of each row around integer index peak"""
+    rows = np.arange(len(corr))
+    inner = (peak > 0) & (peak < corr.shape[1] - 1)
+    left = corr[rows, np.maximum(peak - 1, 0)]
+    mid = corr[rows, peak]
+    right = corr[rows, np.minimum(peak + 1, corr.shape[1] - 1)]
+    denom = left - 2.0 * mid + right
+    ok = inner & (denom < 0)
+    return np.where(ok, 0.5 * (left - right) / np.where(ok, denom, 1.0), 0.0)
+
+
+def _shift_rows(x, lengths, shift):
+    """x[i - shift] per row with linear interpolation; NaN outside each row"""
+    n = x.shape[1]
+    index = np.arange(n)[None, :]
+    src = index - shift[:, None]
+    i0 = np.floor(src).astype(np.int64)
+    frac = src - i0
+    valid = (src >= 0) & (src <= (lengths - 1)[:, None]) & (index < lengths[:, None])
+    lo = np.take_along_axis(x, np.clip(i0, 0, n - 1), axis=1)
+    hi = np.take_along_axis(x, np.clip(i0 + 1, 0, n - 1), axis=1)
+    return np.where(valid, lo + frac * (hi - lo), np.nan)
+
+
+def correlate_cycles(target, current, lengths, max_lag):
+    """Normalized cross-correlation of padded per-cycle rows over ±max_lag samples
+
+    target, current: (cycles, n) arrays, row i valid for its first lengths[i]
+    samples and zero after. Returns (cycles, 2*max_lag + 1), lag -max_lag first.
+    """
+    valid = np.arange(target.shape[1])[None, :] < lengths[:, None]
+    count = np.maximum(lengths, 1)
+    t = np.where(valid, target, 0.0)
+    c = np.where(valid, current, 0.0)
+    t = np.where(valid, t - (t.sum(1) / count)[:, None], 0.0)
+    c = np.where(valid, c - (c.sum(1) / count)[:, None], 0.0)
+
+    nfft = 1 << int(np.ceil(np.log2(target.shape[1] + max_lag)))
+    spectrum = np.conj(np.fft.rfft(t, nfft)) * np.fft.rfft(c, nfft)
+    full = np.fft.irfft(spectrum, nfft)
+    corr = np.concatenate([full[:, nfft - max_lag:], full[:, :max_lag + 1]], axis=1)
+
+    norm = np.sqrt((t * t).sum(1) * (c * c).sum(1))
+    return corr / np.where(norm > 0, norm, 1.0)[:, None]
+
+
+def cycle_latencies(records, max_lag_samples, sample_period):
+    """Latency table and summed correlation for whole cycles in records
+
+    Lags are in samples of sample_period seconds, which also converts them
+    to delays.
+    """
+    cycles = records['Cycle']
+    starts = np.flatnonzero(np.r_[True, cycles[1:] != cycles[:-1]])
+    lengths = np.diff(np.r_[starts, len(records)])
+    seg = np.repeat(np.arange(len(starts)), lengths)
+    col = np.arange(len(records)) - starts[seg]
+
+    shape = (len(starts), int(lengths.max()))
+    target = np.zeros(shape)
+    current = np.zeros(shape)
+    target[seg, col] = records['Target_Position']
+    current[seg, col] = records['Current_Position']
+
+    corr = correlate_cycles(np.diff(target, axis=1), np.diff(current, axis=1),
+                            lengths - 1, max_lag_samples)
+    peak = np.argmax(corr, axis=1)
+    # A peak on the search bound is not a measured delay: the true one lies
+    # beyond ±max_lag, or there is no clear peak at all
+    bounded = (peak == 0) | (peak == 2 * max_lag_samples)
+    lag = np.where(bounded, np.nan, peak - max_lag_samples + _parabolic_peak(corr, peak))
+
+    valid = np.arange(shape[1])[None, :] < lengths[:, None]
+    error = np.where(valid, target - current, 0.0)
+    rms_error = np.sqrt((error * error).sum(1) / lengths)
+    residual = _shift_rows(target, lengths, np.where(bounded, 0.0, lag)) - current
+    residual_valid = ~np.isnan(residual)
+    rms_residual = np.sqrt(np.where(residual_valid, residual * residual, 0.0).sum(1)
+                           / np.maximum(residual_valid.sum(1), 1))
+    energy = rms_error * rms_error
+
+    out = np.empty(len(starts), dtype=LATENCY_DTYPE)
+    out['cycle'] = cycles[starts]
+    out['rows'] = lengths
+    out['lag_samples'] = lag
+    out['delay'] = lag * sample_period
+    out['correlation'] = corr[np.arange(len(starts)), peak]
+    out['rms_error'] = rms_error
+    out['rms_residual'] = np.where(bounded, np.nan, rms_residual)
+    out['lag_fraction'] = np.where(bounded, np.nan, np.where(
+        energy > 0, np.clip(1.0 - rms_residual**2 / np.where(energy > 0, energy, 1.0), 0.0, 1.0), 0.0))
+    return out, corr[~bounded].sum(0)
+
+
+class LatencyEstimator:
+    """Streaming per-cycle latency; carries the open cycle across chunks"""
+
+    def __init__(self, max_lag=MAX_LAG, batch_cycles=BATCH_CYCLES):
+        self.max_lag = max_lag
+        self.batch_cycles = batch_cycles
+        # Set from the first cycles processed: the logged step (about 12 ms)
+        # is longer than CONTROL_PERIOD_MS, so the nominal period would widen
+        # the search window and mis-scale every lag
+        self.sample_period = None
+        self.max_lag_samples = None
+        self.corr_sum = None
+        self.rows = 0
+        self._carry = np.empty(0, dtype=CYCLE_LOG_DTYPE)
+
+    def add_chunk(self, records):
+        """Returns latency rows for cycles completed by this chunk"""
+        buf = np.concatenate([self._carry, records]) if len(self._carry) else records
+        if len(buf) == 0:
+            return np.empty(0, dtype=LATENCY_DTYPE)
+        cycles = buf['Cycle']
+        change = np.flatnonzero(cycles[1:] != cycles[:-1]) + 1
+        split = change[-1] if len(change) else 0
+        self._carry = buf[split:].copy()
+        return self._process(buf[:split])
+
+    def finish(self):
+        table = self._process(self._carry)
+        self._carry = np.empty(0, dtype=CYCLE_LOG_DTYPE)
+        return table
+
+    def _process(self, records):
+        if len(records) == 0:
+            return np.empty(0, dtype=LATENCY_DTYPE)
+        if self.sample_period is None:
+            self._set_sample_period(records['Timestamp'])
+        cycles = records['Cycle']
+        starts = np.flatnonzero(np.r_[True, cycles[1:] != cycles[:-1]])
+        bounds = np.r_[starts[::self.batch_cycles], len(records)]
+        tables = []
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            table, corr = cycle_latencies(records[lo:hi], self.max_lag_samples, self.sample_period)
+            tables.append(table)
+            self.corr_sum += corr
+        self.rows += len(records)
+        return np.concatenate(tables)
+
+    def _set_sample_period(self, t):
+        """Median Timestamp step, falling back to the nominal control period"""
+        steps = np.diff(t)
+        steps = steps[steps > 0]
+        self.sample_period = float(np.median(steps)) if len(steps) else CONTROL_PERIOD_MS / 1000.0
+        self.max_lag_samples = max(1, int(round(self.max_lag / self.sample_period)))
+        self.corr_sum = np.zeros(2 * self.max_lag_samples + 1)
+
+    def run_delay(self):
+        """Run-level (lag in samples, delay in s) from the summed correlation"""
+        if self.corr_sum is None or not self.corr_sum.any():
+            return np.nan, np.nan
+        corr = self.corr_sum[None, :]
+        peak = np.argmax(corr, axis=1)
+        if peak[0] in (0, 2 * self.max_lag_samples):
+            return np.nan, np.nan
+        lag = float(peak[0] - self.max_lag_samples + _parabolic_peak(corr, peak)[0])
+        return lag, lag * self.sample_period
+
+
+def estimate_latency(log_path=DEFAULT_LOG_PATH, max_lag=MAX_LAG, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Per-cycle latency table and estimator (for run_delay) of one log"""
+    estimator = LatencyEstimator(max_lag)
+    tables = [estimator.add_chunk(records) for records in iter_cycle_log(log_path, chunk_rows)]
+    tables.append(estimator.finish())
+    return np.concatenate(tables), estimator
+
+
+if __name__ == "__main__":
+    log_paths = sys.argv[1:] or [DEFAULT_LOG_PATH]
+
+    print("="*60)
+    print("COMMAND-TO-RESPONSE LATENCY")
+    print("="*60)
+    for path in log_paths:
+        table, estimator = estimate_latency(path)
+        lag, delay = estimator.run_delay()
+        print(f"\nLog: {path}")
+        measured = table[~np.isnan(table['delay'])]
+        print(f"Cycles: {len(table)} ({len(table) - len(measured)} with no peak "
+              f"inside ±{MAX_LAG*1000:.0f} ms)")
+        if estimator.sample_period is not None:
+            print(f"Sample Period: {estimator.sample_period*1000:.2f} ms (median step)")
+        print(f"Run Delay: {delay*1000:.1f} ms ({lag:.2f} samples)")
+        if len(measured):
+            print(f"Per-Cycle Delay: median {np.median(measured['delay'])*1000:.1f} ms, "
+                  f"range {measured['delay'].min()*1000:.1f} to {measured['delay'].max()*1000:.1f} ms")
+            print(f"Tracking Error RMS: {np.mean(measured['rms_error']):.3f}° "
+                  f"→ {np.mean(measured['rms_residual']):.3f}° after removing the delay")
+            print(f"Error Explained by Lag: {np.median(measured['lag_fraction'])*100:.0f}% (median)")
+    print("="*60)
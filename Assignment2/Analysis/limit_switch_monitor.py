@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Limit Switch Consistency Monitor
+Streaming detector for Limit_0 / Limit_90 flags that disagree with position
+
+Invariants checked on every row (one vectorized mask per rule):
+- LIMIT_0_FAR:      Limit_0 set while Current_Position is well above 0°
+- LIMIT_90_FAR:     Limit_90 set while Current_Position is well below 90°
+- LIMIT_0_MISSING:  Position inside the 0° switch window but Limit_0 clear
+- LIMIT_90_MISSING: Position inside the 90° switch window but Limit_90 clear
+- BOTH_LIMITS:      Both flags set at once
+
+The switch window is POSITION_TOLERANCE, as in readLimitSwitch0/90(). FAR_MARGIN
+and MISSING_MARGIN keep rounding at the window edge from raising events; with
+both margins at 0 the rules flag exactly the rows whose flags differ from the
+window. cycle_summary.limit_mismatch_mask counts rows with these same rules.
+Consecutive violating rows of one rule are coalesced into a single timestamped
+event; events still open at a chunk boundary continue into the next chunk.
+"""
+
+import sys
+import numpy as np
+
+from cycle_log import (DEFAULT_LOG_PATH, DEFAULT_CHUNK_ROWS, MIN_ANGLE, MAX_ANGLE,
+                       POSITION_TOLERANCE, iter_cycle_log)
+
+FAR_MARGIN = 1.0       # degrees beyond the switch window before a set flag is "far"
+MISSING_MARGIN = 0.1   # degrees inside the switch window before a clear flag is "missing"
+
+LIMIT_0_FAR = 0
+LIMIT_90_FAR = 1
+LIMIT_0_MISSING = 2
+LIMIT_90_MISSING = 3
+BOTH_LIMITS = 4
+EVENT_NAMES = ['LIMIT_0_FAR', 'LIMIT_90_FAR', 'LIMIT_0_MISSING', 'LIMIT_90_MISSING', 'BOTH_LIMITS']
+
+EVENT_DTYPE = np.dtype([
+    ('type', 'u1'),
+    ('row_start', '<i8'),   # row index in the log (0-based, header excluded)
+    ('row_end', '<i8'),     # last violating row, inclusive
+    ('t_start', '<f8'),
+    ('t_end', '<f8'),
+    ('cycle', '<i4'),       # cycle at the first violating row
+    ('position', '<f8'),    # Current_Position at the first violating row
+])
+
+
+def violation_masks(records, far_margin=FAR_MARGIN, missing_margin=MISSING_MARGIN):
+    """Boolean mask per rule, shape (len(EVENT_NAMES), rows)"""
+    pos = records['Current_Position']
+    lim0 = records['Limit_0'].astype(bool)
+    lim90 = records['Limit_90'].astype(bool)
+    window_0 = MIN_ANGLE + POSITION_TOLERANCE
+    window_90 = MAX_ANGLE - POSITION_TOLERANCE
+    return np.stack([
+        lim0 & (pos > window_0 + far_margin),
+        lim90 & (pos < window_90 - far_margin),
+        ~lim0 & (pos <= window_0 - missing_margin),
+        ~lim90 & (pos >= window_90 + missing_margin),
+        lim0 & lim90,
+    ])
+
+
+class LimitSwitchMonitor:
+    """Inline limit-switch checker; add_chunk() returns the events it closed"""
+
+    def __init__(self, far_margin=FAR_MARGIN, missing_margin=MISSING_MARGIN, min_rows=1):
+        self.far_margin = far_margin
+        self.missing_margin = missing_margin
+        self.min_rows = min_rows
+        self.rows_seen = 0
+        self.counts = np.zeros(len(EVENT_NAMES), dtype=np.int64)
+        self._open = [None] * len(EVENT_NAMES)
+
+    def _emit(self, events, event):
+        if event['row_end'] - event['row_start'] + 1 >= self.min_rows:
+            self.counts[event['type']] += 1
+            events.append(event)
+
+    def add_chunk(self, records):
+        """Check one chunk; returns a list of completed events (EVENT_DTYPE records)"""
+        events = []
+        n = len(records)
+        if n == 0:
+            return events
+        base = self.rows_seen
+        masks = violation_masks(records, self.far_margin, self.missing_margin)
+        t = records['Timestamp']
+
+        for kind, mask in enumerate(masks):
+            padded = np.r_[False, mask, False].astype(np.int8)
+            edges = np.diff(padded)
+            starts = np.flatnonzero(edges == 1)
+            ends = np.flatnonzero(edges == -1) - 1
+            open_event = self._open[kind]
+
+            # An event open from the previous chunk either continues at row 0 or closes
+            if open_event is not None:
+                if len(starts) and starts[0] == 0:
+                    open_event['row_end'] = base + ends[0]
+                    open_event['t_end'] = t[ends[0]]
+                    starts, ends = starts[1:], ends[1:]
+                    if open_event['row_end'] < base + n - 1:
+                        self._emit(events, open_event)
+                        open_event = None
+                else:
+                    self._emit(events, open_event)
+                    open_event = None
+
+            for s, e in zip(starts, ends):
+                event = np.zeros((), dtype=EVENT_DTYPE)
+                event['type'] = kind
+                event['row_start'] = base + s
+                event['row_end'] = base + e
+                event['t_start'] = t[s]
+                event['t_end'] = t[e]
+                event['cycle'] = records['Cycle'][s]
+                event['position'] = records['Current_Position'][s]
+                if e == n - 1:
+                    open_event = event
+                else:
+                    self._emit(events, event)
+            self._open[kind] = open_event
+
+        self.rows_seen += n
+        events.sort(key=lambda ev: (float(ev['t_start']), int(ev['type'])))
+        return events
+
+    def finish(self):
+        """Close events still open at the end of the stream"""
+        events = []
+        for kind, event in enumerate(self._open):
+            if event is not None:
+                self._emit(events, event)
+            self._open[kind] = None
+        return events
+
+
+def scan_cycle_log(log_path=DEFAULT_LOG_PATH, chunk_rows=DEFAULT_CHUNK_ROWS, **kwargs):
+    """All limit-switch events of a log as one EVENT_DTYPE array"""
+    monitor = LimitSwitchMonitor(**kwargs)
+    events = []
+    for records in iter_cycle_log(log_path, chunk_rows):
+        events.extend(monitor.add_chunk(records))
+    events.extend(monitor.finish())
+    return np.array(events, dtype=EVENT_DTYPE), monitor
+
+
+def format_event(event):
+    return (f"t={event['t_start']:.3f}-{event['t_end']:.3f}s cycle {event['cycle']} "
+            f"rows {event['row_start']}-{event['row_end']}: {EVENT_NAMES[event['type']]} "
+            f"at {event['position']:.3f}°")
+
+
+if __name__ == "__main__":
+    log_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG_PATH
+
+    events, monitor = scan_cycle_log(log_path)
+
+    print("="*60)
+    print("LIMIT SWITCH CONSISTENCY")
+    print("="*60)
+    print(f"Log: {log_path}")
+    print(f"Rows Checked: {monitor.rows_seen}")
+    for name, count in zip(EVENT_NAMES, monitor.counts):
+        print(f"  {name}: {count}")
+    if len(events):
+        print("\nEvents:")
+        for event in events:
+            print(f"  {format_event(event)}")
+    else:
+        print("\n✅ Limit switches consistent with position")
+    print("="*60)
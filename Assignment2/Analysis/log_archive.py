@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Compressed Cycle Log Archive
+Delta-encoded, chunk-compressed storage for completed cycle-log campaigns
+
+Archive layout (<log>.cla):
+- 8-byte magic, then independently compressed chunks of ARCHIVE_CHUNK_ROWS rows
+- Each chunk stores every column quantized to the log's 3-decimal precision,
+  delta-encoded and packed into the narrowest integer type that fits
+- A JSON chunk index (offsets, row counts, time span, column dtypes) at the end,
+  followed by its offset and the magic again
+
+Any time range is restored by reading the index and decompressing only the
+chunks that overlap it. Compression uses stdlib zlib or lzma.
+"""
+
+import os
+import sys
+import json
+import lzma
+import zlib
+import struct
+import numpy as np
+
+from cycle_log import (DEFAULT_LOG_PATH, DEFAULT_CHUNK_ROWS, CYCLE_LOG_DTYPE,
+                       iter_cycle_log, write_cycle_log)
+
+ARCHIVE_MAGIC = b'CLOGARC1'
+ARCHIVE_SUFFIX = '.cla'
+ARCHIVE_CHUNK_ROWS = 65536
+
+# Quantization scale per column (the C++ logger writes 3 decimals)
+COLUMN_SCALES = {
+    'Cycle': 1,
+    'Timestamp': 1000,
+    'Current_Position': 1000,
+    'Target_Position': 1000,
+    'Velocity': 1000,
+    'Load_Torque': 1000,
+    'Limit_0': 1,
+    'Limit_90': 1,
+    'Status': 1,
+}
+
+CODECS = {
+    'zlib': (lambda data: zlib.compress(data, 9), zlib.decompress),
+    'lzma': (lambda data: lzma.compress(data, preset=6), lzma.decompress),
+}
+
+_INT_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def _narrowest_int(values):
+    """Smallest signed integer dtype that holds every value"""
+    if len(values) == 0:
+        return np.dtype(np.int8)
+    lo, hi = values.min(), values.max()
+    for t in _INT_TYPES:
+        info = np.iinfo(t)
+        if info.min <= lo and hi <= info.max:
+            return np.dtype(t)
+    return np.dtype(np.int64)
+
+
+def encode_chunk(records):
+    """Quantize and delta-encode each column; return (payload, column dtypes)"""
+    parts = []
+    dtypes = {}
+    for name in CYCLE_LOG_DTYPE.names:
+        q = np.rint(records[name].astype(np.float64) * COLUMN_SCALES[name]).astype(np.int64)
+        deltas = np.diff(q, prepend=np.int64(0))
+        dt = _narrowest_int(deltas)
+        dtypes[name] = dt.str
+        parts.append(deltas.astype(dt).tobytes())
+    return b''.join(parts), dtypes
+
+
+def decode_chunk(payload, rows, dtypes):
+    """Inverse of encode_chunk"""
+    records = np.empty(rows, dtype=CYCLE_LOG_DTYPE)
+    offset = 0
+    for name in CYCLE_LOG_DTYPE.names:
+        dt = np.dtype(dtypes[name])
+        deltas = np.frombuffer(payload, dtype=dt, count=rows, offset=offset)
+        offset += rows * dt.itemsize
+        q = np.cumsum(deltas, dtype=np.int64)
+        scale = COLUMN_SCALES[name]
+        records[name] = q / scale if scale != 1 else q
+    return records
+
+
+def _rechunk(chunks, rows):
+    """Regroup a stream of record chunks into chunks of exactly `rows` rows"""
+    buffer = np.empty(0, dtype=CYCLE_LOG_DTYPE)
+    for chunk in chunks:
+        buffer = np.concatenate([buffer, chunk])
+        while len(buffer) >= rows:
+            yield buffer[:rows]
+            buffer = buffer[rows:]
+    if len(buffer):
+        yield buffer
+
+
+def archive_cycle_log(log_path=DEFAULT_LOG_PATH, archive_path=None, codec='lzma',
+                      chunk_rows=ARCHIVE_CHUNK_ROWS):
+    """Archive a cycle log; returns the chunk index"""
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec {codec}; expected one of {sorted(CODECS)}")
+    archive_path = archive_path or log_path + ARCHIVE_SUFFIX
+    compress = CODECS[codec][0]
+
+    index = {'codec': codec, 'chunk_rows': chunk_rows, 'chunks': []}
+    with open(archive_path, 'wb') as f:
+        f.write(ARCHIVE_MAGIC)
+        for records in _rechunk(iter_cycle_log(log_path, DEFAULT_CHUNK_ROWS), chunk_rows):
+            payload, dtypes = encode_chunk(records)
+            blob = compress(payload)
+            index['chunks'].append({
+                'offset': f.tell(),
+                'length': len(blob),
+                'rows': len(records),
+                't_first': float(records['Timestamp'][0]),
+                't_last': float(records['Timestamp'][-1]),
+                'dtypes': dtypes,
+            })
+            f.write(blob)
+        index_offset = f.tell()
+        f.write(json.dumps(index).encode('utf-8'))
+        f.write(struct.pack('<Q', index_offset))
+        f.write(ARCHIVE_MAGIC)
+    return index
+
+
+class CycleLogArchive:
+    """Random-access reader for a .cla archive"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+                raise ValueError(f"{path} is not a cycle log archive")
+            f.seek(-(8 + len(ARCHIVE_MAGIC)), os.SEEK_END)
+            index_offset = struct.unpack('<Q', f.read(8))[0]
+            if f.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+                raise ValueError(f"{path} is truncated (missing index)")
+            end = f.tell() - 8 - len(ARCHIVE_MAGIC)
+            f.seek(index_offset)
+            self.index = json.loads(f.read(end - index_offset).decode('utf-8'))
+        self.chunks = self.index['chunks']
+        self.decompress = CODECS[self.index['codec']][1]
+        self.t_first = np.array([c['t_first'] for c in self.chunks])
+        self.t_last = np.array([c['t_last'] for c in self.chunks])
+
+    @property
+    def rows(self):
+        return sum(c['rows'] for c in self.chunks)
+
+    def read_chunk(self, i):
+        """Decompress a single chunk"""
+        entry = self.chunks[i]
+        with open(self.path, 'rb') as f:
+            f.seek(entry['offset'])
+            blob = f.read(entry['length'])
+        return decode_chunk(self.decompress(blob), entry['rows'], entry['dtypes'])
+
+    def iter_chunks(self):
+        for i in range(len(self.chunks)):
+            yield self.read_chunk(i)
+
+    def read_range(self, t_start, t_end):
+        """Rows with t_start <= Timestamp <= t_end, touching only overlapping chunks"""
+        first = np.searchsorted(self.t_last, t_start)
+        last = np.searchsorted(self.t_first, t_end, side='right')
+        parts = []
+        for i in range(first, last):
+            records = self.read_chunk(i)
+            t = records['Timestamp']
+            parts.append(records[(t >= t_start) & (t <= t_end)])
+        if not parts:
+            return np.empty(0, dtype=CYCLE_LOG_DTYPE)
+        return np.concatenate(parts)
+
+    def restore(self, csv_path):
+        """Write the archived log back out as CSV"""
+        for i, records in enumerate(self.iter_chunks()):
+            write_cycle_log(records, csv_path, header=(i == 0), mode='w' if i == 0 else 'a')
+
+
+if __name__ == "__main__":
+    log_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG_PATH
+    codec = sys.argv[2] if len(sys.argv) > 2 else 'lzma'
+
+    print("="*60)
+    print("CYCLE LOG ARCHIVE")
+    print("="*60)
+
+    archive_path = log_path + ARCHIVE_SUFFIX
+    index = archive_cycle_log(log_path, archive_path, codec)
+    raw_size = os.path.getsize(log_path)
+    archive_size = os.path.getsize(archive_path)
+
+    print(f"Log: {log_path} ({raw_size} bytes)")
+    print(f"Archive: {archive_path} ({archive_size} bytes, {codec})")
+    print(f"Chunks: {len(index['chunks'])} of up to {index['chunk_rows']} rows")
+    print(f"Compression Ratio: {raw_size / archive_size:.1f}:1")
+    print("="*60)
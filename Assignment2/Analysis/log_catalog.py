@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Campaign Catalog
+SQLite catalog of per-run and per-cycle summaries of cycle logs
+
+Each log is ingested once, keyed by the SHA-256 of its contents, so renamed
+or copied runs are recognised and skipped. Tables:
+- runs:   one row per log (cycle count, peak torque, jitter, anomaly counts)
+- cycles: one row per cycle (see cycle_summary.CYCLE_TABLE_DTYPE)
+
+Cross-campaign questions are then answered from indexed SQL queries without
+touching the raw logs.
+"""
+
+import os
+import sys
+import glob
+import hashlib
+import sqlite3
+from datetime import datetime
+
+from cycle_log import DEFAULT_CHUNK_ROWS
+from cycle_summary import summarize_cycle_log
+
+DEFAULT_CATALOG_PATH = '../Output/campaign_catalog.sqlite'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    cycles INTEGER NOT NULL,
+    duration_s REAL NOT NULL,
+    peak_torque REAL NOT NULL,
+    rms_torque REAL NOT NULL,
+    peak_error REAL NOT NULL,
+    dt_mean REAL NOT NULL,
+    dt_jitter REAL NOT NULL,
+    dt_max REAL NOT NULL,
+    gaps INTEGER NOT NULL,
+    limit_mismatches INTEGER NOT NULL,
+    unknown_status INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cycles (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    cycle INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    t_start REAL NOT NULL,
+    t_end REAL NOT NULL,
+    peak_torque REAL NOT NULL,
+    rms_torque REAL NOT NULL,
+    peak_error REAL NOT NULL,
+    mean_abs_error REAL NOT NULL,
+    dt_mean REAL NOT NULL,
+    dt_jitter REAL NOT NULL,
+    dt_max REAL NOT NULL,
+    anomalies INTEGER NOT NULL,
+    PRIMARY KEY (run_id, cycle)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_path ON runs(path);
+CREATE INDEX IF NOT EXISTS idx_runs_peak_torque ON runs(peak_torque);
+CREATE INDEX IF NOT EXISTS idx_cycles_peak_torque ON cycles(peak_torque);
+CREATE INDEX IF NOT EXISTS idx_cycles_dt_jitter ON cycles(dt_jitter);
+CREATE INDEX IF NOT EXISTS idx_cycles_anomalies ON cycles(anomalies) WHERE anomalies > 0;
+"""
+
+
+def file_hash(path, block_size=1 << 20):
+    """SHA-256 of a file's contents"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class CampaignCatalog:
+    """Cycle-log catalog backed by a single SQLite file"""
+
+    def __init__(self, db_path=DEFAULT_CATALOG_PATH):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, content_hash):
+        row = self.conn.execute('SELECT run_id FROM runs WHERE content_hash = ?',
+                                (content_hash,)).fetchone()
+        return row['run_id'] if row else None
+
+    def ingest(self, log_path, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Ingest one log; returns (run_id, newly_ingested)"""
+        content_hash = file_hash(log_path)
+        run_id = self.lookup(content_hash)
+        if run_id is not None:
+            return run_id, False
+
+        summary = summarize_cycle_log(log_path, chunk_rows)
+        run = summary.run_summary()
+        table = summary.table()
+
+        with self.conn:
+            cur = self.conn.execute(
+                'INSERT INTO runs (content_hash, path, size_bytes, ingested_at, rows, cycles, '
+                'duration_s, peak_torque, rms_torque, peak_error, dt_mean, dt_jitter, dt_max, '
+                'gaps, limit_mismatches, unknown_status) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (content_hash, os.path.abspath(log_path), os.path.getsize(log_path),
+                 datetime.now().isoformat(), run['rows'], run['cycles'],
+                 run['t_end'] - run['t_start'], run['peak_torque'], run['rms_torque'],
+                 run['peak_error'], run['dt_mean'], run['dt_jitter'], run['dt_max'],
+                 run['gaps'], run['limit_mismatches'], run['unknown_status']))
+            run_id = cur.lastrowid
+            self.conn.executemany(
+                'INSERT INTO cycles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                ((run_id,) + tuple(row.item()) for row in table))
+        return run_id, True
+
+    def ingest_directory(self, directory, pattern='**/*cycle_log*.csv', chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Ingest every log under a directory; returns (new, skipped) counts"""
+        new = skipped = 0
+        for path in sorted(glob.glob(os.path.join(directory, pattern), recursive=True)):
+            _, is_new = self.ingest(path, chunk_rows)
+            if is_new:
+                new += 1
+            else:
+                skipped += 1
+        return new, skipped
+
+    def query(self, sql, params=()):
+        """Run an arbitrary read query against the catalog"""
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def runs(self, min_peak_torque=None):
+        sql = 'SELECT * FROM runs'
+        params = ()
+        if min_peak_torque is not None:
+            sql += ' WHERE peak_torque >= ?'
+            params = (min_peak_torque,)
+        return self.query(sql + ' ORDER BY run_id', params)
+
+    def top_cycles(self, metric='peak_torque', limit=10):
+        """Cycles with the largest value of a per-cycle metric across all runs"""
+        allowed = {'peak_torque', 'rms_torque', 'peak_error', 'mean_abs_error',
+                   'dt_jitter', 'dt_max', 'anomalies'}
+        if metric not in allowed:
+            raise ValueError(f"Unknown metric {metric}; expected one of {sorted(allowed)}")
+        return self.query(
+            f'SELECT runs.path, cycles.* FROM cycles JOIN runs USING (run_id) '
+            f'ORDER BY cycles.{metric} DESC LIMIT ?', (limit,))
+
+    def anomalous_cycles(self):
+        return self.query(
+            'SELECT runs.path, cycles.* FROM cycles JOIN runs USING (run_id) '
+            'WHERE cycles.anomalies > 0 ORDER BY run_id, cycle')
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else '../Output'
+    db_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CATALOG_PATH
+
+    print("="*60)
+    print("CAMPAIGN CATALOG")
+    print("="*60)
+
+    with CampaignCatalog(db_path) as catalog:
+        new, skipped = catalog.ingest_directory(directory)
+        print(f"Catalog: {db_path}")
+        print(f"Ingested: {new} new, {skipped} already catalogued")
+        print()
+        for run in catalog.runs():
+            print(f"Run {run['run_id']}: {os.path.basename(run['path'])} | {run['cycles']} cycles | "
+                  f"peak {run['peak_torque']:.3f} N⋅m | jitter {run['dt_jitter']*1000:.2f} ms")
+        print()
+        print("Highest peak-torque cycles:")
+        for row in catalog.top_cycles('peak_torque', 5):
+            print(f"  Run {row['run_id']} cycle {row['cycle']}: {row['peak_torque']:.3f} N⋅m")
+    print("="*60)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Cycle Log Min/Max Pyramid
+Multi-resolution summary of pendulum_cycle_log.csv for zooming huge logs
+
+Pyramid layout (stored next to the log as <log>.pyramid/):
+- level_00.bin holds one bin per raw row, level_k.bin one bin per 2^k rows
+- Each bin records t0, t1, row count and min/max/mean of every signal column
+- t0_k.bin / t1_k.bin repeat the bin times of level k as contiguous float64
+  arrays: a binary search over a strided field of the memmapped bins would
+  page in and copy the whole column
+- meta.json records the bin dtype and the number of bins per level
+
+Levels are built in one streaming pass over the log and read back with
+np.memmap, so a zoom window costs a binary search over the time arrays plus
+a slice whose length is bounded by the requested number of screen points.
+"""
+
+import os
+import sys
+import json
+import numpy as np
+import matplotlib.pyplot as plt
+
+from cycle_log import DEFAULT_LOG_PATH, DEFAULT_CHUNK_ROWS, SIGNAL_COLUMNS, iter_cycle_log
+
+PYRAMID_SUFFIX = '.pyramid'
+PYRAMID_VERSION = 2
+
+
+def pyramid_dtype(columns):
+    """Bin record layout for a pyramid over the given signal columns"""
+    fields = [('t0', '<f8'), ('t1', '<f8'), ('count', '<u4')]
+    for name in columns:
+        fields += [(f'{name}_min', '<f4'), (f'{name}_max', '<f4'), (f'{name}_mean', '<f4')]
+    return np.dtype(fields)
+
+
+def pyramid_path(log_path):
+    """Directory holding the pyramid for a given log"""
+    return log_path + PYRAMID_SUFFIX
+
+
+class PyramidBuilder:
+    """Streaming builder: feed raw chunks, then finish() to flush partial bins"""
+
+    def __init__(self, out_dir, columns=SIGNAL_COLUMNS):
+        self.out_dir = out_dir
+        self.columns = list(columns)
+        self.dtype = pyramid_dtype(self.columns)
+        self.files = []
+        self.time_files = []
+        self.counts = []
+        self.pending = []
+        os.makedirs(out_dir, exist_ok=True)
+
+    def _level(self, k):
+        while len(self.files) <= k:
+            n = len(self.files)
+            self.files.append(open(os.path.join(self.out_dir, f'level_{n:02d}.bin'), 'wb'))
+            self.time_files.append(tuple(open(os.path.join(self.out_dir, f'{name}_{n:02d}.bin'), 'wb')
+                                         for name in ('t0', 't1')))
+            self.counts.append(0)
+            self.pending.append(np.empty(0, dtype=self.dtype))
+        return self.files[k]
+
+    def _write(self, k, bins):
+        self._level(k).write(bins.tobytes())
+        for f, name in zip(self.time_files[k], ('t0', 't1')):
+            f.write(np.ascontiguousarray(bins[name]).tobytes())
+        self.counts[k] += len(bins)
+
+    def _merge_pairs(self, bins):
+        """Combine consecutive pairs of bins into bins of the next level"""
+        a, b = bins[0::2], bins[1::2]
+        merged = np.empty(len(a), dtype=self.dtype)
+        merged['t0'] = a['t0']
+        merged['t1'] = b['t1']
+        merged['count'] = a['count'] + b['count']
+        wa = a['count'] / merged['count']
+        for name in self.columns:
+            merged[f'{name}_min'] = np.minimum(a[f'{name}_min'], b[f'{name}_min'])
+            merged[f'{name}_max'] = np.maximum(a[f'{name}_max'], b[f'{name}_max'])
+            merged[f'{name}_mean'] = (a[f'{name}_mean'] * wa + b[f'{name}_mean'] * (1.0 - wa))
+        return merged
+
+    def _push(self, k, bins):
+        while len(bins):
+            self._level(k)
+            bins = np.concatenate([self.pending[k], bins])
+            even = len(bins) - (len(bins) % 2)
+            self.pending[k] = bins[even:].copy()
+            self._write(k, bins[:even])
+            bins = self._merge_pairs(bins[:even])
+            k += 1
+
+    def add_chunk(self, records):
+        """Add a chunk of raw cycle-log records"""
+        bins = np.empty(len(records), dtype=self.dtype)
+        bins['t0'] = records['Timestamp']
+        bins['t1'] = records['Timestamp']
+        bins['count'] = 1
+        for name in self.columns:
+            bins[f'{name}_min'] = records[name]
+            bins[f'{name}_max'] = records[name]
+            bins[f'{name}_mean'] = records[name]
+        self._push(0, bins)
+
+    def finish(self):
+        """Flush partial bins up to a single top-level bin and write meta.json"""
+        if not self.files:
+            raise ValueError("Cannot build a pyramid from an empty log")
+        k = 0
+        carry = np.empty(0, dtype=self.dtype)
+        while True:
+            self._level(k)
+            bins = np.concatenate([self.pending[k], carry])
+            self.pending[k] = np.empty(0, dtype=self.dtype)
+            self._write(k, bins)
+            if self.counts[k] == 1:
+                break
+            carry = self._merge_pairs(bins) if len(bins) == 2 else bins
+            k += 1
+        for f in self.files:
+            f.close()
+        for files in self.time_files:
+            for f in files:
+                f.close()
+
+        meta = {
+            'version': PYRAMID_VERSION,
+            'columns': self.columns,
+            'dtype': self.dtype.descr,
+            'level_counts': self.counts,
+        }
+        with open(os.path.join(self.out_dir, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+        return meta
+
+
+def build_pyramid(log_path=DEFAULT_LOG_PATH, out_dir=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Build the pyramid for a cycle log in one streaming pass"""
+    builder = PyramidBuilder(out_dir or pyramid_path(log_path))
+    for records in iter_cycle_log(log_path, chunk_rows):
+        builder.add_chunk(records)
+    return builder.finish()
+
+
+class LogPyramid:
+    """Read-only view of a stored pyramid"""
+
+    def __init__(self, path):
+        if not path.endswith(PYRAMID_SUFFIX):
+            path = pyramid_path(path)
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != PYRAMID_VERSION:
+            raise ValueError(f"Pyramid {path} has version {self.meta.get('version')}, "
+                             f"expected {PYRAMID_VERSION}; rebuild it")
+        self.columns = self.meta['columns']
+        self.dtype = np.dtype([tuple(field) for field in self.meta['dtype']])
+        self.levels = [
+            np.memmap(os.path.join(path, f'level_{k:02d}.bin'), dtype=self.dtype, mode='r', shape=(n,))
+            for k, n in enumerate(self.meta['level_counts'])
+        ]
+        self.t0, self.t1 = [
+            [np.memmap(os.path.join(path, f'{name}_{k:02d}.bin'), dtype='<f8', mode='r', shape=(n,))
+             for k, n in enumerate(self.meta['level_counts'])]
+            for name in ('t0', 't1')
+        ]
+
+    @property
+    def time_range(self):
+        return float(self.t0[-1][0]), float(self.t1[-1][-1])
+
+    def choose_level(self, t_start, t_end, max_points):
+        """Finest level with at most max_points bins inside [t_start, t_end]"""
+        raw = self.t0[0]
+        rows = np.searchsorted(raw, t_end, side='right') - np.searchsorted(raw, t_start)
+        if rows <= max_points:
+            return 0
+        k = int(np.ceil(np.log2(rows / max_points)))
+        return min(k, len(self.levels) - 1)
+
+    def window(self, column, t_start=None, t_end=None, max_points=2000):
+        """Return t0, t1, min, max, mean arrays covering the zoom window"""
+        if column not in self.columns:
+            raise KeyError(f"Column {column} is not in the pyramid")
+        lo, hi = self.time_range
+        t_start = lo if t_start is None else t_start
+        t_end = hi if t_end is None else t_end
+
+        level = self.choose_level(t_start, t_end, max_points)
+        bins = self.levels[level]
+        i0 = np.searchsorted(self.t1[level], t_start)
+        i1 = np.searchsorted(self.t0[level], t_end, side='right')
+        view = bins[i0:i1]
+        return {
+            'level': level,
+            't0': np.array(view['t0']),
+            't1': np.array(view['t1']),
+            'min': np.array(view[f'{column}_min']),
+            'max': np.array(view[f'{column}_max']),
+            'mean': np.array(view[f'{column}_mean']),
+        }
+
+    def plot(self, ax, column, t_start=None, t_end=None, max_points=2000):
+        """Draw the min/max envelope and mean of a column for the zoom window"""
+        win = self.window(column, t_start, t_end, max_points)
+        t = 0.5 * (win['t0'] + win['t1'])
+        ax.fill_between(t, win['min'], win['max'], alpha=0.3, step='mid')
+        ax.plot(t, win['mean'], linewidth=1)
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel(column)
+        ax.set_title(f'{column} (level {win["level"]}, {len(t)} bins)')
+        ax.grid(True, alpha=0.3)
+        return win
+
+
+if __name__ == "__main__":
+    log_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG_PATH
+
+    print("="*60)
+    print("CYCLE LOG PYRAMID")
+    print("="*60)
+
+    meta = build_pyramid(log_path)
+    print(f"Log: {log_path}")
+    print(f"Pyramid: {pyramid_path(log_path)}")
+    print(f"Levels: {len(meta['level_counts'])}")
+    for k, n in enumerate(meta['level_counts']):
+        print(f"  Level {k:2d}: {n} bins of up to {2**k} rows")
+
+    pyramid = LogPyramid(log_path)
+    fig, axes = plt.subplots(2, 1, figsize=(12, 8))
+    pyramid.plot(axes[0], 'Current_Position', max_points=1000)
+    pyramid.plot(axes[1], 'Load_Torque', max_points=1000)
+    plt.tight_layout()
+    plt.show()
+    print("="*60)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Accelerated Cycle Log Replay
+Re-emits a recorded cycle log to analysis consumers at a chosen speed
+
+Replay modes:
+- speed = 1, 10, 1000, ...: row i is released at (Timestamp_i - Timestamp_0) / speed
+  after the start, preserving the original inter-sample timing ratios
+- speed = None: as fast as possible, throttled only by consumer back-pressure
+
+Each consumer runs in its own thread behind a bounded queue and receives
+structured-array batches of the rows due at each release. The report gives
+per-consumer throughput, capacity (rows per second of busy time), peak
+backlog and lag, and the highest real-time multiple of the 100 Hz
+production rate the consumer could sustain.
+"""
+
+import sys
+import time
+import queue
+import threading
+import numpy as np
+
+from cycle_log import DEFAULT_LOG_PATH, DEFAULT_CHUNK_ROWS, CONTROL_PERIOD_MS, iter_cycle_log
+
+PRODUCTION_RATE_HZ = 1000.0 / CONTROL_PERIOD_MS
+MAX_BATCH_ROWS = 4096
+MAX_BACKLOG_ROWS = 1 << 20
+_IDLE_SLEEP = 0.05  # s, upper bound on a single producer sleep
+
+
+class _ConsumerWorker:
+    """Thread wrapping one consumer callable plus its statistics"""
+
+    def __init__(self, name, fn, max_backlog_rows, clock):
+        self.name = name
+        self.fn = fn
+        self.clock = clock
+        self.queue = queue.Queue()
+        self.max_backlog_rows = max_backlog_rows
+        self.cond = threading.Condition()
+        self.rows = 0
+        self.batches = 0
+        self.busy_time = 0.0
+        self.backlog = 0
+        self.max_backlog = 0
+        self.max_lag = 0.0
+        self.blocked_time = 0.0
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name=f'replay-{name}', daemon=True)
+
+    def put(self, batch, due):
+        """Enqueue a batch, blocking while the consumer's backlog is full"""
+        start = time.perf_counter()
+        with self.cond:
+            while self.backlog + len(batch) > self.max_backlog_rows:
+                self.cond.wait()
+            self.backlog += len(batch)
+            self.max_backlog = max(self.max_backlog, self.backlog)
+        self.blocked_time += time.perf_counter() - start
+        self.queue.put((batch, due))
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            batch, due = item
+            start = time.perf_counter()
+            try:
+                if self.error is None:
+                    self.fn(batch)
+            except Exception as e:  # keep draining so the producer never deadlocks
+                self.error = e
+            end = time.perf_counter()
+            self.busy_time += end - start
+            self.rows += len(batch)
+            self.batches += 1
+            self.max_lag = max(self.max_lag, self.clock(end) - due)
+            with self.cond:
+                self.backlog -= len(batch)
+                self.cond.notify()
+
+    def report(self, wall_time):
+        capacity = self.rows / self.busy_time if self.busy_time > 0 else float('inf')
+        return {
+            'consumer': self.name,
+            'rows': self.rows,
+            'batches': self.batches,
+            'throughput_rows_s': self.rows / wall_time if wall_time > 0 else float('inf'),
+            'capacity_rows_s': capacity,
+            'max_realtime_multiple': capacity / PRODUCTION_RATE_HZ,
+            'max_backlog_rows': self.max_backlog,
+            'max_lag_s': self.max_lag,
+            'producer_blocked_s': self.blocked_time,
+            'error': repr(self.error) if self.error else None,
+        }
+
+
+class LogReplay:
+    """Replays a cycle log to registered consumers"""
+
+    def __init__(self, log_path=DEFAULT_LOG_PATH, speed=1.0, max_batch_rows=MAX_BATCH_ROWS,
+                 max_backlog_rows=MAX_BACKLOG_ROWS, chunk_rows=DEFAULT_CHUNK_ROWS):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive, or None for as fast as possible")
+        if max_batch_rows > max_backlog_rows:
+            raise ValueError("max_batch_rows cannot exceed max_backlog_rows")
+        self.log_path = log_path
+        self.speed = speed
+        self.max_batch_rows = max_batch_rows
+        self.max_backlog_rows = max_backlog_rows
+        self.chunk_rows = chunk_rows
+        self.consumers = []
+        self._start = None
+
+    def add_consumer(self, name, fn):
+        """Register fn(records) to receive every replayed batch"""
+        self.consumers.append((name, fn))
+        return self
+
+    def _elapsed(self, now=None):
+        return (time.perf_counter() if now is None else now) - self._start
+
+    def run(self):
+        """Replay the whole log; returns a report dict"""
+        self._start = time.perf_counter()
+        workers = [_ConsumerWorker(name, fn, self.max_backlog_rows, self._elapsed)
+                   for name, fn in self.consumers]
+        for w in workers:
+            w.thread.start()
+
+        rows = 0
+        t0 = None
+        for records in iter_cycle_log(self.log_path, self.chunk_rows):
+            t = records['Timestamp']
+            if t0 is None and len(t):
+                t0 = t[0]
+            due = (t - t0) / self.speed if self.speed else np.zeros(len(t))
+            i = 0
+            while i < len(records):
+                if self.speed:
+                    now = self._elapsed()
+                    j = int(np.searchsorted(due, now, side='right'))
+                    if j <= i:
+                        time.sleep(min(due[i] - now, _IDLE_SLEEP))
+                        continue
+                else:
+                    j = len(records)
+                j = min(j, i + self.max_batch_rows)
+                batch = records[i:j]
+                release = due[j - 1] if self.speed else self._elapsed()
+                for w in workers:
+                    w.put(batch, release)
+                rows += j - i
+                i = j
+        produced = self._elapsed()
+
+        for w in workers:
+            w.queue.put(None)
+        for w in workers:
+            w.thread.join()
+        wall_time = self._elapsed()
+
+        log_span = 0.0 if t0 is None else float(t[-1] - t0)
+        return {
+            'log_path': self.log_path,
+            'speed': self.speed,
+            'rows': rows,
+            'log_span_s': log_span,
+            'produce_time_s': produced,
+            'wall_time_s': wall_time,
+            'achieved_speed': log_span / wall_time if wall_time > 0 else float('inf'),
+            'consumers': [w.report(wall_time) for w in workers],
+        }
+
+
+def print_report(report):
+    speed = 'as fast as possible' if report['speed'] is None else f"{report['speed']:g}x"
+    print(f"Replay: {report['rows']} rows, {report['log_span_s']:.1f} s of log at {speed}")
+    print(f"Wall Time: {report['wall_time_s']:.2f} s (achieved {report['achieved_speed']:.1f}x)")
+    for c in report['consumers']:
+        print(f"  {c['consumer']}:")
+        print(f"    Throughput: {c['throughput_rows_s']:.0f} rows/s, "
+              f"capacity {c['capacity_rows_s']:.0f} rows/s "
+              f"(keeps up to {c['max_realtime_multiple']:.0f}x the {PRODUCTION_RATE_HZ:.0f} Hz rate)")
+        print(f"    Max Backlog: {c['max_backlog_rows']} rows, max lag {c['max_lag_s']*1000:.1f} ms")
+        if c['error']:
+            print(f"    ❌ Consumer raised {c['error']}")
+
+
+if __name__ == "__main__":
+    from cycle_summary import CycleSummary
+    from mechanical_power import PowerIntegrator
+    from welch_psd import CycleLogSpectra
+
+    log_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG_PATH
+    speed = None if len(sys.argv) < 3 or sys.argv[2] == 'max' else float(sys.argv[2])
+
+    print("="*60)
+    print("CYCLE LOG REPLAY")
+    print("="*60)
+    replay = LogReplay(log_path, speed)
+    replay.add_consumer('cycle_summary', CycleSummary().add_chunk)
+    replay.add_consumer('mechanical_power', PowerIntegrator().add_chunk)
+    replay.add_consumer('welch_psd', CycleLogSpectra(nperseg=64).add_chunk)
+    print_report(replay.run())
+    print("="*60)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Mechanical Power and Energy per Cycle
+Streaming power/energy integration of a cycle log for PSU and brake sizing
+
+Method:
+- Pendulum speed ω from the backward difference of Current_Position over the
+  (irregular) Timestamp steps
+- Load power P = Load_Torque × ω; P > 0 lifts the pendulum (motoring),
+  P < 0 returns energy to the drive (regeneration, mainly on the down-swing)
+- Motor side: torque ÷ (gearbox × rope ratio), speed × (gearbox × rope ratio),
+  power scaled by the drivetrain efficiency in the direction of flow
+- Energy by trapezoidal integration of power over each sample interval,
+  assigned to the cycle of the later sample
+
+State (last timestamp, position and power) carries across chunks, so logs of
+any length are processed in fixed memory.
+"""
+
+import sys
+import numpy as np
+
+from cycle_log import (DEFAULT_LOG_PATH, DEFAULT_CHUNK_ROWS, GEARBOX_RATIO, ROPE_RATIO,
+                       STATUS_CODES, iter_cycle_log)
+from cycle_summary import CycleAccumulator
+
+# Drivetrain efficiency (gearbox + rope stages); 1.0 = lossless
+DRIVETRAIN_EFFICIENCY = 0.85
+
+_FIELDS = {
+    'rows': ('sum', np.int64),
+    't_start': ('min', np.float64),
+    't_end': ('max', np.float64),
+    'energy_motoring': ('sum', np.float64),
+    'energy_regen': ('sum', np.float64),
+    'energy_regen_down': ('sum', np.float64),
+    'peak_power': ('max', np.float64),
+    'peak_regen_power': ('max', np.float64),
+    'power_sq_sum': ('sum', np.float64),
+    'peak_motor_torque': ('max', np.float64),
+    'peak_motor_speed': ('max', np.float64),
+}
+
+POWER_TABLE_DTYPE = np.dtype([
+    ('cycle', '<i4'),
+    ('duration', '<f8'),
+    ('energy_motoring', '<f8'),     # J drawn by the motor
+    ('energy_regen', '<f8'),        # J returned by the motor (all regeneration)
+    ('energy_regen_down', '<f8'),   # J returned during Moving_Down
+    ('energy_net', '<f8'),          # J
+    ('mean_power', '<f8'),          # W, net
+    ('rms_power', '<f8'),           # W, motor side
+    ('peak_power', '<f8'),          # W, motor side (motoring)
+    ('peak_regen_power', '<f8'),    # W, motor side (regeneration)
+    ('peak_motor_torque', '<f8'),   # N⋅m before gearbox
+    ('peak_motor_speed', '<f8'),    # rpm
+])
+
+
+def load_power(torque, omega):
+    """Mechanical power at the pendulum shaft (W)"""
+    return torque * omega
+
+
+def motor_power(p_load, efficiency=DRIVETRAIN_EFFICIENCY):
+    """Reflect load power to the motor shaft through the drivetrain losses"""
+    return np.where(p_load >= 0, p_load / efficiency, p_load * efficiency)
+
+
+class PowerIntegrator(CycleAccumulator):
+    """Per-cycle power and energy, updated one chunk at a time"""
+
+    def __init__(self, efficiency=DRIVETRAIN_EFFICIENCY,
+                 gearbox_ratio=GEARBOX_RATIO, rope_ratio=ROPE_RATIO):
+        super().__init__(_FIELDS)
+        self.efficiency = efficiency
+        self.reduction = gearbox_ratio * rope_ratio
+        self._last = None  # (timestamp, position_rad, motor power)
+
+    def add_chunk(self, records):
+        """Integrate one chunk of consecutive log records"""
+        if len(records) == 0:
+            return
+        t = records['Timestamp']
+        theta = np.radians(records['Current_Position'])
+
+        if self._last is None:
+            t_prev = np.r_[t[0], t[:-1]]
+            theta_prev = np.r_[theta[0], theta[:-1]]
+        else:
+            t_prev = np.r_[self._last[0], t[:-1]]
+            theta_prev = np.r_[self._last[1], theta[:-1]]
+        dt = t - t_prev
+        safe_dt = np.where(dt > 0, dt, 1.0)
+        omega = np.where(dt > 0, (theta - theta_prev) / safe_dt, 0.0)  # rad/s at the pendulum
+
+        p_motor = motor_power(load_power(records['Load_Torque'], omega), self.efficiency)
+        p_prev = np.r_[p_motor[0] if self._last is None else self._last[2], p_motor[:-1]]
+        self._last = (t[-1], theta[-1], p_motor[-1])
+
+        # Trapezoid over each interval, split into motoring and regenerative parts
+        energy = 0.5 * (p_prev + p_motor) * dt
+        motoring = np.maximum(energy, 0.0)
+        regen = np.maximum(-energy, 0.0)
+        down = records['Status'] == STATUS_CODES['Moving_Down']
+
+        values = {
+            'rows': np.ones(len(t), dtype=np.int64),
+            't_start': t,
+            't_end': t,
+            'energy_motoring': motoring,
+            'energy_regen': regen,
+            'energy_regen_down': np.where(down, regen, 0.0),
+            'peak_power': p_motor,
+            'peak_regen_power': -p_motor,
+            'power_sq_sum': p_motor * p_motor,
+            'peak_motor_torque': np.abs(records['Load_Torque']) / self.reduction,
+            'peak_motor_speed': np.abs(omega) * self.reduction * 60.0 / (2.0 * np.pi),
+        }
+        self.add(records['Cycle'], values)
+
+    def table(self):
+        """Per-cycle power and energy rows"""
+        d = self.data
+        present = np.flatnonzero(d['rows'] > 0)
+        duration = d['t_end'][present] - d['t_start'][present]
+        net = d['energy_motoring'][present] - d['energy_regen'][present]
+
+        out = np.empty(len(present), dtype=POWER_TABLE_DTYPE)
+        out['cycle'] = present
+        out['duration'] = duration
+        out['energy_motoring'] = d['energy_motoring'][present]
+        out['energy_regen'] = d['energy_regen'][present]
+        out['energy_regen_down'] = d['energy_regen_down'][present]
+        out['energy_net'] = net
+        out['mean_power'] = np.divide(net, duration, out=np.zeros_like(net), where=duration > 0)
+        out['rms_power'] = np.sqrt(d['power_sq_sum'][present] / d['rows'][present])
+        out['peak_power'] = np.maximum(d['peak_power'][present], 0.0)
+        out['peak_regen_power'] = np.maximum(d['peak_regen_power'][present], 0.0)
+        out['peak_motor_torque'] = d['peak_motor_torque'][present]
+        out['peak_motor_speed'] = d['peak_motor_speed'][present]
+        return out
+
+    def sizing_summary(self):
+        """Run-level figures for PSU and brake-resistor sizing
+
+        An empty log gives zero cycles and energy, and NaN for the peaks.
+        """
+        table = self.table()
+
+        def peak(name):
+            return float(table[name].max()) if len(table) else np.nan
+
+        return {
+            'cycles': len(table),
+            'energy_motoring_total': float(table['energy_motoring'].sum()),
+            'energy_regen_total': float(table['energy_regen'].sum()),
+            'peak_power': peak('peak_power'),
+            'peak_regen_power': peak('peak_regen_power'),
+            'max_regen_per_cycle': peak('energy_regen'),
+            'max_regen_per_down_swing': peak('energy_regen_down'),
+            'peak_motor_torque': peak('peak_motor_torque'),
+            'peak_motor_speed': peak('peak_motor_speed'),
+        }
+
+
+def integrate_cycle_log(log_path=DEFAULT_LOG_PATH, chunk_rows=DEFAULT_CHUNK_ROWS,
+                        efficiency=DRIVETRAIN_EFFICIENCY):
+    """Power/energy integration over a whole log in one streaming pass"""
+    integrator = PowerIntegrator(efficiency)
+    for records in iter_cycle_log(log_path, chunk_rows):
+        integrator.add_chunk(records)
+    return integrator
+
+
+if __name__ == "__main__":
+    log_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG_PATH
+
+    integrator = integrate_cycle_log(log_path)
+    sizing = integrator.sizing_summary()
+
+    print("="*60)
+    print("MECHANICAL POWER AND ENERGY")
+    print("="*60)
+    print(f"Log: {log_path}")
+    print(f"Drivetrain: {integrator.reduction:.1f}:1 total reduction, "
+          f"{integrator.efficiency*100:.0f}% efficiency")
+    print()
+    print(f"{'Cycle':>6} {'E_mot (J)':>10} {'E_regen (J)':>12} {'E_down (J)':>11} "
+          f"{'P_pk (W)':>9} {'P_regen (W)':>12}")
+    for row in integrator.table():
+        print(f"{row['cycle']:6d} {row['energy_motoring']:10.3f} {row['energy_regen']:12.3f} "
+              f"{row['energy_regen_down']:11.3f} {row['peak_power']:9.3f} {row['peak_regen_power']:12.3f}")
+    print()
+    print("SIZING:")
+    print(f"  Peak Motoring Power: {sizing['peak_power']:.2f} W")
+    print(f"  Peak Regenerative Power: {sizing['peak_regen_power']:.2f} W")
+    print(f"  Max Regenerated Energy per Down-Swing: {sizing['max_regen_per_down_swing']:.3f} J")
+    print(f"  Peak Motor Torque: {sizing['peak_motor_torque']:.4f} N⋅m")
+    print(f"  Peak Motor Speed: {sizing['peak_motor_speed']:.1f} rpm")
+    print("="*60)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Parallel Cycle Log Ingestion
+Converts a CSV cycle log to a typed .npy array with a process pool
+
+Steps:
+1. Split the file after the header into byte ranges of about RANGE_BYTES,
+   each moved forward to the start of the next line so no row is cut
+2. Workers parse their ranges independently (pandas C parser) into
+   CYCLE_LOG_DTYPE and write them to temporary part files
+3. The parts are copied in order into one .npy (np.load(..., mmap_mode='r')
+   maps it without reading) and removed
+
+In ingest_cycle_log only row counts cross process boundaries, so parsing
+scales with the number of cores while each worker holds one parsed range and
+the parent copies the parts in COPY_ROWS blocks. read_cycle_log_parallel is
+different: every worker returns its whole parsed range to the parent, which
+concatenates them, so it needs memory for the full array (twice, briefly).
+Ranges are smaller than the file divided by the worker count so a slow worker
+does not hold up the rest.
+"""
+
+import os
+import sys
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from cycle_log import DEFAULT_LOG_PATH, CYCLE_LOG_DTYPE, parse_cycle_log_bytes
+
+RANGE_BYTES = 1 << 26   # 64 MiB of CSV per task
+COPY_ROWS = 1 << 20     # rows copied per step when assembling the output
+
+
+def split_byte_ranges(path, range_bytes=RANGE_BYTES, min_ranges=1):
+    """(start, end) byte ranges of whole data lines, covering the file after the header"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        first = len(f.readline())
+        count = max(min_ranges, -(-(size - first) // range_bytes), 1)
+        bounds = [first]
+        for k in range(1, count):
+            target = first + (size - first) * k // count
+            if target <= bounds[-1]:
+                continue
+            f.seek(target - 1)
+            f.readline()   # finish the line containing target - 1
+            pos = f.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+        bounds.append(size)
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def parse_range(path, start, end):
+    """Records of the lines in one byte range"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return parse_cycle_log_bytes(f.read(end - start))
+
+
+def _parse_to_part(path, start, end, part_path):
+    records = parse_range(path, start, end)
+    records.tofile(part_path)
+    return len(records)
+
+
+def ingest_cycle_log(log_path, out_path=None, workers=None, range_bytes=RANGE_BYTES):
+    """Convert a CSV log to a CYCLE_LOG_DTYPE .npy file; returns (out_path, rows)"""
+    out_path = out_path or os.path.splitext(log_path)[0] + '.npy'
+    workers = workers or os.cpu_count()
+    ranges = split_byte_ranges(log_path, range_bytes, workers)
+    parts = [f'{out_path}.part{k:04d}' for k in range(len(ranges))]
+
+    try:
+        if workers == 1:
+            counts = [_parse_to_part(log_path, a, b, p) for (a, b), p in zip(ranges, parts)]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                counts = list(pool.map(_parse_to_part, [log_path] * len(ranges),
+                                       [a for a, _ in ranges], [b for _, b in ranges], parts))
+
+        total = sum(counts)
+        out = np.lib.format.open_memmap(out_path, mode='w+', dtype=CYCLE_LOG_DTYPE, shape=(total,))
+        row = 0
+        for part, n in zip(parts, counts):
+            src = np.memmap(part, dtype=CYCLE_LOG_DTYPE, mode='r', shape=(n,)) if n else []
+            for i in range(0, n, COPY_ROWS):
+                block = src[i:i + COPY_ROWS]
+                out[row:row + len(block)] = block
+                row += len(block)
+            del src
+        out.flush()
+        del out
+    finally:
+        for part in parts:
+            if os.path.exists(part):
+                os.remove(part)
+    return out_path, total
+
+
+def read_cycle_log_parallel(log_path, workers=None, range_bytes=RANGE_BYTES):
+    """Whole log as one in-memory structured array, parsed in parallel"""
+    workers = workers or os.cpu_count()
+    ranges = split_byte_ranges(log_path, range_bytes, workers)
+    if workers == 1:
+        chunks = [parse_range(log_path, a, b) for a, b in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(parse_range, [log_path] * len(ranges),
+                                   [a for a, _ in ranges], [b for _, b in ranges]))
+    if not chunks:
+        return np.empty(0, dtype=CYCLE_LOG_DTYPE)
+    return np.concatenate(chunks)
+
+
+if __name__ == "__main__":
+    log_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG_PATH
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    start = time.perf_counter()
+    out_path, rows = ingest_cycle_log(log_path, workers=workers)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(log_path)
+
+    print("="*60)
+    print("PARALLEL CYCLE LOG INGESTION")
+    print("="*60)
+    print(f"Log: {log_path} ({size / 1e6:.1f} MB)")
+    print(f"Output: {out_path} ({os.path.getsize(out_path) / 1e6:.1f} MB)")
+    print(f"Rows: {rows} with {workers} workers in {elapsed:.2f} s "
+          f"({size / 1e6 / elapsed:.1f} MB/s)")
+    print("="*60)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Motion Parameter Sweep
+Simulates the cycling test over grids of motion parameters with a process pool
+
+Every combination of MAX_VELOCITY, ACCELERATION, motion_time and pendulum
+mass is one run of the virtual-clock controller (see pendulum_simulator.py).
+The grid is cut into blocks of BLOCK_RUNS runs; each worker advances a whole
+block in lockstep, one control tick per step, with the state of every run
+(move clock, direction, cycle, position) held in arrays:
+- A run whose move time has passed flips direction at that tick and starts
+  its next move there, as the controller does without sleeping
+- Runs that reach the cycle count take their Shutdown_Safe step and drop out
+  of the block, so later ticks only touch the runs still moving
+- Per-run sums and extremes are accumulated on the fly; no rows are stored
+
+Summaries per run: peak and RMS load torque (all logged rows, as in
+generateTestSummary), the peak torque as a fraction of STATIC_LOAD_TORQUE
+(the load the calculated MOTOR_TORQUE holds through the gearbox and rope
+stage), tracking error (Target - Current) RMS
+and maximum over the motion rows, and the largest position reached.
+"""
+
+import os
+import sys
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from cycle_log import (PENDULUM_MASS, STATIC_LOAD_TORQUE, MIN_ANGLE, MAX_ANGLE, MAX_VELOCITY,
+                      ACCELERATION, MOTION_TIME, CONTROL_PERIOD_MS)
+from pendulum_simulator import LOOP_OVERHEAD, motion_profile, load_torque
+
+SWEEP_CYCLES = 10     # cycles simulated per run
+BLOCK_RUNS = 1024     # runs advanced together by one worker
+
+PARAMETER_FIELDS = ['max_velocity', 'acceleration', 'motion_time', 'mass']
+
+SWEEP_DTYPE = np.dtype([
+    ('max_velocity', '<f8'),      # degrees/second
+    ('acceleration', '<f8'),      # degrees/second²
+    ('motion_time', '<f8'),       # s
+    ('mass', '<f8'),              # kg
+    ('rows', '<i8'),
+    ('duration', '<f8'),          # s, time of the Shutdown_Safe row
+    ('peak_torque', '<f8'),       # N⋅m
+    ('rms_torque', '<f8'),        # N⋅m
+    ('torque_ratio', '<f8'),      # peak_torque / STATIC_LOAD_TORQUE
+    ('tracking_rms', '<f8'),      # degrees
+    ('tracking_max', '<f8'),      # degrees
+    ('max_position', '<f8'),      # degrees
+])
+
+
+def parameter_grid(max_velocity=(MAX_VELOCITY,), acceleration=(ACCELERATION,),
+                   motion_time=(MOTION_TIME,), mass=(PENDULUM_MASS,)):
+    """SWEEP_DTYPE rows for every parameter combination, summaries unset"""
+    axes = np.meshgrid(np.asarray(max_velocity, dtype=np.float64),
+                       np.asarray(acceleration, dtype=np.float64),
+                       np.asarray(motion_time, dtype=np.float64),
+                       np.asarray(mass, dtype=np.float64), indexing='ij')
+    grid = np.zeros(axes[0].size, dtype=SWEEP_DTYPE)
+    for name, values in zip(PARAMETER_FIELDS, axes):
+        grid[name] = values.ravel()
+    return grid
+
+
+def simulate_block(params, cycles=SWEEP_CYCLES, period=None):
+    """Run every parameter set of a block in lockstep; returns the filled rows"""
+    period = period or CONTROL_PERIOD_MS / 1000.0 + LOOP_OVERHEAD
+    out = params.copy()
+    n = len(params)
+    if n == 0:
+        return out
+
+    # State of the runs still moving; idx maps them back to rows of out
+    idx = np.arange(n)
+    v = params['max_velocity'].astype(np.float64)
+    a = params['acceleration'].astype(np.float64)
+    motion_time = params['motion_time'].astype(np.float64)
+    mass = params['mass'].astype(np.float64)
+    tick = np.zeros(n, dtype=np.int64)     # ticks since the current move started
+    up = np.ones(n, dtype=bool)
+    cycle = np.zeros(n, dtype=np.int64)
+    pos = np.zeros(n)
+    rows = np.zeros(n, dtype=np.int64)
+    torque_peak = np.zeros(n)
+    torque_sq = np.zeros(n)
+    error_sq = np.zeros(n)
+    error_max = np.zeros(n)
+    pos_max = np.zeros(n)
+
+    step_count = 0
+    while len(idx):
+        # Direction switch at the first tick past the move time
+        switch = tick * period > motion_time
+        if switch.any():
+            up = np.where(switch, ~up, up)
+            tick = np.where(switch, 0, tick)
+            cycle = cycle + (switch & ~up)
+            done = switch & (cycle >= cycles)
+            if done.any():
+                # Shutdown_Safe: one command toward 0° a period after the last one
+                error = MIN_ANGLE - pos[done]
+                step = v[done] * period
+                final = np.where(np.abs(error) > step, pos[done] + np.sign(error) * step, MIN_ANGLE)
+                torque = np.abs(load_torque(final, mass[done]))
+                k = idx[done]
+                out['rows'][k] = rows[done] + 1
+                out['duration'][k] = step_count * period
+                out['peak_torque'][k] = np.maximum(torque_peak[done], torque)
+                out['rms_torque'][k] = np.sqrt((torque_sq[done] + torque * torque) / (rows[done] + 1))
+                out['tracking_rms'][k] = np.sqrt(error_sq[done] / np.maximum(rows[done], 1))
+                out['tracking_max'][k] = error_max[done]
+                out['max_position'][k] = np.maximum(pos_max[done], final)
+
+                keep = ~done
+                state = [v, a, motion_time, mass, tick, up, cycle, pos, rows,
+                         torque_peak, torque_sq, error_sq, error_max, pos_max]
+                (v, a, motion_time, mass, tick, up, cycle, pos, rows,
+                 torque_peak, torque_sq, error_sq, error_max, pos_max) = [s[keep] for s in state]
+                idx = idx[keep]
+                if not len(idx):
+                    break
+
+        # One control tick: profile, rate-limited motor command, log row
+        start_pos = np.where(up, MIN_ANGLE, MAX_ANGLE)
+        end_pos = np.where(up, MAX_ANGLE, MIN_ANGLE)
+        target, _ = motion_profile(start_pos, end_pos, tick * period, motion_time, v, a)
+        step = v * (period if step_count else 0.0)
+        error = target - pos
+        pos = np.where(error > step, pos + step, np.where(error < -step, pos - step, target))
+        torque = np.abs(load_torque(pos, mass))
+        tracking = np.abs(target - pos)
+
+        rows += 1
+        torque_peak = np.maximum(torque_peak, torque)
+        torque_sq += torque * torque
+        error_sq += tracking * tracking
+        error_max = np.maximum(error_max, tracking)
+        pos_max = np.maximum(pos_max, pos)
+        tick += 1
+        step_count += 1
+
+    out['torque_ratio'] = out['peak_torque'] / STATIC_LOAD_TORQUE
+    return out
+
+
+def run_sweep(grid, cycles=SWEEP_CYCLES, workers=None, block_runs=BLOCK_RUNS):
+    """Simulate every row of a parameter grid; returns the SWEEP_DTYPE table"""
+    workers = workers or os.cpu_count()
+    # Small enough blocks that every worker gets several
+    size = max(1, min(block_runs, -(-len(grid) // (4 * workers))))
+    blocks = [grid[i:i + size] for i in range(0, len(grid), size)]
+    if workers == 1:
+        results = [simulate_block(block, cycles) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(simulate_block, blocks, [cycles] * len(blocks)))
+    if not results:
+        return np.empty(0, dtype=SWEEP_DTYPE)
+    return np.concatenate(results)
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    out_path = sys.argv[2] if len(sys.argv) > 2 else None
+
+    grid = parameter_grid(max_velocity=np.arange(20.0, 61.0, 5.0),
+                          acceleration=np.arange(30.0, 151.0, 15.0),
+                          motion_time=np.arange(2.0, 4.01, 0.25),
+                          mass=np.arange(1.0, 3.01, 0.5))
+    start = time.perf_counter()
+    table = run_sweep(grid, workers=workers)
+    elapsed = time.perf_counter() - start
+
+    print("="*60)
+    print("MOTION PARAMETER SWEEP")
+    print("="*60)
+    print(f"Runs: {len(table)} of {SWEEP_CYCLES} cycles with {workers} workers in {elapsed:.2f} s")
+    print(f"Simulated Time: {table['duration'].sum() / 3600:.1f} h")
+    print(f"Peak Torque: {table['peak_torque'].min():.3f} to {table['peak_torque'].max():.3f} N⋅m "
+          f"(static requirement {STATIC_LOAD_TORQUE:.3f} N⋅m)")
+    within = table[table['torque_ratio'] <= 1.0 + 1e-9]
+    print(f"Runs Within Calculated Motor Torque: {len(within)}")
+    print("\nLowest Tracking Error Within Calculated Motor Torque:")
+    print(f"  {'v':>5s} {'a':>6s} {'T':>5s} {'M':>4s} {'peak':>6s} {'rms':>6s} {'track rms':>9s} {'max':>7s}")
+    for run in np.sort(within, order=['tracking_rms', 'peak_torque'])[:10]:
+        print(f"  {run['max_velocity']:5.1f} {run['acceleration']:6.1f} {run['motion_time']:5.2f} "
+              f"{run['mass']:4.1f} {run['peak_torque']:6.3f} {run['rms_torque']:6.3f} "
+              f"{run['tracking_rms']:9.3f} {run['tracking_max']:7.3f}")
+    if out_path:
+        import pandas as pd
+        pd.DataFrame(table).to_csv(out_path, index=False, float_format='%.4f')
+        print(f"\nTable saved to: {out_path}")
+    print("="*60)
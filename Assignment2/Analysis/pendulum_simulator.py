@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Virtual-Clock Pendulum Controller Simulation
+Reproduces PendulumController::runCyclingTest without waiting on a real clock
+
+The C++ loop sleeps CONTROL_PERIOD_MS per sample, so 1000 cycles take about
+100 minutes. Here the loop runs on a virtual clock with the same structure:
+- Each move samples generateMotionProfile at elapsed = 0, period, 2·period, ...
+  while elapsed <= motion_time; the first tick past motion_time flips the
+  direction without sleeping, and the next move starts at that same time
+- The cycle counter increments when a Moving_Down move starts; the test ends
+  when it reaches the cycle count, with one Shutdown_Safe row commanding 0°
+- sendMotorCommand moves Current_Position toward the target by at most
+  MAX_VELOCITY·dt, dt being the time since the previous command
+- Velocity is the profile velocity; Load_Torque = M·g·L·sin(Current_Position)
+
+The profile keeps the controller's formulas as they are, so a down move
+starts from 90° with the up-move position terms. The loop period is
+CONTROL_PERIOD_MS plus LOOP_OVERHEAD (about 2 ms in the recorded log), with
+optional uniform sleep jitter. Output rows use the CYCLE_LOG_DTYPE schema and
+are written in the same CSV layout as logCycleData.
+"""
+
+import sys
+import time
+import numpy as np
+
+from cycle_log import (DEFAULT_CHUNK_ROWS, CYCLE_LOG_DTYPE, STATUS_CODES, PENDULUM_MASS,
+                      PENDULUM_LENGTH, GRAVITY, MIN_ANGLE, MAX_ANGLE, MAX_VELOCITY, ACCELERATION,
+                      MOTION_TIME, POSITION_TOLERANCE, CONTROL_PERIOD_MS, MAX_CYCLES,
+                      write_cycle_log)
+
+LOOP_OVERHEAD = 0.002     # s per loop iteration on top of the sleep
+ENDPOINT_VELOCITY = 5.0   # degrees/second reported at the end of a move
+SIMULATED_LOG_PATH = '../Output/simulated_run.csv'   # outside the '*cycle_log*.csv' globs
+
+
+def motion_profile(start_pos, end_pos, elapsed, total_time,
+                   max_velocity=MAX_VELOCITY, acceleration=ACCELERATION):
+    """(position, velocity) of generateMotionProfile at elapsed seconds into a move
+
+    All arguments broadcast, so one call evaluates a whole move or one tick
+    of an ensemble of parameter sets.
+    """
+    elapsed = np.asarray(elapsed, dtype=np.float64)
+    accel_time = max_velocity / acceleration
+    const_time = total_time - 2.0 * accel_time
+    triangular = const_time < 0
+    accel_time = np.where(triangular, total_time / 2.0, accel_time)
+    const_time = np.where(triangular, 0.0, const_time)
+
+    in_accel = elapsed <= accel_time
+    in_const = elapsed <= accel_time + const_time
+    in_decel = elapsed < total_time
+    t_remaining = total_time - elapsed
+    position = np.where(in_accel, start_pos + 0.5 * acceleration * elapsed * elapsed,
+               np.where(in_const, start_pos + 0.5 * acceleration * accel_time * accel_time
+                                  + max_velocity * (elapsed - accel_time),
+               np.where(in_decel, end_pos - 0.5 * acceleration * t_remaining * t_remaining,
+                        end_pos)))
+    velocity = np.where(in_accel, acceleration * elapsed,
+               np.where(in_const, max_velocity,
+               np.where(in_decel, acceleration * t_remaining, ENDPOINT_VELOCITY)))
+    velocity = np.where(np.asarray(end_pos) - start_pos < 0, -velocity, velocity)
+    return position, velocity
+
+
+def load_torque(angle_deg, mass=PENDULUM_MASS, length=PENDULUM_LENGTH):
+    """calculateLoadTorque: M·g·L·sin(θ) in N⋅m"""
+    return mass * GRAVITY * length * np.sin(np.radians(angle_deg))
+
+
+def _follow(targets, max_steps, position):
+    """sendMotorCommand's rate-limited step toward each target in turn"""
+    out = []
+    for target, step in zip(targets, max_steps):
+        error = target - position
+        if error > step:
+            position += step
+        elif error < -step:
+            position -= step
+        else:
+            position = target
+        out.append(position)
+    return out, position
+
+
+class PendulumSimulator:
+    """Virtual-clock runCyclingTest with the controller's parameters as arguments"""
+
+    def __init__(self, motion_time=MOTION_TIME, max_velocity=MAX_VELOCITY,
+                 acceleration=ACCELERATION, mass=PENDULUM_MASS, length=PENDULUM_LENGTH,
+                 control_period=CONTROL_PERIOD_MS / 1000.0, loop_overhead=LOOP_OVERHEAD,
+                 jitter=0.0, seed=None):
+        self.motion_time = motion_time
+        self.max_velocity = max_velocity
+        self.acceleration = acceleration
+        self.mass = mass
+        self.length = length
+        self.period = control_period + loop_overhead
+        self.jitter = jitter
+        self.rng = np.random.default_rng(seed)
+
+    def _move_times(self):
+        """Elapsed time of every sample in one move, and the move's duration"""
+        n_max = int(np.floor(self.motion_time / self.period + 1e-9)) + 2
+        if self.jitter:
+            periods = self.period + self.rng.uniform(0.0, self.jitter, n_max)
+            elapsed = np.concatenate([[0.0], np.cumsum(periods)])
+        else:
+            elapsed = np.arange(n_max + 1) * self.period
+        n = int(np.searchsorted(elapsed, self.motion_time, side='right'))
+        while n == len(elapsed):   # jitter drew short periods; extend the move
+            more = self.period + self.rng.uniform(0.0, self.jitter, n_max)
+            elapsed = np.concatenate([elapsed, elapsed[-1] + np.cumsum(more)])
+            n = int(np.searchsorted(elapsed, self.motion_time, side='right'))
+        return elapsed[:n], elapsed[n]
+
+    def _records(self, cycle, t, position, target, velocity, status):
+        records = np.empty(len(t), dtype=CYCLE_LOG_DTYPE)
+        records['Cycle'] = cycle
+        records['Timestamp'] = t
+        records['Current_Position'] = position
+        records['Target_Position'] = target
+        records['Velocity'] = velocity
+        records['Load_Torque'] = load_torque(position, self.mass, self.length)
+        records['Limit_0'] = position <= MIN_ANGLE + POSITION_TOLERANCE
+        records['Limit_90'] = position >= MAX_ANGLE - POSITION_TOLERANCE
+        records['Status'] = status
+        return records
+
+    def iter_run(self, cycles=MAX_CYCLES, stop_time=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Yield the simulated log as CYCLE_LOG_DTYPE chunks of about chunk_rows rows
+
+        stop_time (s) stands in for Ctrl+C: the loop stops at the first
+        iteration at or after it, as when g_running is cleared.
+        """
+        stop_time = np.inf if stop_time is None else stop_time
+        t0 = 0.0                   # start time of the current move
+        cycle = 0
+        up = True
+        position = 0.0
+        velocity = 0.0
+        last_command = None        # time of the previous sendMotorCommand
+        pending, rows = [], 0
+
+        while cycle < cycles and t0 < stop_time:
+            elapsed, duration = self._move_times()
+            t = t0 + elapsed
+            stopped = t[-1] >= stop_time
+            if stopped:
+                elapsed, t = elapsed[t < stop_time], t[t < stop_time]
+            start_pos, end_pos = (MIN_ANGLE, MAX_ANGLE) if up else (MAX_ANGLE, MIN_ANGLE)
+            target, profile_velocity = motion_profile(start_pos, end_pos, elapsed, self.motion_time,
+                                                      self.max_velocity, self.acceleration)
+            dt = np.diff(t, prepend=t[0] if last_command is None else last_command)
+            followed, position = _follow(target.tolist(), (self.max_velocity * dt).tolist(), position)
+            pending.append(self._records(cycle, t, np.array(followed), target, profile_velocity,
+                                         STATUS_CODES['Moving_Up' if up else 'Moving_Down']))
+            rows += len(t)
+            velocity = float(profile_velocity[-1])
+            last_command = float(t[-1])
+            if stopped:
+                t0 = last_command + self.period
+                break
+            if t0 + duration >= stop_time:
+                t0 += duration
+                break
+
+            # Direction switch at the first tick past motion_time, without a sleep
+            t0 += duration
+            up = not up
+            if not up:
+                cycle += 1
+            if rows >= chunk_rows:
+                yield np.concatenate(pending)
+                pending, rows = [], 0
+
+        # Safe shutdown: one command toward 0° after the final loop iteration
+        t_end = t0 if last_command is not None else 0.0
+        step = self.max_velocity * (t_end - (last_command if last_command is not None else t_end))
+        followed, position = _follow([MIN_ANGLE], [step], position)
+        pending.append(self._records(cycle, np.array([t_end]), np.array(followed),
+                                     np.array([MIN_ANGLE]), velocity, STATUS_CODES['Shutdown_Safe']))
+        yield np.concatenate(pending)
+
+    def run(self, cycles=MAX_CYCLES, stop_time=None):
+        """Whole simulated log as one structured array"""
+        return np.concatenate(list(self.iter_run(cycles, stop_time)))
+
+    def write(self, path, cycles=MAX_CYCLES, stop_time=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Write the simulated log as CSV; returns (rows, simulated seconds)"""
+        rows, t_end = 0, 0.0
+        for i, records in enumerate(self.iter_run(cycles, stop_time, chunk_rows)):
+            write_cycle_log(records, path, header=(i == 0), mode='w' if i == 0 else 'a')
+            rows += len(records)
+            t_end = float(records['Timestamp'][-1])
+        return rows, t_end
+
+
+if __name__ == "__main__":
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else MAX_CYCLES
+    out_path = sys.argv[2] if len(sys.argv) > 2 else SIMULATED_LOG_PATH
+
+    start = time.perf_counter()
+    records = PendulumSimulator().run(cycles)
+    simulate_time = time.perf_counter() - start
+    write_cycle_log(records, out_path)
+    write_time = time.perf_counter() - start - simulate_time
+    simulated = float(records['Timestamp'][-1])
+
+    print("="*60)
+    print("VIRTUAL-CLOCK CONTROLLER SIMULATION")
+    print("="*60)
+    print(f"Output: {out_path}")
+    print(f"Cycles: {cycles}  Rows: {len(records)}")
+    print(f"Simulated Time: {simulated:.1f} s in {simulate_time:.2f} s "
+          f"({simulated / simulate_time:.0f}x real time)")
+    print(f"CSV Write: {write_time:.2f} s")
+    print("="*60)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Run-to-Run Diff with Banded DTW
+Per-cycle comparison of a new cycle log against a golden run
+
+Cycles with the same Cycle number are paired and aligned with dynamic time
+warping on Current_Position, restricted to a Sakoe-Chiba band of ±BAND_ROWS
+samples around the (length-scaled) diagonal, so each cycle costs O(n·w)
+instead of O(n²). Each band row is one vectorized step: with S the prefix sum
+of the row's costs and A the best predecessor from the row above,
+
+    D[i, j] = S[j] + min over l ≤ j of (A[l] - S[l-1])
+
+which np.minimum.accumulate evaluates for a whole batch of cycles at once.
+
+Along the warping path the tool reports, per cycle, the RMS and maximum
+divergence of position, velocity and load torque, plus the RMS timing shift.
+Run as a script it exits with status 1 when any cycle exceeds the limits, so
+it can gate controller builds.
+"""
+
+import sys
+import numpy as np
+
+from cycle_log import DEFAULT_CHUNK_ROWS, POSITION_TOLERANCE, CYCLE_LOG_DTYPE, iter_cycle_log
+
+BAND_ROWS = 50          # half-width of the warping band, in samples
+BATCH_CYCLES = 64       # cycle pairs aligned together
+DIFF_SIGNALS = {'position': 'Current_Position', 'velocity': 'Velocity', 'torque': 'Load_Torque'}
+
+# Gate limits on the RMS divergence along the warping path
+LIMITS = {
+    'position': POSITION_TOLERANCE,   # degrees
+    'velocity': 2.0,                  # degrees/second
+    'torque': 0.1,                    # N⋅m
+}
+
+DIFF_DTYPE = np.dtype([
+    ('cycle', '<i4'),
+    ('rows_golden', '<i8'),
+    ('rows_new', '<i8'),
+    ('path_length', '<i8'),
+    ('position_rms', '<f8'),
+    ('position_max', '<f8'),
+    ('velocity_rms', '<f8'),
+    ('velocity_max', '<f8'),
+    ('torque_rms', '<f8'),
+    ('torque_max', '<f8'),
+    ('time_shift_rms', '<f8'),   # s, after aligning the cycle starts
+])
+
+
+def iter_cycles(path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield (cycle, records) for each complete cycle of a log, in order"""
+    carry = np.empty(0, dtype=CYCLE_LOG_DTYPE)
+    for records in iter_cycle_log(path, chunk_rows):
+        buf = np.concatenate([carry, records]) if len(carry) else records
+        cycles = buf['Cycle']
+        bounds = np.r_[0, np.flatnonzero(cycles[1:] != cycles[:-1]) + 1]
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            yield int(cycles[a]), buf[a:b]
+        carry = buf[bounds[-1]:].copy()
+    if len(carry):
+        yield int(carry['Cycle'][0]), carry
+
+
+def _pad(arrays, fill=0.0):
+    out = np.full((len(arrays), max(len(a) for a in arrays)), fill)
+    for k, a in enumerate(arrays):
+        out[k, :len(a)] = a
+    return out
+
+
+def banded_dtw(a, b, na, nb, band=BAND_ROWS):
+    """Banded DTW of padded signal rows a (C, N) against b (C, M)
+
+    Returns (cost, path_i, path_j, path_len): total squared-difference cost
+    and the warping path of each pair, indices in path order from (0, 0).
+    """
+    C, N = a.shape
+    W = 2 * band + 1
+    rows = np.arange(N)
+    slope = (nb - 1) / np.maximum(na - 1, 1)
+    lo = np.rint(rows[None, :] * slope[:, None]).astype(np.int64) - band   # (C, N)
+    k = np.arange(W)
+    cidx = np.arange(C)[:, None]
+    D = np.full((N, C, W), np.inf)
+
+    for i in range(N):
+        active = i < na
+        j = lo[:, i][:, None] + k[None, :]                                  # (C, W)
+        in_range = (j >= 0) & (j < nb[:, None]) & active[:, None]
+        jc = np.clip(j, 0, b.shape[1] - 1)
+        cost = np.where(in_range, (a[:, i][:, None] - b[cidx, jc]) ** 2, 0.0)
+        if i == 0:
+            pred = np.where(j == 0, 0.0, np.inf)
+        else:
+            p = j - lo[:, i - 1][:, None]
+            prev = D[i - 1]
+            up = np.where((p >= 0) & (p < W), prev[cidx, np.clip(p, 0, W - 1)], np.inf)
+            diag = np.where((p >= 1) & (p <= W), prev[cidx, np.clip(p - 1, 0, W - 1)], np.inf)
+            pred = np.minimum(up, diag)
+        pred = np.where(in_range, pred, np.inf)
+        s = np.cumsum(cost, axis=1)
+        with np.errstate(invalid='ignore'):
+            D[i] = np.where(in_range, s + np.minimum.accumulate(pred - (s - cost), axis=1), np.inf)
+
+    last = na - 1
+    end_k = (nb - 1) - lo[np.arange(C), last]
+    total = D[last, np.arange(C), np.clip(end_k, 0, W - 1)]
+    total = np.where((end_k >= 0) & (end_k < W), total, np.inf)
+
+    # Backtrack all pairs together from (na-1, nb-1) to (0, 0)
+    max_len = N + b.shape[1]
+    path_i = np.zeros((C, max_len), dtype=np.int64)
+    path_j = np.zeros((C, max_len), dtype=np.int64)
+    path_len = np.zeros(C, dtype=np.int64)
+    ci = last.copy()
+    cj = nb - 1
+    alive = np.isfinite(total)
+    step = 0
+    while alive.any():
+        path_i[alive, step] = ci[alive]
+        path_j[alive, step] = cj[alive]
+        path_len[alive] += 1
+        done = alive & (ci == 0) & (cj == 0)
+        alive &= ~done
+        if not alive.any():
+            break
+
+        def cell(ii, jj):
+            kk = jj - lo[np.arange(C), np.clip(ii, 0, N - 1)]
+            ok = (ii >= 0) & (jj >= 0) & (kk >= 0) & (kk < W)
+            return np.where(ok, D[np.clip(ii, 0, N - 1), np.arange(C), np.clip(kk, 0, W - 1)], np.inf)
+
+        options = np.stack([cell(ci - 1, cj - 1), cell(ci - 1, cj), cell(ci, cj - 1)])
+        move = np.argmin(options, axis=0)
+        ci = np.where(alive & (move < 2), ci - 1, ci)
+        cj = np.where(alive & (move != 1), cj - 1, cj)
+        step += 1
+
+    # Reverse each path so it runs from the cycle start
+    pos = np.arange(max_len)[None, :]
+    rev = np.clip(path_len[:, None] - 1 - pos, 0, max_len - 1)
+    path_i = np.take_along_axis(path_i, rev, axis=1)
+    path_j = np.take_along_axis(path_j, rev, axis=1)
+    return total, path_i, path_j, path_len
+
+
+def diff_cycles(golden, new, band=BAND_ROWS):
+    """DIFF_DTYPE rows for lists of paired golden/new cycle records"""
+    na = np.array([len(r) for r in golden])
+    nb = np.array([len(r) for r in new])
+    a = _pad([r['Current_Position'] for r in golden])
+    b = _pad([r['Current_Position'] for r in new])
+    _, pi, pj, plen = banded_dtw(a, b, na, nb, band)
+    on_path = np.arange(pi.shape[1])[None, :] < plen[:, None]
+    count = np.maximum(plen, 1)
+    cidx = np.arange(len(golden))[:, None]
+
+    out = np.empty(len(golden), dtype=DIFF_DTYPE)
+    out['cycle'] = [int(r['Cycle'][0]) for r in golden]
+    out['rows_golden'] = na
+    out['rows_new'] = nb
+    out['path_length'] = plen
+    for name, column in DIFF_SIGNALS.items():
+        d = _pad([r[column] for r in golden])[cidx, pi] - _pad([r[column] for r in new])[cidx, pj]
+        d = np.where(on_path, d, 0.0)
+        out[f'{name}_rms'] = np.where(plen > 0, np.sqrt((d * d).sum(1) / count), np.nan)
+        out[f'{name}_max'] = np.where(plen > 0, np.abs(d).max(1), np.nan)
+    ta = _pad([r['Timestamp'] - r['Timestamp'][0] for r in golden])[cidx, pi]
+    tb = _pad([r['Timestamp'] - r['Timestamp'][0] for r in new])[cidx, pj]
+    shift = np.where(on_path, ta - tb, 0.0)
+    out['time_shift_rms'] = np.where(plen > 0, np.sqrt((shift * shift).sum(1) / count), np.nan)
+    return out
+
+
+def diff_runs(golden_path, new_path, band=BAND_ROWS, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Per-cycle diff table plus cycle numbers present in only one run"""
+    tables = []
+    only_golden, only_new = [], []
+    batch_golden, batch_new = [], []
+
+    def flush():
+        if batch_golden:
+            tables.append(diff_cycles(batch_golden, batch_new, band))
+            batch_golden.clear()
+            batch_new.clear()
+
+    golden = iter_cycles(golden_path, chunk_rows)
+    new = iter_cycles(new_path, chunk_rows)
+    g, n = next(golden, None), next(new, None)
+    while g is not None or n is not None:
+        if n is None or (g is not None and g[0] < n[0]):
+            only_golden.append(g[0])
+            g = next(golden, None)
+        elif g is None or n[0] < g[0]:
+            only_new.append(n[0])
+            n = next(new, None)
+        else:
+            batch_golden.append(g[1])
+            batch_new.append(n[1])
+            if len(batch_golden) >= BATCH_CYCLES:
+                flush()
+            g, n = next(golden, None), next(new, None)
+    flush()
+    table = np.concatenate(tables) if tables else np.empty(0, dtype=DIFF_DTYPE)
+    return table, only_golden, only_new
+
+
+def failing_cycles(table, limits=LIMITS):
+    """Mask of cycles whose RMS divergence exceeds any limit"""
+    fail = np.zeros(len(table), dtype=bool)
+    for name, limit in limits.items():
+        fail |= ~(table[f'{name}_rms'] <= limit)
+    return fail
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: run_diff.py <golden_log.csv> <new_log.csv>")
+        sys.exit(2)
+    golden_path, new_path = sys.argv[1], sys.argv[2]
+
+    table, only_golden, only_new = diff_runs(golden_path, new_path)
+    fail = failing_cycles(table)
+
+    print("="*60)
+    print("RUN DIFF (BANDED DTW)")
+    print("="*60)
+    print(f"Golden: {golden_path}")
+    print(f"New:    {new_path}")
+    print(f"Cycles Compared: {len(table)}  Band: ±{BAND_ROWS} samples")
+    if only_golden or only_new:
+        print(f"Unpaired Cycles: {len(only_golden)} only in golden, {len(only_new)} only in new")
+    for name in DIFF_SIGNALS:
+        if len(table):
+            print(f"  {name:9s} RMS mean {np.mean(table[f'{name}_rms']):.4f}, "
+                  f"worst {np.max(table[f'{name}_rms']):.4f} (limit {LIMITS[name]})")
+    if len(table):
+        print(f"  timing    RMS shift mean {np.mean(table['time_shift_rms'])*1000:.1f} ms")
+    if fail.any():
+        print(f"\n❌ {fail.sum()} cycles exceed the limits: {table['cycle'][fail][:20].tolist()}")
+    else:
+        print("\n✅ All cycles within limits")
+    print("="*60)
+    sys.exit(1 if fail.any() or only_golden or only_new else 0)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Shared-Memory Cycle Log Ring Buffer
+Zero-copy transport of cycle-log samples between processes
+
+Layout of the shared block:
+- Header of int64 words: magic, capacity, record size, write sequence, closed
+  flag, then one read sequence and one active flag per reader slot
+- Ring of `capacity` records of CYCLE_LOG_DTYPE
+
+One producer appends records and then publishes the new write sequence.
+Each analyzer owns a reader slot, maps the ring as a NumPy array and gets
+views of newly published records without copying. Sequence numbers are
+monotonic record counts; slot = sequence % capacity.
+
+Slow readers: by default the producer never waits and a reader that falls
+more than `capacity` records behind reports the overrun and skips ahead.
+With block_on_readers=True the producer instead waits for the slowest
+active reader, but only while that reader makes progress: a reader whose
+read sequence has not moved for reader_timeout seconds (it crashed or hung
+without detaching) is evicted, i.e. its slot is marked inactive and the
+producer carries on; the reader, if still alive, sees `evicted` and from then
+on reports overruns like a non-blocking reader. A view handed out by a reader stays valid until the producer
+laps it; call ShmRingReader.valid() before trusting a view kept across polls.
+"""
+
+import sys
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+
+from cycle_log import DEFAULT_LOG_PATH, CYCLE_LOG_DTYPE, iter_cycle_log
+
+RING_MAGIC = 0x434C4F4752494E47  # "CLOGRING"
+RING_CAPACITY = 1 << 16
+MAX_READERS = 8
+POLL_INTERVAL = 0.001  # s
+READER_TIMEOUT = 5.0   # s without progress before a blocking reader is evicted
+
+_H_MAGIC, _H_CAPACITY, _H_RECORD_SIZE, _H_WRITE_SEQ, _H_CLOSED = range(5)
+_H_READERS = 5
+_HEADER_WORDS = _H_READERS + 2 * MAX_READERS
+_HEADER_BYTES = _HEADER_WORDS * 8
+
+
+class _RingMapping:
+    """NumPy views over the header and record area of a shared block"""
+
+    def __init__(self, shm, capacity):
+        self.shm = shm
+        self.header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        self.records = np.ndarray((capacity,), dtype=CYCLE_LOG_DTYPE, buffer=shm.buf,
+                                  offset=_HEADER_BYTES)
+        self.capacity = capacity
+        self.read_seq = self.header[_H_READERS:_H_READERS + MAX_READERS]
+        self.active = self.header[_H_READERS + MAX_READERS:]
+
+    @property
+    def write_seq(self):
+        return int(self.header[_H_WRITE_SEQ])
+
+    @property
+    def closed(self):
+        return bool(self.header[_H_CLOSED])
+
+    def release(self):
+        # Drop the NumPy views before closing, or SharedMemory.close() fails
+        self.header = self.records = self.read_seq = self.active = None
+        self.shm.close()
+
+
+class ShmRingProducer:
+    """Creates the ring and appends records to it"""
+
+    def __init__(self, name=None, capacity=RING_CAPACITY, block_on_readers=False,
+                 reader_timeout=READER_TIMEOUT):
+        size = _HEADER_BYTES + capacity * CYCLE_LOG_DTYPE.itemsize
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.ring = _RingMapping(shm, capacity)
+        self.ring.header[:] = 0
+        self.ring.header[_H_CAPACITY] = capacity
+        self.ring.header[_H_RECORD_SIZE] = CYCLE_LOG_DTYPE.itemsize
+        self.ring.header[_H_MAGIC] = RING_MAGIC
+        self.name = shm.name
+        self.capacity = capacity
+        self.block_on_readers = block_on_readers
+        self.reader_timeout = reader_timeout
+        self.waited = 0.0
+        self.evicted = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        self.unlink()
+
+    def _wait_for_readers(self, needed_seq):
+        start = time.perf_counter()
+        progress = {}   # reader slot -> (read sequence, time it was last seen to change)
+        while True:
+            behind = [r for r in np.flatnonzero(self.ring.active)
+                      if needed_seq - int(self.ring.read_seq[r]) > self.capacity]
+            if not behind:
+                break
+            now = time.perf_counter()
+            for r in behind:
+                seq = int(self.ring.read_seq[r])
+                if r not in progress or progress[r][0] != seq:
+                    progress[r] = (seq, now)
+                elif self.reader_timeout is not None and now - progress[r][1] > self.reader_timeout:
+                    # Crashed or hung without detaching: stop waiting for it
+                    self.ring.active[r] = 0
+                    self.evicted += 1
+            time.sleep(POLL_INTERVAL)
+        self.waited += time.perf_counter() - start
+
+    def write(self, records):
+        """Append records (CYCLE_LOG_DTYPE) and publish them"""
+        records = np.asarray(records, dtype=CYCLE_LOG_DTYPE)
+        cap = self.capacity
+        for start in range(0, len(records), cap):
+            block = records[start:start + cap]
+            seq = self.ring.write_seq
+            if self.block_on_readers:
+                self._wait_for_readers(seq + len(block))
+            first = seq % cap
+            n1 = min(len(block), cap - first)
+            self.ring.records[first:first + n1] = block[:n1]
+            self.ring.records[:len(block) - n1] = block[n1:]
+            self.ring.header[_H_WRITE_SEQ] = seq + len(block)
+
+    def close(self):
+        """Mark the stream finished; readers drain and then stop"""
+        if self.ring.header is not None:
+            self.ring.header[_H_CLOSED] = 1
+            self.ring.release()
+
+    def unlink(self):
+        shared_memory.SharedMemory(name=self.name).unlink()
+
+
+class ShmRingReader:
+    """Attaches to an existing ring in one of the reader slots"""
+
+    def __init__(self, name, reader_id, from_start=True):
+        if not 0 <= reader_id < MAX_READERS:
+            raise ValueError(f"reader_id must be in [0, {MAX_READERS})")
+        shm = shared_memory.SharedMemory(name=name)
+        # The producer owns the block; keep this process's tracker from unlinking it
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        if header[_H_MAGIC] != RING_MAGIC or header[_H_RECORD_SIZE] != CYCLE_LOG_DTYPE.itemsize:
+            del header
+            shm.close()
+            raise ValueError(f"Shared memory {name} is not a cycle log ring")
+        capacity = int(header[_H_CAPACITY])
+        del header
+        self.ring = _RingMapping(shm, capacity)
+        self.reader_id = reader_id
+        self.capacity = capacity
+        self.seq = 0 if from_start else self.ring.write_seq
+        self.overruns = 0
+        self.records_lost = 0
+        self.evicted = False
+        self.ring.read_seq[reader_id] = self.seq
+        self.ring.active[reader_id] = 1
+
+    def poll(self, max_records=None):
+        """Views of newly published records as (start_seq, [view, ...])
+
+        One view normally, two when the range wraps around the ring end. Views
+        from the previous poll are released; with block_on_readers the
+        producer will not overwrite the returned views until the next poll()
+        or release().
+        """
+        write_seq = self.ring.write_seq
+        if not self.ring.active[self.reader_id]:
+            self.evicted = True
+        if write_seq - self.seq > self.capacity:
+            lost = write_seq - self.capacity - self.seq
+            self.overruns += 1
+            self.records_lost += lost
+            self.seq += lost
+        self.ring.read_seq[self.reader_id] = self.seq
+        n = write_seq - self.seq
+        if max_records is not None:
+            n = min(n, max_records)
+        start_seq = self.seq
+        if n <= 0:
+            return start_seq, []
+        first = start_seq % self.capacity
+        n1 = min(n, self.capacity - first)
+        views = [self.ring.records[first:first + n1]]
+        if n > n1:
+            views.append(self.ring.records[:n - n1])
+        self.seq += n
+        return start_seq, views
+
+    def release(self):
+        """Let the producer reuse the slots of every view returned so far"""
+        self.ring.read_seq[self.reader_id] = self.seq
+
+    def valid(self, start_seq):
+        """True while records from start_seq on have not been overwritten"""
+        return self.ring.write_seq - start_seq <= self.capacity
+
+    def finished(self):
+        return self.ring.closed and self.seq >= self.ring.write_seq
+
+    def close(self):
+        if self.ring.header is not None:
+            self.ring.active[self.reader_id] = 0
+            self.ring.release()
+
+
+def _analyzer_process(name, reader_id, results):
+    """Demo analyzer: feeds ring records into a chunk-based analysis"""
+    from cycle_summary import CycleSummary
+    from mechanical_power import PowerIntegrator
+    from limit_switch_monitor import LimitSwitchMonitor
+
+    analyses = {0: CycleSummary, 1: PowerIntegrator, 2: LimitSwitchMonitor}
+    analysis = analyses[reader_id % len(analyses)]()
+    reader = ShmRingReader(name, reader_id)
+    records = 0
+    while not reader.finished():
+        start_seq, views = reader.poll()
+        if not views:
+            time.sleep(POLL_INTERVAL)
+            continue
+        for view in views:
+            analysis.add_chunk(view)
+            records += len(view)
+    results.put((type(analysis).__name__, records, reader.records_lost))
+    reader.close()
+
+
+if __name__ == "__main__":
+    log_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG_PATH
+    n_readers = 3
+
+    print("="*60)
+    print("SHARED-MEMORY RING TRANSPORT")
+    print("="*60)
+    with ShmRingProducer(capacity=RING_CAPACITY, block_on_readers=True) as producer:
+        results = mp.Queue()
+        workers = [mp.Process(target=_analyzer_process, args=(producer.name, i, results))
+                   for i in range(n_readers)]
+        for w in workers:
+            w.start()
+        time.sleep(0.5)  # let the readers claim their slots before publishing
+
+        start = time.perf_counter()
+        rows = 0
+        for chunk in iter_cycle_log(log_path, 10000):
+            producer.write(chunk)
+            rows += len(chunk)
+        producer.close()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - start
+
+        print(f"Ring: {producer.name}, {producer.capacity} records")
+        print(f"Published: {rows} records in {elapsed:.2f} s ({rows/elapsed:.0f} records/s)")
+        print(f"Producer Waited on Readers: {producer.waited:.3f} s ({producer.evicted} evicted)")
+        for _ in range(n_readers):
+            analysis, records, lost = results.get()
+            print(f"  {analysis}: {records} records received, {lost} lost")
+    print("="*60)
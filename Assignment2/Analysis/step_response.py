@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Per-Move Step Response Metrics
+Rise time, overshoot, settling time and steady-state error of every move
+
+Each run of identical Status (Moving_Up / Moving_Down) is one commanded move
+from one end of travel to the other (0° → 90° or 90° → 0°). Metrics are
+taken on Current_Position against the move's end-of-travel target:
+- Rise time: 10% → 90% of the travel from the move's starting position
+- Overshoot: furthest excursion past the target, in degrees and % of travel
+- Settling time: from move start until Current_Position stays within
+  POSITION_TOLERANCE of the target (NaN if it never settles in the move)
+- Steady-state error: target minus position at the last sample of the move,
+  positive when the pendulum falls short
+
+All moves of a chunk are evaluated at once with ufunc.reduceat over move
+boundaries; the still-open last move is carried into the next chunk.
+"""
+
+import sys
+import numpy as np
+
+from cycle_log import (DEFAULT_LOG_PATH, DEFAULT_CHUNK_ROWS, MIN_ANGLE, MAX_ANGLE,
+                       POSITION_TOLERANCE, STATUS_CODES, CYCLE_LOG_DTYPE, iter_cycle_log)
+
+RISE_LOW = 0.1
+RISE_HIGH = 0.9
+
+MOVE_DTYPE = np.dtype([
+    ('run', '<i4'),
+    ('move', '<i8'),
+    ('cycle', '<i4'),
+    ('direction', 'i1'),            # +1 up (0° → 90°), -1 down
+    ('rows', '<i8'),
+    ('t_start', '<f8'),
+    ('duration', '<f8'),
+    ('start_position', '<f8'),
+    ('target', '<f8'),
+    ('rise_time', '<f8'),
+    ('overshoot', '<f8'),           # degrees past the target
+    ('overshoot_pct', '<f8'),       # % of travel
+    ('settling_time', '<f8'),
+    ('steady_state_error', '<f8'),  # degrees short of the target
+])
+
+_MOVING = {STATUS_CODES['Moving_Up']: 1, STATUS_CODES['Moving_Down']: -1}
+
+
+def _first_true(mask, index, starts):
+    """Index of the first True row of each segment, or -1"""
+    big = np.iinfo(np.int64).max
+    first = np.minimum.reduceat(np.where(mask, index, big), starts)
+    return np.where(first == big, -1, first)
+
+
+def _last_true(mask, index, starts):
+    """Index of the last True row of each segment, or -1"""
+    return np.maximum.reduceat(np.where(mask, index, -1), starts)
+
+
+def move_metrics(records, run=0, first_move=0, tolerance=POSITION_TOLERANCE):
+    """Metrics for every complete move in records (moves must not be split)"""
+    status = records['Status']
+    direction = np.zeros(len(records), dtype=np.int8)
+    for code, sign in _MOVING.items():
+        direction[status == code] = sign
+    keep = direction != 0
+    records, direction = records[keep], direction[keep]
+    if len(records) == 0:
+        return np.empty(0, dtype=MOVE_DTYPE)
+
+    starts = np.flatnonzero(np.r_[True, records['Status'][1:] != records['Status'][:-1]])
+    ends = np.r_[starts[1:], len(records)] - 1
+    index = np.arange(len(records))
+    seg = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(records)]))
+
+    t = records['Timestamp']
+    pos = records['Current_Position']
+    sign = direction[starts].astype(np.float64)
+    target = np.where(sign > 0, MAX_ANGLE, MIN_ANGLE)
+    start_pos = pos[starts]
+    travel = target - start_pos
+    safe_travel = np.where(np.abs(travel) > 1e-9, travel, np.nan)
+
+    progress = (pos - start_pos[seg]) / safe_travel[seg]
+    low = _first_true(progress >= RISE_LOW, index, starts)
+    high = _first_true(progress >= RISE_HIGH, index, starts)
+    rise = np.where((low >= 0) & (high >= 0), t[high] - t[np.maximum(low, 0)], np.nan)
+
+    past = (pos - target[seg]) * sign[seg]
+    overshoot = np.maximum(np.maximum.reduceat(past, starts), 0.0)
+
+    outside = np.abs(pos - target[seg]) > tolerance
+    last_out = _last_true(outside, index, starts)
+    settled = last_out < ends
+    # A move that never leaves tolerance (last_out = -1) settles at its start
+    settle_idx = np.where(last_out < 0, starts, np.minimum(last_out + 1, ends))
+    settling = np.where(settled, t[settle_idx] - t[starts], np.nan)
+
+    out = np.empty(len(starts), dtype=MOVE_DTYPE)
+    out['run'] = run
+    out['move'] = first_move + np.arange(len(starts))
+    out['cycle'] = records['Cycle'][starts]
+    out['direction'] = direction[starts]
+    out['rows'] = ends - starts + 1
+    out['t_start'] = t[starts]
+    out['duration'] = t[ends] - t[starts]
+    out['start_position'] = start_pos
+    out['target'] = target
+    out['rise_time'] = rise
+    out['overshoot'] = overshoot
+    out['overshoot_pct'] = 100.0 * overshoot / np.abs(safe_travel)
+    out['settling_time'] = settling
+    out['steady_state_error'] = (target - pos[ends]) * sign
+    return out
+
+
+class StepResponseAnalyzer:
+    """Streaming per-move metrics; carries the open move across chunks"""
+
+    def __init__(self, run=0, tolerance=POSITION_TOLERANCE):
+        self.run = run
+        self.tolerance = tolerance
+        self.moves = 0
+        self._carry = np.empty(0, dtype=CYCLE_LOG_DTYPE)
+
+    def add_chunk(self, records):
+        """Returns metrics for moves completed by this chunk"""
+        buf = np.concatenate([self._carry, records]) if len(self._carry) else records
+        if len(buf) == 0:
+            return np.empty(0, dtype=MOVE_DTYPE)
+        status = buf['Status']
+        change = np.flatnonzero(status[1:] != status[:-1]) + 1
+        split = change[-1] if len(change) else 0
+        self._carry = buf[split:].copy()
+        return self._emit(buf[:split])
+
+    def finish(self):
+        table = self._emit(self._carry)
+        self._carry = np.empty(0, dtype=CYCLE_LOG_DTYPE)
+        return table
+
+    def _emit(self, records):
+        table = move_metrics(records, self.run, self.moves, self.tolerance)
+        self.moves += len(table)
+        return table
+
+
+def analyze_runs(log_paths, chunk_rows=DEFAULT_CHUNK_ROWS, tolerance=POSITION_TOLERANCE):
+    """Move table over several runs (run = index into log_paths)"""
+    tables = []
+    for run, path in enumerate(log_paths):
+        analyzer = StepResponseAnalyzer(run, tolerance)
+        for records in iter_cycle_log(path, chunk_rows):
+            tables.append(analyzer.add_chunk(records))
+        tables.append(analyzer.finish())
+    return np.concatenate(tables) if tables else np.empty(0, dtype=MOVE_DTYPE)
+
+
+def summarize_moves(table):
+    """Mean / 95th percentile of each metric per direction"""
+    summary = {}
+    for sign, name in ((1, 'up'), (-1, 'down')):
+        moves = table[table['direction'] == sign]
+        if len(moves) == 0:
+            continue
+        stats = {'moves': len(moves),
+                 'settled_fraction': float(np.mean(~np.isnan(moves['settling_time'])))}
+        for metric in ('rise_time', 'overshoot', 'settling_time', 'steady_state_error'):
+            values = moves[metric][~np.isnan(moves[metric])]
+            stats[metric] = ((float(values.mean()), float(np.percentile(values, 95)))
+                             if len(values) else (np.nan, np.nan))
+        summary[name] = stats
+    return summary
+
+
+if __name__ == "__main__":
+    log_paths = sys.argv[1:] or [DEFAULT_LOG_PATH]
+
+    table = analyze_runs(log_paths)
+    summary = summarize_moves(table)
+
+    print("="*60)
+    print("STEP RESPONSE METRICS")
+    print("="*60)
+    print(f"Runs: {len(log_paths)}  Moves: {len(table)}")
+    for name, stats in summary.items():
+        print(f"\nMoving {name} ({stats['moves']} moves, "
+              f"{stats['settled_fraction']*100:.0f}% settled within ±{POSITION_TOLERANCE}°):")
+        for metric in ('rise_time', 'overshoot', 'settling_time', 'steady_state_error'):
+            mean, p95 = stats[metric]
+            print(f"  {metric:20s} mean {mean:8.3f}  p95 {p95:8.3f}")
+    print("="*60)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Multi-Stream Timestamp Alignment
+Streaming merge of DAQ channels sampled at different rates into aligned frames
+
+The integrated DAQ (see Integration_Plan.md) delivers torque, encoders,
+temperatures, motor currents, vibration and safety status from separate
+files or sources, each sorted by time but at its own rate. Each source is a
+TimeStream yielding blocks of (timestamps, {field: values}).
+
+StreamMerger: k-way merge with a heap keyed by the last buffered timestamp of
+each stream. The stream whose buffer ends first fixes the frontier F: every
+sample up to F from every stream is known, so all of them are released in one
+vectorized step, and only that stream reads its next block. At most one block
+per stream is in memory at a time.
+
+FrameAligner: emits frames on a uniform clock (frame_dt) or at the sample
+times of a reference stream. Per stream:
+- 'asof':   last sample at or before the frame (status, slow sensors);
+            NaN if older than max_age
+- 'linear': interpolated between the samples around the frame; NaN if they
+            are further apart than max_age
+Frames are emitted as soon as every stream's samples around them are known.
+"""
+
+import sys
+import heapq
+import numpy as np
+
+from cycle_log import DEFAULT_CHUNK_ROWS, SIGNAL_COLUMNS, iter_cycle_log
+
+FRAME_DT = 0.01   # s
+METHODS = ('asof', 'linear')
+
+
+class TimeStream:
+    """A named, time-sorted source of (t, {field: values}) blocks"""
+
+    def __init__(self, name, blocks, fields, method='asof', max_age=None):
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {METHODS}")
+        self.name = name
+        self.fields = list(fields)
+        self.method = method
+        self.max_age = max_age
+        self._blocks = iter(blocks)
+        self._last_t = -np.inf
+
+    def next_block(self):
+        """Next non-empty block, or None when the source is exhausted"""
+        for t, values in self._blocks:
+            t = np.asarray(t, dtype=np.float64)
+            if len(t) == 0:
+                continue
+            if t[0] < self._last_t or np.any(np.diff(t) < 0):
+                raise ValueError(f"Stream {self.name} is not sorted by time")
+            self._last_t = t[-1]
+            return t, {name: np.asarray(values[name], dtype=np.float64) for name in self.fields}
+        return None
+
+
+class StreamMerger:
+    """Heap-based k-way merge; iterate for (frontier, parts, ended) steps
+
+    parts maps a stream index to its (t, values) released in this step; every
+    sample earlier than frontier has been released once the step is yielded.
+    ended lists the streams that finished in this step.
+    """
+
+    def __init__(self, streams):
+        self.streams = streams
+
+    def __iter__(self):
+        buffers = {}
+        heap = []
+        ended = []
+        for i, stream in enumerate(self.streams):
+            block = stream.next_block()
+            if block is None:
+                ended.append(i)
+            else:
+                buffers[i] = block
+                heapq.heappush(heap, (block[0][-1], i))
+
+        while heap:
+            frontier, i = heap[0]
+            parts = {}
+            for j, (t, values) in buffers.items():
+                n = int(np.searchsorted(t, frontier, side='right'))
+                if n:
+                    parts[j] = (t[:n], {k: v[:n] for k, v in values.items()})
+                    buffers[j] = (t[n:], {k: v[n:] for k, v in values.items()})
+
+            heapq.heappop(heap)
+            block = self.streams[i].next_block()
+            if block is None:
+                del buffers[i]
+                ended.append(i)
+            else:
+                buffers[i] = block
+                heapq.heappush(heap, (block[0][-1], i))
+            yield (frontier if heap else np.inf), parts, ended
+            ended = []
+
+        if ended:
+            yield np.inf, {}, ended
+
+
+class FrameAligner:
+    """Turns merge steps into aligned frames {'Timestamp', 'stream.field', ...}"""
+
+    def __init__(self, streams, frame_dt=FRAME_DT, reference=None, origin=0.0):
+        self.streams = streams
+        self.frame_dt = frame_dt
+        self.origin = origin
+        names = [s.name for s in streams]
+        self.reference = None if reference is None else names.index(reference)
+        self.columns = ['Timestamp'] + [f'{s.name}.{f}' for s in streams for f in s.fields]
+        self._t = [np.empty(0) for _ in streams]
+        self._v = [{f: np.empty(0) for f in s.fields} for s in streams]
+        self._ended = [False] * len(streams)
+        self._pending = np.empty(0)       # reference frame times not yet emitted
+        self._next_k = None               # next grid index (uniform clock)
+        self._t_max = -np.inf
+        self.frames = 0
+
+    def add_step(self, frontier, parts, ended):
+        """Absorb one merge step; returns the frames it completes (maybe empty)"""
+        for i, (t, values) in parts.items():
+            self._t[i] = np.concatenate([self._t[i], t])
+            for f in self.streams[i].fields:
+                self._v[i][f] = np.concatenate([self._v[i][f], values[f]])
+            if i == self.reference:
+                self._pending = np.concatenate([self._pending, t])
+            if self._next_k is None and self.reference is None:
+                start = min(float(p[0][0]) for p in parts.values())
+                self._next_k = int(np.ceil((start - self.origin) / self.frame_dt - 1e-9))
+            self._t_max = max(self._t_max, float(t[-1]))
+        for i in ended:
+            self._ended[i] = True
+        return self._emit(frontier)
+
+    def _frame_times(self, frontier):
+        # Linear streams need the sample after the frame before it can be emitted
+        bound, inclusive = frontier, False
+        for i, stream in enumerate(self.streams):
+            if stream.method == 'linear' and not self._ended[i] and len(self._t[i]):
+                if self._t[i][-1] < bound or (self._t[i][-1] == bound and inclusive):
+                    bound, inclusive = self._t[i][-1], True
+        if np.isinf(bound):
+            bound, inclusive = self._t_max, True
+
+        if self.reference is not None:
+            n = int(np.searchsorted(self._pending, bound, side='right' if inclusive else 'left'))
+            times, self._pending = self._pending[:n], self._pending[n:]
+            return times
+        if self._next_k is None:
+            return np.empty(0)
+        limit = (bound - self.origin) / self.frame_dt
+        last = int(np.floor(limit + 1e-9)) if inclusive else int(np.ceil(limit - 1e-9)) - 1
+        k = np.arange(self._next_k, last + 1)
+        if len(k):
+            self._next_k = int(k[-1]) + 1
+        return self.origin + k * self.frame_dt
+
+    def _sample(self, i, times):
+        stream = self.streams[i]
+        t = self._t[i]
+        if len(t) == 0:
+            return {f: np.full(len(times), np.nan) for f in stream.fields}
+        idx = np.searchsorted(t, times, side='right') - 1
+        left = np.maximum(idx, 0)
+        has_left = idx >= 0
+
+        if stream.method == 'asof':
+            ok = has_left
+            if stream.max_age is not None:
+                ok &= times - t[left] <= stream.max_age
+            return {f: np.where(ok, self._v[i][f][left], np.nan) for f in stream.fields}
+
+        right = np.minimum(idx + 1, len(t) - 1)
+        span = t[right] - t[left]
+        ok = has_left & (idx + 1 < len(t))
+        if stream.max_age is not None:
+            ok &= span <= stream.max_age
+        exact = has_left & (t[left] == times)
+        w = np.where(span > 0, (times - t[left]) / np.where(span > 0, span, 1.0), 0.0)
+        out = {}
+        for f in stream.fields:
+            v = self._v[i][f]
+            out[f] = np.where(ok, v[left] + w * (v[right] - v[left]),
+                              np.where(exact, v[left], np.nan))
+        return out
+
+    def _emit(self, frontier):
+        times = self._frame_times(frontier)
+        frames = {'Timestamp': times}
+        for i, stream in enumerate(self.streams):
+            for f, values in self._sample(i, times).items():
+                frames[f'{stream.name}.{f}'] = values
+        if len(times):
+            # Keep only the last sample at or before the newest frame, per stream
+            for i, stream in enumerate(self.streams):
+                keep = max(int(np.searchsorted(self._t[i], times[-1], side='right')) - 1, 0)
+                self._t[i] = self._t[i][keep:]
+                for f in stream.fields:
+                    self._v[i][f] = self._v[i][f][keep:]
+        self.frames += len(times)
+        return frames
+
+
+def align_streams(streams, frame_dt=FRAME_DT, reference=None, origin=0.0):
+    """Yield aligned frame blocks from time-sorted streams"""
+    aligner = FrameAligner(streams, frame_dt, reference, origin)
+    for frontier, parts, ended in StreamMerger(streams):
+        frames = aligner.add_step(frontier, parts, ended)
+        if len(frames['Timestamp']):
+            yield frames
+
+
+def cycle_log_source(path, columns=SIGNAL_COLUMNS, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Blocks of a cycle log for a TimeStream"""
+    for records in iter_cycle_log(path, chunk_rows):
+        yield records['Timestamp'], {name: records[name] for name in columns}
+
+
+def csv_source(path, time_column, columns, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Blocks of any time-sorted CSV channel file for a TimeStream"""
+    import pandas as pd
+    for df in pd.read_csv(path, usecols=[time_column] + list(columns), chunksize=chunk_rows):
+        yield df[time_column].to_numpy(np.float64), {c: df[c].to_numpy(np.float64) for c in columns}
+
+
+def simulated_daq_streams(duration=60.0, block_seconds=1.0, seed=0):
+    """Integrated-DAQ channels at their own rates, for demonstration"""
+    rng = np.random.default_rng(seed)
+
+    def source(rate, make):
+        for start in np.arange(0.0, duration, block_seconds):
+            n = int(round(block_seconds * rate))
+            t = start + (np.arange(n) + rng.uniform(0.0, 0.2, n)) / rate
+            yield t, make(t)
+
+    angle = lambda t: 45.0 - 45.0 * np.cos(2.0 * np.pi * t / 6.0)
+    return [
+        TimeStream('torque', source(1000.0, lambda t: {
+            'Torque': 5.886 * np.sin(np.radians(angle(t))) + rng.normal(0, 0.02, len(t))}),
+            ['Torque'], 'linear'),
+        TimeStream('encoder', source(500.0, lambda t: {
+            'Motor': angle(t) * 15.0, 'Pendulum': angle(t)}), ['Motor', 'Pendulum'], 'linear'),
+        TimeStream('temperature', source(1.0, lambda t: {
+            f'T{k}': 25.0 + 0.05 * k * t / 60.0 for k in range(1, 7)}),
+            [f'T{k}' for k in range(1, 7)], 'linear', max_age=2.0),
+        TimeStream('current', source(200.0, lambda t: {
+            'Servo': 1.2 + 0.1 * np.sin(t), 'Stepper': 0.8 + 0.05 * np.cos(t)}),
+            ['Servo', 'Stepper'], 'linear'),
+        TimeStream('vibration', source(2000.0, lambda t: {
+            'Accel': rng.normal(0.0, 0.1, len(t))}), ['Accel'], 'linear'),
+        TimeStream('safety', source(2.0, lambda t: {
+            'EStop': (t > duration * 0.9).astype(float)}), ['EStop'], 'asof'),
+    ]
+
+
+if __name__ == "__main__":
+    frame_dt = float(sys.argv[1]) if len(sys.argv) > 1 else FRAME_DT
+
+    streams = simulated_daq_streams()
+    blocks = list(align_streams(streams, frame_dt))
+    frames = {c: np.concatenate([b[c] for b in blocks]) for c in blocks[0]} if blocks else {}
+
+    print("="*60)
+    print("MULTI-STREAM ALIGNMENT")
+    print("="*60)
+    print(f"Streams: {', '.join(f'{s.name} ({s.method})' for s in streams)}")
+    print(f"Frame Clock: {frame_dt*1000:.1f} ms")
+    if frames:
+        t = frames['Timestamp']
+        print(f"Frames: {len(t)} from {t[0]:.3f} s to {t[-1]:.3f} s in {len(blocks)} blocks")
+        for column, values in frames.items():
+            if column == 'Timestamp':
+                continue
+            print(f"  {column:22s} {np.mean(np.isnan(values))*100:5.1f}% missing")
+    print("="*60)
@@ -0,0 +1,61 @@
+import os
+import time
+import threading
+
+import numpy as np
+
+from cycle_log import read_cycle_log
+from batched_writer import BatchedCycleLogWriter
+
+
+class _SlowLock:
+    """Lock that delays every thread but its creator before acquiring, widening the race"""
+
+    def __init__(self):
+        self._inner = threading.Lock()
+        self._owner = threading.get_ident()
+
+    def acquire(self, blocking=True, timeout=-1):
+        if threading.get_ident() != self._owner:
+            time.sleep(0.002)
+        return self._inner.acquire(blocking, timeout)
+
+    def release(self):
+        self._inner.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _produce(path, rows, done):
+    writer = BatchedCycleLogWriter(path, batch_rows=1, buffer_count=2,
+                                   flush_interval=0.0002, overflow='block', lock=_SlowLock())
+    with writer:
+        for i in range(rows):
+            writer.log(i // 100, i * 0.01, 1.0, 1.0, 0.0, 0.0, 0, 0, 'Moving_Up')
+            if i % 3 == 2:
+                # Let the writer drain and time out, then log a burst of three
+                # rows that empties the pool while it reaches for the lock
+                time.sleep(0.001)
+    done.append(writer.stats())
+
+
+def test_idle_flush_does_not_deadlock_blocked_producer(tmp_path):
+    # One-row batches and two buffers exhaust the pool within a burst of three
+    # rows, while the writer's idle flush reaches for the lock
+    for attempt in range(3):
+        path = os.path.join(tmp_path, f'stress{attempt}.csv')
+        done = []
+        thread = threading.Thread(target=_produce, args=(path, 600, done), daemon=True)
+        thread.start()
+        thread.join(timeout=60)
+        assert not thread.is_alive(), "writer deadlocked"
+        assert done[0]['rows_written'] == done[0]['rows_logged'] == 600
+
+        records = read_cycle_log(path)
+        assert len(records) == 600
+        assert np.array_equal(records['Cycle'], np.arange(600) // 100)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import torque_filter
+from torque_filter import torque_sensor_pipeline, simulated_torque_source
+
+
+def _filter_in_blocks(signal, block):
+    pipeline = torque_sensor_pipeline()
+    out = [pipeline.process(signal[i:i + block]) for i in range(0, len(signal), block)]
+    out.append(pipeline.process(np.empty(0)))
+    return np.concatenate(out)
+
+
+@pytest.fixture(scope='module')
+def signal():
+    return np.concatenate(list(simulated_torque_source(duration=0.5)))
+
+
+@pytest.fixture(scope='module')
+def whole(signal):
+    return torque_sensor_pipeline().process(signal)
+
+
+@pytest.mark.parametrize('block', [1, 7, 9, 10, 63, 64, 1000])
+def test_output_independent_of_block_size(signal, whole, block):
+    out = _filter_in_blocks(signal, block)
+    assert len(out) == len(whole) == len(signal) // 100
+    assert np.allclose(out, whole, rtol=0, atol=1e-12)
+
+
+def test_empty_blocks_pass_through(signal, whole):
+    pipeline = torque_sensor_pipeline()
+    out = []
+    for i in range(0, len(signal), 500):
+        out.append(pipeline.process(np.empty(0)))
+        out.append(pipeline.process(signal[i:i + 500]))
+    assert np.allclose(np.concatenate(out), whole, rtol=0, atol=1e-12)
+
+
+def test_pure_python_iir_matches_block_processing(signal, monkeypatch):
+    monkeypatch.setattr(torque_filter, 'sosfilt', None)
+    assert np.allclose(_filter_in_blocks(signal[:2000], 7),
+                       torque_sensor_pipeline().process(signal[:2000]), rtol=0, atol=1e-12)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Streaming Filter Pipeline for High-Rate Torque Data
+Block-wise low-pass, notch and decimation for kHz torque/load-cell streams
+
+The integrated DAQ (see Integration_Plan.md) adds an HBK T210 torque sensor
+and HBM C2 load cells sampling far faster than the 100 Hz control log. The
+pipeline brings those streams down to analysis rates:
+- FIRFilter: windowed-sinc low-pass, optionally evaluating only every M-th
+  output (decimating FIR)
+- IIRFilter: Butterworth low-pass or RBJ notch as second-order sections
+- Decimate: keep every M-th sample
+
+Every stage carries its state (FIR history, biquad delay lines, decimation
+phase) across blocks, so chunked processing gives the same output as
+filtering the whole signal at once. IIR sections run through
+scipy.signal.sosfilt when SciPy is installed and fall back to a pure-Python
+Direct Form II transposed loop otherwise.
+"""
+
+import sys
+import time
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from scipy.signal import sosfilt
+except ImportError:
+    sosfilt = None
+
+BLOCK_SIZE = 4096
+
+
+def design_fir_lowpass(cutoff_hz, fs, numtaps):
+    """Hamming-windowed sinc low-pass taps with unity DC gain"""
+    if not 0 < cutoff_hz < fs / 2:
+        raise ValueError("cutoff must lie between 0 and the Nyquist frequency")
+    n = np.arange(numtaps) - (numtaps - 1) / 2.0
+    taps = np.sinc(2.0 * cutoff_hz / fs * n) * np.hamming(numtaps)
+    return taps / taps.sum()
+
+
+def design_butter_lowpass(cutoff_hz, fs, order):
+    """Butterworth low-pass as second-order sections [b0 b1 b2 a0 a1 a2]"""
+    if not 0 < cutoff_hz < fs / 2:
+        raise ValueError("cutoff must lie between 0 and the Nyquist frequency")
+    warped = 2.0 * fs * np.tan(np.pi * cutoff_hz / fs)
+    k = np.arange(order)
+    poles_s = warped * np.exp(1j * np.pi * (2 * k + order + 1) / (2 * order))
+    poles_z = (2.0 * fs + poles_s) / (2.0 * fs - poles_s)
+
+    sections = []
+    upper = poles_z[poles_z.imag > 1e-12]
+    for p in upper:
+        a = np.array([1.0, -2.0 * p.real, abs(p) ** 2])
+        b = np.array([1.0, 2.0, 1.0])
+        sections.append(np.r_[b * a.sum() / b.sum(), a])
+    if order % 2:
+        p = poles_z[np.argmin(np.abs(poles_z.imag))].real
+        a = np.array([1.0, -p, 0.0])
+        b = np.array([1.0, 1.0, 0.0])
+        sections.append(np.r_[b * a.sum() / b.sum(), a])
+    return np.array(sections)
+
+
+def design_notch(freq_hz, fs, q=30.0):
+    """RBJ notch biquad as a single second-order section"""
+    w0 = 2.0 * np.pi * freq_hz / fs
+    alpha = np.sin(w0) / (2.0 * q)
+    b = np.array([1.0, -2.0 * np.cos(w0), 1.0])
+    a = np.array([1.0 + alpha, -2.0 * np.cos(w0), 1.0 - alpha])
+    return np.r_[b / a[0], a / a[0]][None, :]
+
+
+def _sosfilt_python(sos, x, zi):
+    """Direct Form II transposed cascade; zi has shape (sections, 2)"""
+    y = np.array(x, dtype=np.float64)
+    for s, (b0, b1, b2, _, a1, a2) in enumerate(sos):
+        z0, z1 = zi[s]
+        out = np.empty_like(y)
+        for i, v in enumerate(y):
+            o = b0 * v + z0
+            z0 = b1 * v - a1 * o + z1
+            z1 = b2 * v - a2 * o
+            out[i] = o
+        zi[s] = (z0, z1)
+        y = out
+    return y, zi
+
+
+class FIRFilter:
+    """Streaming FIR filter with optional integrated decimation"""
+
+    def __init__(self, taps, fs, decimation=1):
+        self.taps = np.asarray(taps, dtype=np.float64)
+        self.fs_in = fs
+        self.decimation = decimation
+        self.fs_out = fs / decimation
+        self._reversed = self.taps[::-1].copy()
+        self._history = np.zeros(len(self.taps) - 1)
+        self._phase = 0
+
+    @classmethod
+    def lowpass(cls, cutoff_hz, fs, numtaps=101, decimation=1):
+        return cls(design_fir_lowpass(cutoff_hz, fs, numtaps), fs, decimation)
+
+    def process(self, x):
+        # The history always holds len(taps) - 1 samples, so only an empty
+        # block (e.g. from an upstream decimator) has no complete window
+        x = np.asarray(x, dtype=np.float64)
+        if len(x) == 0:
+            return np.empty(0)
+        buf = np.concatenate([self._history, x])
+        windows = sliding_window_view(buf, len(self.taps))[self._phase::self.decimation]
+        y = windows @ self._reversed
+        self._phase += len(y) * self.decimation - len(x)
+        if len(self._history):
+            self._history = buf[len(buf) - len(self._history):]
+        return y
+
+
+class IIRFilter:
+    """Streaming cascade of second-order sections"""
+
+    def __init__(self, sos, fs):
+        self.sos = np.atleast_2d(np.asarray(sos, dtype=np.float64))
+        self.fs_in = self.fs_out = fs
+        self._zi = np.zeros((len(self.sos), 2))
+
+    @classmethod
+    def lowpass(cls, cutoff_hz, fs, order=4):
+        return cls(design_butter_lowpass(cutoff_hz, fs, order), fs)
+
+    @classmethod
+    def notch(cls, freq_hz, fs, q=30.0):
+        return cls(design_notch(freq_hz, fs, q), fs)
+
+    def process(self, x):
+        if len(x) == 0:
+            return np.empty(0)
+        if sosfilt is not None:
+            y, self._zi = sosfilt(self.sos, x, zi=self._zi)
+            return y
+        y, self._zi = _sosfilt_python(self.sos, x, self._zi)
+        return y
+
+
+class Decimate:
+    """Keep every factor-th sample (apply a low-pass stage first)"""
+
+    def __init__(self, factor, fs):
+        self.decimation = factor
+        self.fs_in = fs
+        self.fs_out = fs / factor
+        self._phase = 0
+
+    def process(self, x):
+        y = x[self._phase::self.decimation]
+        self._phase += len(y) * self.decimation - len(x)
+        return y
+
+
+class FilterPipeline:
+    """Chain of streaming stages with matching sample rates"""
+
+    def __init__(self, stages):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        for prev, stage in zip(stages, stages[1:]):
+            if not np.isclose(prev.fs_out, stage.fs_in):
+                raise ValueError(f"{type(stage).__name__} expects {stage.fs_in} Hz "
+                                 f"but receives {prev.fs_out} Hz")
+        self.stages = stages
+        self.fs_in = stages[0].fs_in
+        self.fs_out = stages[-1].fs_out
+        self.samples_in = 0
+        self.samples_out = 0
+        self.busy_time = 0.0
+
+    def process(self, x):
+        start = time.perf_counter()
+        y = np.asarray(x, dtype=np.float64)
+        for stage in self.stages:
+            y = stage.process(y)
+        self.busy_time += time.perf_counter() - start
+        self.samples_in += len(x)
+        self.samples_out += len(y)
+        return y
+
+    @property
+    def realtime_factor(self):
+        """Seconds of signal processed per second of compute"""
+        if self.busy_time == 0:
+            return float('inf')
+        return self.samples_in / self.fs_in / self.busy_time
+
+
+def torque_sensor_pipeline(fs=10000.0, mains_hz=50.0, cutoff_hz=40.0, out_fs=100.0):
+    """Default chain for T210 data: mains notch, IIR pre-filter, two FIR decimators"""
+    total = int(round(fs / out_fs))
+    first = 10 if total % 10 == 0 else 1
+    second = total // first
+    stages = [IIRFilter.notch(mains_hz, fs), IIRFilter.lowpass(4.0 * out_fs, fs, order=4)]
+    if first > 1:
+        stages.append(FIRFilter.lowpass(0.4 * fs / first, fs, numtaps=63, decimation=first))
+    mid_fs = fs / first
+    stages.append(FIRFilter.lowpass(cutoff_hz, mid_fs, numtaps=101, decimation=second))
+    return FilterPipeline(stages)
+
+
+def simulated_torque_source(fs=10000.0, duration=60.0, block=BLOCK_SIZE, seed=0):
+    """Pendulum load torque at 0.5 Hz plus 50 Hz hum, 1.2 kHz ripple and white noise"""
+    rng = np.random.default_rng(seed)
+    total = int(duration * fs)
+    for start in range(0, total, block):
+        t = np.arange(start, min(start + block, total)) / fs
+        angle = 45.0 - 45.0 * np.cos(2.0 * np.pi * t / 6.0)
+        torque = 2.0 * 9.81 * 0.3 * np.sin(np.radians(angle))
+        torque += 0.05 * np.sin(2.0 * np.pi * 50.0 * t) + 0.02 * np.sin(2.0 * np.pi * 1200.0 * t)
+        yield torque + rng.normal(0.0, 0.01, len(t))
+
+
+def file_source(path, block=BLOCK_SIZE):
+    """Samples from a single-column .npy file (memory-mapped) or text file"""
+    if path.endswith('.npy'):
+        data = np.load(path, mmap_mode='r')
+        for start in range(0, len(data), block):
+            yield np.asarray(data[start:start + block], dtype=np.float64)
+    else:
+        with open(path) as f:
+            while True:
+                lines = [line for _, line in zip(range(block), f)]
+                if not lines:
+                    break
+                yield np.array([float(v) for v in lines if v.strip()])
+
+
+if __name__ == "__main__":
+    source_path = sys.argv[1] if len(sys.argv) > 1 else None
+    fs = float(sys.argv[2]) if len(sys.argv) > 2 else 10000.0
+
+    pipeline = torque_sensor_pipeline(fs)
+    source = file_source(source_path) if source_path else simulated_torque_source(fs)
+    outputs = [pipeline.process(block) for block in source]
+    filtered = np.concatenate(outputs) if outputs else np.empty(0)
+
+    print("="*60)
+    print("TORQUE SENSOR FILTER PIPELINE")
+    print("="*60)
+    print(f"Source: {source_path or 'simulated T210 torque'}")
+    print(f"Stages: {', '.join(type(s).__name__ for s in pipeline.stages)}")
+    print(f"IIR Backend: {'scipy.signal.sosfilt' if sosfilt else 'pure Python'}")
+    print(f"Input: {pipeline.samples_in} samples at {pipeline.fs_in:.0f} Hz")
+    print(f"Output: {pipeline.samples_out} samples at {pipeline.fs_out:.0f} Hz")
+    print(f"Processing Speed: {pipeline.realtime_factor:.0f}x real time")
+    if len(filtered):
+        print(f"Filtered Torque Range: {filtered.min():.3f} to {filtered.max():.3f} N⋅m")
+    print("="*60)
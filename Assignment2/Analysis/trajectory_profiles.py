@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Trajectory Profile Library
+Whole-array motion profiles and their load torque, batched over many profiles
+
+Profiles are normalized shapes s(τ) on τ = t/T ∈ [0, 1] with s(0) = 0 and
+s(1) = 1, scaled to a move of distance D in time T:
+
+    θ = θ0 + D·s,  θ' = D/T·s',  θ'' = D/T²·s'',  θ''' = D/T³·s'''
+
+- 'trapezoid':    constant acceleration for accel_fraction·T at each end
+- 'scurve':       jerk-limited trapezoid; the jerk ramps take jerk_fraction of
+                  each acceleration phase
+- 'minimum_jerk': s = 10τ³ - 15τ⁴ + 6τ⁵
+- 'cycloidal':    s = τ - sin(2πτ)/2π
+
+The piecewise profiles are written as sums of truncated powers, e.g. the
+S-curve as Σ ΔJ_k·(τ - τ_k)₊³/6 over its jerk steps, so every shape is
+a handful of array operations. Distance, duration and shape fractions
+broadcast to a batch of P profiles sampled on one time grid, giving (P, N)
+arrays; profiles hold their end position after their own duration.
+
+Load torque at the pendulum shaft is gravity plus inertia,
+
+    τ_load = M·g·L·sin(θ) + (M·L² + J_extra)·θ''
+
+evaluated for the whole batch at once, so choosing a profile is one array
+computation over every candidate.
+"""
+
+import sys
+import numpy as np
+
+from cycle_log import (PENDULUM_MASS, PENDULUM_LENGTH, GRAVITY, STATIC_LOAD_TORQUE, MIN_ANGLE,
+                      MAX_ANGLE, MAX_VELOCITY, ACCELERATION, CONTROL_PERIOD_MS)
+
+PROFILE_KINDS = ['trapezoid', 'scurve', 'minimum_jerk', 'cycloidal']
+ACCEL_FRACTION = 0.25    # share of the move spent accelerating (trapezoid, S-curve)
+JERK_FRACTION = 0.5      # share of each acceleration phase spent ramping (S-curve)
+
+PROFILE_SUMMARY_DTYPE = np.dtype([
+    ('kind', 'u1'),               # index into PROFILE_KINDS
+    ('distance', '<f8'),          # degrees
+    ('duration', '<f8'),          # s
+    ('mass', '<f8'),              # kg
+    ('peak_velocity', '<f8'),     # degrees/second
+    ('peak_acceleration', '<f8'), # degrees/second²
+    ('peak_jerk', '<f8'),         # degrees/second³
+    ('peak_torque', '<f8'),       # N⋅m
+    ('rms_torque', '<f8'),        # N⋅m
+    ('peak_inertial_torque', '<f8'),  # N⋅m
+    ('torque_ratio', '<f8'),      # peak_torque / STATIC_LOAD_TORQUE
+])
+
+
+def _truncated_powers(tau, breaks, steps, order):
+    """Σ steps_k·(τ - breaks_k)₊^order / order! and its derivatives down to order 0"""
+    out = [np.zeros(np.broadcast_shapes(tau.shape, breaks[0].shape)) for _ in range(order + 1)]
+    for b, step in zip(breaks, steps):
+        x = np.maximum(tau - b, 0.0)
+        on = (tau >= b).astype(np.float64)
+        term = step * on
+        out[order] += term
+        for k in range(1, order + 1):
+            term = term * x / k
+            out[order - k] += term
+    return out
+
+
+def profile_shape(kind, tau, accel_fraction=ACCEL_FRACTION, jerk_fraction=JERK_FRACTION):
+    """Normalized (s, s', s'', s''') at τ; fractions broadcast against τ
+
+    τ is clipped to [0, 1]; past the end the shape holds at 1 with zero
+    derivatives. The trapezoid and S-curve need 0 < accel_fraction <= 0.5 and
+    the S-curve 0 < jerk_fraction <= 0.5; outside that the breakpoints would
+    reorder (or coincide) and the shape would not have the requested fractions.
+    """
+    tau = np.asarray(tau, dtype=np.float64)
+    inside = (tau >= 0.0) & (tau <= 1.0)
+    tau = np.clip(tau, 0.0, 1.0)
+    f = np.asarray(accel_fraction, dtype=np.float64)
+    if kind in ('trapezoid', 'scurve') and not np.all((f > 0.0) & (f <= 0.5)):
+        raise ValueError("accel_fraction must satisfy 0 < accel_fraction <= 0.5")
+    if kind == 'scurve':
+        jf = np.asarray(jerk_fraction, dtype=np.float64)
+        if not np.all((jf > 0.0) & (jf <= 0.5)):
+            raise ValueError("jerk_fraction must satisfy 0 < jerk_fraction <= 0.5")
+
+    if kind == 'trapezoid':
+        a = 1.0 / (f * (1.0 - f))
+        breaks = [np.zeros_like(f), f, 1.0 - f]
+        s, ds, dds = _truncated_powers(tau, breaks, [a, -a, -a], 2)
+        ddds = np.zeros_like(s)
+    elif kind == 'scurve':
+        fj = f * jf
+        j = 1.0 / ((1.0 - f) * (f - fj) * fj)
+        breaks = [np.zeros_like(f), fj, f - fj, f, 1.0 - f, 1.0 - f + fj, 1.0 - fj]
+        s, ds, dds, ddds = _truncated_powers(tau, breaks, [j, -j, -j, j, -j, j, j], 3)
+        ddds = np.where(tau >= 1.0, 0.0, ddds)
+    elif kind == 'minimum_jerk':
+        t2 = tau * tau
+        s = t2 * tau * (10.0 - 15.0 * tau + 6.0 * t2)
+        ds = 30.0 * t2 * (1.0 - tau) ** 2
+        dds = 60.0 * tau * (1.0 - 3.0 * tau + 2.0 * t2)
+        ddds = 60.0 - 360.0 * tau + 360.0 * t2
+    elif kind == 'cycloidal':
+        w = 2.0 * np.pi * tau
+        s = tau - np.sin(w) / (2.0 * np.pi)
+        ds = 1.0 - np.cos(w)
+        dds = 2.0 * np.pi * np.sin(w)
+        ddds = 4.0 * np.pi ** 2 * np.cos(w)
+    else:
+        raise ValueError(f"kind must be one of {PROFILE_KINDS}")
+
+    s = np.where(tau >= 1.0, 1.0, s)
+    return (s, np.where(inside, ds, 0.0), np.where(inside, dds, 0.0),
+            np.where(inside, ddds, 0.0))
+
+
+def trapezoid_timing(distance, max_velocity=MAX_VELOCITY, acceleration=ACCELERATION):
+    """(duration, accel_fraction) of the time-optimal trapezoid under the limits"""
+    d = np.abs(np.asarray(distance, dtype=np.float64))
+    accel_time = max_velocity / acceleration
+    triangular = d < max_velocity * accel_time
+    accel_time = np.where(triangular, np.sqrt(d / acceleration), accel_time)
+    duration = np.where(triangular, 2.0 * accel_time, d / max_velocity + accel_time)
+    return duration, accel_time / duration
+
+
+def generate_profiles(kind, distance, duration, start=MIN_ANGLE, dt=CONTROL_PERIOD_MS / 1000.0,
+                      accel_fraction=ACCEL_FRACTION, jerk_fraction=JERK_FRACTION):
+    """Sample a batch of profiles on one time grid
+
+    distance, duration, start and the fractions broadcast to P profiles.
+    Returns {'time': (N,), 'position', 'velocity', 'acceleration', 'jerk':
+    (P, N)} in degrees and seconds.
+    """
+    distance, duration, start, f, fj = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=np.float64))
+          for x in (distance, duration, start, accel_fraction, jerk_fraction)))
+    t = np.arange(int(np.floor(duration.max() / dt + 1e-9)) + 1) * dt
+    tau = t[None, :] / duration[:, None]
+    s, ds, dds, ddds = profile_shape(kind, tau, f[:, None], fj[:, None])
+    d, T = distance[:, None], duration[:, None]
+    return {
+        'time': t,
+        'position': start[:, None] + d * s,
+        'velocity': d / T * ds,
+        'acceleration': d / T ** 2 * dds,
+        'jerk': d / T ** 3 * ddds,
+    }
+
+
+def required_torque(position, acceleration, mass=PENDULUM_MASS, length=PENDULUM_LENGTH,
+                    extra_inertia=0.0):
+    """Load torque (N⋅m): M·g·L·sin(θ) + (M·L² + J_extra)·θ'' for degree inputs"""
+    mass = np.asarray(mass, dtype=np.float64)
+    if mass.ndim:
+        mass = mass.reshape(mass.shape + (1,) * (np.ndim(position) - mass.ndim))
+    gravity = mass * GRAVITY * length * np.sin(np.radians(position))
+    inertial = (mass * length * length + extra_inertia) * np.radians(acceleration)
+    return gravity + inertial
+
+
+def summarize_profiles(kind, profiles, distance, duration, mass=PENDULUM_MASS,
+                       length=PENDULUM_LENGTH, extra_inertia=0.0):
+    """PROFILE_SUMMARY_DTYPE row per profile of a generate_profiles batch
+
+    mass broadcasts over the batch; torque statistics cover each profile's own
+    duration only.
+    """
+    position, acceleration = profiles['position'], profiles['acceleration']
+    P = len(position)
+    distance, duration, mass = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=np.float64)) for x in (distance, duration, mass)))
+    distance, duration, mass = (np.broadcast_to(x, (P,)) for x in (distance, duration, mass))
+    torque = required_torque(position, acceleration, mass, length, extra_inertia)
+    inertial = np.abs((mass[:, None] * length * length + extra_inertia) * np.radians(acceleration))
+    active = profiles['time'][None, :] <= duration[:, None] + 1e-9
+    count = np.maximum(active.sum(axis=1), 1)
+
+    out = np.empty(P, dtype=PROFILE_SUMMARY_DTYPE)
+    out['kind'] = PROFILE_KINDS.index(kind)
+    out['distance'] = distance
+    out['duration'] = duration
+    out['mass'] = mass
+    out['peak_velocity'] = np.abs(profiles['velocity']).max(axis=1)
+    out['peak_acceleration'] = np.abs(acceleration).max(axis=1)
+    out['peak_jerk'] = np.abs(profiles['jerk']).max(axis=1)
+    out['peak_torque'] = np.where(active, np.abs(torque), 0.0).max(axis=1)
+    out['rms_torque'] = np.sqrt(np.where(active, torque * torque, 0.0).sum(axis=1) / count)
+    out['peak_inertial_torque'] = inertial.max(axis=1)
+    out['torque_ratio'] = out['peak_torque'] / STATIC_LOAD_TORQUE
+    return out
+
+
+def compare_profiles(durations, distance=MAX_ANGLE - MIN_ANGLE, masses=(PENDULUM_MASS,),
+                     dt=CONTROL_PERIOD_MS / 1000.0, accel_fraction=ACCEL_FRACTION,
+                     jerk_fraction=JERK_FRACTION):
+    """Summary table of every kind × duration × mass for one move"""
+    durations, masses = np.meshgrid(np.asarray(durations, dtype=np.float64),
+                                    np.asarray(masses, dtype=np.float64), indexing='ij')
+    durations, masses = durations.ravel(), masses.ravel()
+    tables = []
+    for kind in PROFILE_KINDS:
+        profiles = generate_profiles(kind, distance, durations, MIN_ANGLE, dt,
+                                     accel_fraction, jerk_fraction)
+        tables.append(summarize_profiles(kind, profiles, distance, durations, masses))
+    return np.concatenate(tables)
+
+
+if __name__ == "__main__":
+    mass = float(sys.argv[1]) if len(sys.argv) > 1 else PENDULUM_MASS
+    distance = MAX_ANGLE - MIN_ANGLE
+
+    durations = np.arange(0.5, 6.001, 0.05)
+    table = compare_profiles(durations, distance, [mass])
+    duration, fraction = trapezoid_timing(distance)
+    reference = summarize_profiles(
+        'trapezoid', generate_profiles('trapezoid', distance, duration, accel_fraction=fraction),
+        distance, duration, mass)[0]
+
+    print("="*60)
+    print("TRAJECTORY PROFILE COMPARISON")
+    print("="*60)
+    print(f"Move: {MIN_ANGLE:.0f}° to {MAX_ANGLE:.0f}°  Mass: {mass} kg  "
+          f"Static Load Torque: {STATIC_LOAD_TORQUE:.3f} N⋅m")
+    print(f"Profiles Evaluated: {len(table)} ({len(PROFILE_KINDS)} kinds × {len(durations)} durations)")
+    print(f"Time-Optimal Trapezoid ({MAX_VELOCITY:.0f}°/s, {ACCELERATION:.0f}°/s²): "
+          f"{duration.item():.2f} s, peak torque {reference['peak_torque']:.3f} N⋅m")
+    print("\nFastest Move Within the Static Load Torque per Profile:")
+    for k, kind in enumerate(PROFILE_KINDS):
+        rows = table[(table['kind'] == k) & (table['torque_ratio'] <= 1.0)]
+        if len(rows) == 0:
+            print(f"  {kind:13s} none within the static torque")
+            continue
+        best = rows[np.argmin(rows['duration'])]
+        print(f"  {kind:13s} {best['duration']:.2f} s  peak torque {best['peak_torque']:.3f} N⋅m "
+              f"(inertial {best['peak_inertial_torque']:.3f})  "
+              f"peak accel {best['peak_acceleration']:.1f}°/s²  jerk {best['peak_jerk']:.0f}°/s³")
+    print("="*60)
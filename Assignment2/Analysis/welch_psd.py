@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Streaming Welch PSD
+Power spectral density of tracking error and velocity from cycle logs
+
+Method (Welch, matching scipy.signal.welch defaults):
+- Hann-windowed segments of NPERSEG samples with 50% overlap
+- Per-segment mean removal, one-sided density scaling (units²/Hz)
+- Segments are cut and transformed in batches as chunks arrive; only the
+  unfinished tail of the stream is kept between chunks, so memory is fixed
+
+The logger samples at an irregular ~12 ms step. The spectrum treats samples
+as uniformly spaced at the measured mean interval; run the log through a
+uniform-grid resampler first when jitter matters.
+"""
+
+import sys
+import numpy as np
+import matplotlib.pyplot as plt
+from numpy.lib.stride_tricks import sliding_window_view
+
+from cycle_log import DEFAULT_LOG_PATH, DEFAULT_CHUNK_ROWS, iter_cycle_log
+
+NPERSEG = 1024
+
+
+class StreamingWelch:
+    """Welch PSD accumulated chunk by chunk over one signal"""
+
+    def __init__(self, nperseg=NPERSEG, noverlap=None):
+        noverlap = nperseg // 2 if noverlap is None else noverlap
+        if not 0 <= noverlap < nperseg:
+            raise ValueError("noverlap must satisfy 0 <= noverlap < nperseg")
+        self.nperseg = nperseg
+        self.step = nperseg - noverlap
+        self.window = np.hanning(nperseg + 1)[:-1]  # periodic Hann
+        self.power_sum = np.zeros(nperseg // 2 + 1)
+        self.segments = 0
+        self._tail = np.empty(0)
+
+    def add(self, samples):
+        """Feed the next block of samples"""
+        buf = np.concatenate([self._tail, np.asarray(samples, dtype=np.float64)])
+        if len(buf) < self.nperseg:
+            self._tail = buf
+            return
+        segs = sliding_window_view(buf, self.nperseg)[::self.step]
+        segs = segs - segs.mean(axis=1, keepdims=True)
+        spectra = np.fft.rfft(segs * self.window, axis=1)
+        self.power_sum += (spectra.real**2 + spectra.imag**2).sum(axis=0)
+        self.segments += len(segs)
+        self._tail = buf[len(segs) * self.step:].copy()
+
+    def density(self, fs):
+        """One-sided PSD (units²/Hz) and frequency axis for sample rate fs"""
+        freqs = np.fft.rfftfreq(self.nperseg, 1.0 / fs)
+        if self.segments == 0:
+            return freqs, np.full(len(freqs), np.nan)
+        psd = self.power_sum / (self.segments * fs * (self.window**2).sum())
+        psd[1:] *= 2.0
+        if self.nperseg % 2 == 0:
+            psd[-1] /= 2.0
+        return freqs, psd
+
+
+class CycleLogSpectra:
+    """Streaming Welch spectra of tracking error and velocity"""
+
+    SIGNALS = ('Tracking_Error', 'Velocity')
+
+    def __init__(self, nperseg=NPERSEG, noverlap=None):
+        self.welch = {name: StreamingWelch(nperseg, noverlap) for name in self.SIGNALS}
+        self._t_first = None
+        self._t_last = None
+        self._rows = 0
+
+    def add_chunk(self, records):
+        if len(records) == 0:
+            return
+        t = records['Timestamp']
+        if self._t_first is None:
+            self._t_first = t[0]
+        self._t_last = t[-1]
+        self._rows += len(records)
+        self.welch['Tracking_Error'].add(records['Target_Position'] - records['Current_Position'])
+        self.welch['Velocity'].add(records['Velocity'])
+
+    @property
+    def sample_rate(self):
+        """Mean sample rate of the stream so far (Hz)"""
+        if self._rows < 2 or self._t_last <= self._t_first:
+            raise ValueError("Need at least two timestamped samples to estimate the sample rate")
+        return (self._rows - 1) / (self._t_last - self._t_first)
+
+    def spectra(self):
+        """{signal: (freqs, psd)} at the measured mean sample rate"""
+        fs = self.sample_rate
+        return {name: w.density(fs) for name, w in self.welch.items()}
+
+
+def dominant_peaks(freqs, psd, count=5, min_freq=0.0):
+    """Frequencies of the largest local maxima of a spectrum"""
+    inner = (psd[1:-1] > psd[:-2]) & (psd[1:-1] >= psd[2:]) & (freqs[1:-1] >= min_freq)
+    idx = np.flatnonzero(inner) + 1
+    idx = idx[np.argsort(psd[idx])[::-1][:count]]
+    return [(float(freqs[i]), float(psd[i])) for i in idx]
+
+
+def cycle_log_spectra(log_path=DEFAULT_LOG_PATH, nperseg=NPERSEG, noverlap=None,
+                      chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Welch spectra over a whole log in one streaming pass"""
+    spectra = CycleLogSpectra(nperseg, noverlap)
+    for records in iter_cycle_log(log_path, chunk_rows):
+        spectra.add_chunk(records)
+    return spectra
+
+
+if __name__ == "__main__":
+    log_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG_PATH
+    nperseg = int(sys.argv[2]) if len(sys.argv) > 2 else NPERSEG
+
+    analysis = cycle_log_spectra(log_path, nperseg)
+    results = analysis.spectra()
+
+    print("="*60)
+    print("WELCH POWER SPECTRAL DENSITY")
+    print("="*60)
+    print(f"Log: {log_path}")
+    print(f"Sample Rate: {analysis.sample_rate:.2f} Hz (mean)")
+    print(f"Segments: {analysis.welch['Velocity'].segments} of {nperseg} samples")
+    for name, (freqs, psd) in results.items():
+        print(f"\n{name} dominant peaks:")
+        for f, p in dominant_peaks(freqs, psd, min_freq=freqs[1]):
+            print(f"  {f:8.3f} Hz  {p:.3e}")
+
+    fig, axes = plt.subplots(2, 1, figsize=(12, 8))
+    for ax, (name, (freqs, psd)) in zip(axes, results.items()):
+        ax.semilogy(freqs[1:], psd[1:])
+        ax.set_xlabel('Frequency (Hz)')
+        ax.set_ylabel('PSD (units²/Hz)')
+        ax.set_title(f'{name} Welch PSD')
+        ax.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.show()
+    print("="*60)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Assignment 2: Zone Maps for Cycle Log Queries
+Per-zone min/max of every column, used to skip zones that cannot match
+
+The log is cut into zones of ZONE_ROWS rows. For each zone <log>.zonemap.npz
+stores the byte range of its lines in the CSV and the min/max of every
+column (Status as its integer code). A query is a conjunction of
+(column, op, value) predicates, e.g.
+
+    [('Load_Torque', '>', 5.0), ('Status', '==', 'Moving_Down')]
+
+Zones whose min/max rule out any predicate are skipped without being read;
+adjacent surviving zones are read as one byte range, parsed, and filtered
+with vectorized masks. Rare-event queries therefore touch only the few
+zones that can contain a hit.
+"""
+
+import os
+import re
+import sys
+import numpy as np
+
+from cycle_log import (DEFAULT_LOG_PATH, CYCLE_LOG_COLUMNS, CYCLE_LOG_DTYPE, STATUS_CODES,
+                       parse_cycle_log_bytes)
+
+ZONE_MAP_SUFFIX = '.zonemap.npz'
+ZONE_ROWS = 8192
+READ_BLOCK = 1 << 24   # bytes scanned per block when locating line starts
+MAX_READ_ZONES = 64    # adjacent candidate zones coalesced into one read
+
+_OPS = {
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+
+
+def zone_map_path(log_path):
+    """File holding the zone map for a given log"""
+    return log_path + ZONE_MAP_SUFFIX
+
+
+def _zone_offsets(path, zone_rows):
+    """Byte offsets of the first line of every zone, plus the end of the file"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        base = len(f.readline())
+        offsets = [base]
+        next_line = 1   # index of the data line that starts after the next newline
+        while True:
+            block = f.read(READ_BLOCK)
+            if not block:
+                break
+            ends = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == ord('\n'))
+            lines = next_line + np.arange(len(ends))
+            offsets.extend((base + ends[lines % zone_rows == 0] + 1).tolist())
+            next_line += len(ends)
+            base += len(block)
+    offsets = [o for o in offsets if o < size]
+    return np.array(offsets + [size], dtype=np.int64)
+
+
+class ZoneMap:
+    """Per-zone byte ranges and column min/max of one cycle log"""
+
+    def __init__(self, offsets, first_row, mins, maxs, source_size=0, source_mtime=0):
+        self.offsets = offsets
+        self.first_row = first_row
+        self.mins = mins
+        self.maxs = maxs
+        self.source_size = source_size
+        self.source_mtime = source_mtime
+        self.last_stats = None
+
+    @classmethod
+    def build(cls, log_path, zone_rows=ZONE_ROWS):
+        offsets = _zone_offsets(log_path, zone_rows)
+        n = len(offsets) - 1
+        columns = CYCLE_LOG_COLUMNS
+        mins = {name: np.empty(n) for name in columns}
+        maxs = {name: np.empty(n) for name in columns}
+        first_row = np.zeros(n + 1, dtype=np.int64)
+        with open(log_path, 'rb') as f:
+            for z in range(n):
+                f.seek(offsets[z])
+                records = parse_cycle_log_bytes(f.read(offsets[z + 1] - offsets[z]))
+                first_row[z + 1] = first_row[z] + len(records)
+                for name in columns:
+                    values = records[name].astype(np.float64)
+                    finite = values[~np.isnan(values)]
+                    mins[name][z] = finite.min() if len(finite) else np.nan
+                    maxs[name][z] = finite.max() if len(finite) else np.nan
+        stat = os.stat(log_path)
+        return cls(offsets, first_row, mins, maxs, stat.st_size, stat.st_mtime_ns)
+
+    @classmethod
+    def load(cls, path):
+        if not path.endswith(ZONE_MAP_SUFFIX):
+            path = zone_map_path(path)
+        with np.load(path) as data:
+            mins = {name: data[f'min_{name}'] for name in CYCLE_LOG_COLUMNS}
+            maxs = {name: data[f'max_{name}'] for name in CYCLE_LOG_COLUMNS}
+            return cls(data['offsets'], data['first_row'], mins, maxs,
+                       int(data['source_size']), int(data['source_mtime']))
+
+    def save(self, path):
+        arrays = {'offsets': self.offsets, 'first_row': self.first_row,
+                  'source_size': self.source_size, 'source_mtime': self.source_mtime}
+        for name in CYCLE_LOG_COLUMNS:
+            arrays[f'min_{name}'] = self.mins[name]
+            arrays[f'max_{name}'] = self.maxs[name]
+        # Write through a file object so np.savez does not append '.npz' again
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+
+    def is_current(self, log_path):
+        stat = os.stat(log_path)
+        return stat.st_size == self.source_size and stat.st_mtime_ns == self.source_mtime
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def candidates(self, predicates):
+        """Mask of zones that may contain rows matching every predicate"""
+        keep = np.ones(len(self), dtype=bool)
+        for column, op, value in predicates:
+            lo, hi = self.mins[column], self.maxs[column]
+            if op == '<':
+                keep &= lo < value
+            elif op == '<=':
+                keep &= lo <= value
+            elif op == '>':
+                keep &= hi > value
+            elif op == '>=':
+                keep &= hi >= value
+            elif op == '==':
+                keep &= (lo <= value) & (hi >= value)
+            elif op == '!=':
+                keep &= ~((lo == value) & (hi == value))
+        return keep
+
+    def query(self, log_path, predicates):
+        """Matching rows as (global row numbers, CYCLE_LOG_DTYPE records)"""
+        predicates = normalize_predicates(predicates)
+        keep = self.candidates(predicates)
+        zones = np.flatnonzero(keep)
+        # Coalesce runs of adjacent candidate zones into single reads
+        breaks = np.flatnonzero(np.diff(zones) != 1) + 1
+        runs = [run[i:i + MAX_READ_ZONES] for run in np.split(zones, breaks)
+                for i in range(0, len(run), MAX_READ_ZONES)]
+
+        rows, hits, scanned = [], [], 0
+        with open(log_path, 'rb') as f:
+            for run in runs:
+                if len(run) == 0:
+                    continue
+                start, end = self.offsets[run[0]], self.offsets[run[-1] + 1]
+                f.seek(start)
+                records = parse_cycle_log_bytes(f.read(end - start))
+                scanned += len(records)
+                mask = np.ones(len(records), dtype=bool)
+                for column, op, value in predicates:
+                    mask &= _OPS[op](records[column], value)
+                rows.append(self.first_row[run[0]] + np.flatnonzero(mask))
+                hits.append(records[mask])
+
+        self.last_stats = {
+            'zones': len(self),
+            'zones_read': int(keep.sum()),
+            'rows': int(self.first_row[-1]),
+            'rows_scanned': scanned,
+            'bytes_read': int(sum(self.offsets[r[-1] + 1] - self.offsets[r[0]]
+                                  for r in runs if len(r))),
+        }
+        if not hits:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=CYCLE_LOG_DTYPE)
+        return np.concatenate(rows), np.concatenate(hits)
+
+
+def normalize_predicates(predicates):
+    """Validate (column, op, value) tuples; Status names become codes"""
+    out = []
+    for column, op, value in predicates:
+        if column not in CYCLE_LOG_COLUMNS:
+            raise KeyError(f"Unknown column {column}")
+        if op not in _OPS:
+            raise ValueError(f"Unsupported operator {op}")
+        if column == 'Status' and isinstance(value, str):
+            if value not in STATUS_CODES:
+                raise ValueError(f"Unknown status {value}")
+            value = STATUS_CODES[value]
+        out.append((column, op, value))
+    return out
+
+
+def parse_query(text):
+    """Predicates from text such as "Load_Torque > 5 and Status == Moving_Down" """
+    predicates = []
+    for term in re.split(r'\s+and\s+', text.strip(), flags=re.IGNORECASE):
+        match = re.fullmatch(r'(\w+)\s*(<=|>=|==|!=|<|>)\s*(\S+)', term.strip())
+        if not match:
+            raise ValueError(f"Cannot parse predicate '{term}'")
+        column, op, value = match.groups()
+        try:
+            value = float(value)
+        except ValueError:
+            pass
+        predicates.append((column, op, value))
+    return predicates
+
+
+def load_zone_map(log_path, zone_rows=ZONE_ROWS):
+    """Stored zone map of a log, rebuilt if missing or older than the log"""
+    path = zone_map_path(log_path)
+    if os.path.exists(path):
+        zone_map = ZoneMap.load(path)
+        if zone_map.is_current(log_path):
+            return zone_map
+    zone_map = ZoneMap.build(log_path, zone_rows)
+    zone_map.save(path)
+    return zone_map
+
+
+if __name__ == "__main__":
+    log_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG_PATH
+    text = sys.argv[2] if len(sys.argv) > 2 else 'Load_Torque > 5.8 and Status == Moving_Down'
+
+    zone_map = load_zone_map(log_path)
+    rows, hits = zone_map.query(log_path, parse_query(text))
+    stats = zone_map.last_stats
+
+    print("="*60)
+    print("ZONE-MAP QUERY")
+    print("="*60)
+    print(f"Log: {log_path}")
+    print(f"Query: {text}")
+    print(f"Zones Read: {stats['zones_read']} of {stats['zones']}")
+    print(f"Rows Scanned: {stats['rows_scanned']} of {stats['rows']} "
+          f"({stats['bytes_read']} bytes read)")
+    print(f"Matching Rows: {len(hits)}")
+    for row, rec in zip(rows[:10], hits[:10]):
+        print(f"  row {row:>9d}  t={rec['Timestamp']:10.3f} s  cycle {rec['Cycle']:4d}  "
+              f"torque {rec['Load_Torque']:.3f} N⋅m")
+    print("="*60)